@@ -0,0 +1,88 @@
+"""
+This script measures the per-request latency of the Eventbrite client against a local stand-in server,
+comparing a new HTTP session per request (how the client used to work) with the shared, pooled session.
+
+The stand-in server runs over plain HTTP on localhost, so the difference here is only the connection setup.
+Against the real API, every new connection also pays for DNS resolution and a TLS handshake, so the difference is larger.
+"""
+
+# isort: off
+
+import sys
+
+sys.path.append(".")
+
+# isort: on
+
+# ruff: noqa: E402
+
+import argparse
+import asyncio
+import statistics
+import time
+from http import HTTPMethod
+
+from aiohttp import web
+
+from eave.stdlib.eventbrite import client as eventbrite_client
+from eave.stdlib.eventbrite.client import EventbriteClient
+
+
+async def _handle_request(request: web.Request) -> web.Response:
+    return web.json_response({"id": request.match_info["event_id"]})
+
+
+async def _measure(client: EventbriteClient, *, requests: int, reuse_session: bool) -> list[float]:
+    latencies_ms: list[float] = []
+
+    for i in range(requests):
+        start = time.perf_counter()
+        await client.make_request(method=HTTPMethod.GET, path=f"/v3/events/{i}/")
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+        if not reuse_session:
+            await eventbrite_client.close_shared_session()
+
+    await eventbrite_client.close_shared_session()
+    return latencies_ms
+
+
+def _summarize(name: str, latencies_ms: list[float]) -> None:
+    latencies_ms = sorted(latencies_ms)
+    p95 = latencies_ms[int(len(latencies_ms) * 0.95) - 1]
+    print(
+        f"{name:<24} mean={statistics.mean(latencies_ms):.3f}ms"
+        f" median={statistics.median(latencies_ms):.3f}ms"
+        f" p95={p95:.3f}ms"
+    )
+
+
+async def _benchmark(*, requests: int, port: int) -> None:
+    app = web.Application()
+    app.router.add_get("/v3/events/{event_id}/", _handle_request)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+
+    try:
+        client = EventbriteClient(api_key="benchmark")
+        client.base_url = f"http://127.0.0.1:{port}"
+
+        # Warm up, so that the first measured request doesn't pay for imports and server startup.
+        await _measure(client, requests=10, reuse_session=True)
+
+        _summarize("new session per request", await _measure(client, requests=requests, reuse_session=False))
+        _summarize("shared session", await _measure(client, requests=requests, reuse_session=True))
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Eventbrite client's HTTP session handling.")
+    parser.add_argument("--requests", type=int, default=500, help="Number of requests per scenario")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local stand-in server")
+    args = parser.parse_args()
+
+    asyncio.run(_benchmark(requests=args.requests, port=args.port))
@@ -23,7 +23,7 @@ async def admin_list_bookings_query(
     account_id: UUID,
 ) -> list[BookingDetailsPeek]:
     async with database.async_session.begin() as db_session:
-        account = await AccountOrm.get_one(db_session, account_id)
+        account = await AccountOrm.get_one(db_session, account_id, profile="bookings_peek")
 
     booking_details = []
 
@@ -86,7 +86,7 @@ async def admin_get_booking_info_query(
     booking_id: UUID,
 ) -> AdminBookingInfo:
     async with database.async_session.begin() as session:
-        booking = await BookingOrm.get_one(session, booking_id)
+        booking = await BookingOrm.get_one(session, booking_id, profile="admin")
 
     booking_info = AdminBookingInfo(
         id=booking.id,
@@ -134,7 +134,7 @@ async def admin_get_booking_activity_query(
     booking_id: UUID,
 ) -> Activity | None:
     async with database.async_session.begin() as session:
-        booking = await BookingOrm.get_one(session, booking_id)
+        booking = await BookingOrm.get_one(session, booking_id, profile="details")
 
     activity = None
     if len(booking.activities) > 0:
@@ -154,7 +154,7 @@ async def admin_get_booking_restaurant_query(
     booking_id: UUID,
 ) -> Restaurant | None:
     async with database.async_session.begin() as session:
-        booking = await BookingOrm.get_one(session, booking_id)
+        booking = await BookingOrm.get_one(session, booking_id, profile="details")
 
     restaurant = None
     if len(booking.reservations) > 0:
@@ -76,7 +76,7 @@ async def admin_update_booking_mutation(
         original_booking = await BookingOrm.get_one(db_session, input.booking_id)
 
     async with database.async_session.begin() as db_session:
-        updated_booking = await BookingOrm.get_one(db_session, input.booking_id)
+        updated_booking = await BookingOrm.get_one(db_session, input.booking_id, profile="admin")
         accounts = updated_booking.accounts
 
     if (
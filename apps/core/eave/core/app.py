@@ -19,6 +19,7 @@ from eave.core.endpoints.refresh_tokens import RefreshTokensEndpoint
 from eave.core.endpoints.status import StatusEndpoint
 from eave.stdlib import cache
 from eave.stdlib.config import SHARED_CONFIG
+from eave.stdlib.eventbrite import client as eventbrite_client
 from eave.stdlib.logging import LOGGER
 from eave.stdlib.middleware.iap_jwt_validation import IAPJWTValidationMiddleware
 from eave.stdlib.starlette import exception_handlers
@@ -74,6 +75,11 @@ async def _app_lifespan(app: starlette.applications.Starlette) -> AsyncGenerator
     except Exception as e:
         LOGGER.exception(e)
 
+    try:
+        await eventbrite_client.close_shared_session()
+    except Exception as e:
+        LOGGER.exception(e)
+
 
 app = starlette.applications.Starlette(
     middleware=[
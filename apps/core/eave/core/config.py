@@ -88,5 +88,139 @@ class _AppConfig(ConfigBase):
     def google_maps_apis_disabled(self) -> bool:
         return os.getenv("GOOGLE_MAPS_APIS_DISABLED") == "1"
 
+    @cached_property
+    def google_places_nearby_cache_ttl_seconds(self) -> int:
+        """
+        How long a cached Google Places nearby search is served without being refreshed.
+        Set to 0 to disable the cache.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("GOOGLE_PLACES_NEARBY_CACHE_TTL_SECONDS") or str(60 * 60 * 6))
+
+    @cached_property
+    def google_places_nearby_cache_stale_seconds(self) -> int:
+        """
+        How long after the TTL an expired nearby search is still served, while it's refreshed in the background.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("GOOGLE_PLACES_NEARBY_CACHE_STALE_SECONDS") or str(60 * 60 * 24))
+
+    @cached_property
+    def google_places_details_cache_ttl_seconds(self) -> int:
+        """
+        How long a cached Google Place (from a details request or a nearby search) is served.
+        Set to 0 to disable the cache.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("GOOGLE_PLACES_DETAILS_CACHE_TTL_SECONDS") or str(60 * 60 * 24))
+
+    @cached_property
+    def google_places_photo_cache_ttl_seconds(self) -> int:
+        """
+        How long a Google Places photo URL is cached. The URLs expire, so this must be well below their lifetime.
+        Set to 0 to disable the cache.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("GOOGLE_PLACES_PHOTO_CACHE_TTL_SECONDS") or str(60 * 30))
+
+    @cached_property
+    def google_maps_geocode_cache_ttl_seconds(self) -> int:
+        """
+        How long a geocoded address is cached.
+        Set to 0 to disable the cache.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("GOOGLE_MAPS_GEOCODE_CACHE_TTL_SECONDS") or str(60 * 60 * 24 * 30))
+
+    @cached_property
+    def upstream_result_window_seconds(self) -> float:
+        """
+        Identical concurrent requests to Google Places and Eventbrite are always coalesced.
+        This is how long a completed request's result is also reused, to absorb bursts of identical requests.
+        Set to 0 (the default) to only coalesce requests that overlap.
+        """
+        return float(os.getenv("UPSTREAM_RESULT_WINDOW_SECONDS") or "0")  # Use "or" to cover empty string
+
+    @cached_property
+    def eventbrite_max_requests_per_second(self) -> float:
+        """
+        The sustained rate of Eventbrite API requests per process. Eventbrite's documented quota is 2,000 requests per hour
+        per token, shared by every process using the token. Set to 0 (the default) for no limit.
+        """
+        return float(os.getenv("EVENTBRITE_MAX_REQUESTS_PER_SECOND") or "0")  # Use "or" to cover empty string
+
+    @cached_property
+    def eventbrite_max_concurrent_requests_per_endpoint(self) -> int:
+        """
+        The maximum number of concurrent Eventbrite API requests to each endpoint, per process.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("EVENTBRITE_MAX_CONCURRENT_REQUESTS_PER_ENDPOINT") or "8")
+
+    @cached_property
+    def eventbrite_max_retries(self) -> int:
+        """
+        How many times an Eventbrite API request is retried after a transient error (eg a timeout, 429 or 5xx response).
+        """
+        return int(os.getenv("EVENTBRITE_MAX_RETRIES") or "2")  # Use "or" to cover empty string
+
+    @cached_property
+    def eventbrite_ticket_classes_snapshot_max_age_seconds(self) -> int:
+        """
+        The planner prices Eventbrite events from the ticket classes snapshot taken at import time, if it's younger than this.
+        Otherwise, the ticket classes are fetched from Eventbrite. Bookings always use live ticket classes.
+        """
+        # Use "or" to cover empty string
+        return int(os.getenv("EVENTBRITE_TICKET_CLASSES_SNAPSHOT_MAX_AGE_SECONDS") or str(60 * 60 * 12))
+
+    @cached_property
+    def planner_max_concurrent_upstream_requests(self) -> int:
+        """
+        The maximum number of concurrent requests to upstream APIs (Eventbrite, Google Places, etc.) for a single outing plan.
+        """
+        return int(os.getenv("PLANNER_MAX_CONCURRENT_UPSTREAM_REQUESTS") or "6")  # Use "or" to cover empty string
+
+    @cached_property
+    def planner_eventbrite_validation_fan_out(self) -> int:
+        """
+        The number of Eventbrite candidate events that the planner validates concurrently.
+        """
+        return int(os.getenv("PLANNER_EVENTBRITE_VALIDATION_FAN_OUT") or "4")  # Use "or" to cover empty string
+
+    @cached_property
+    def planner_eventbrite_max_candidates(self) -> int:
+        """
+        The maximum number of Eventbrite candidate events that the planner validates for a single outing plan.
+        Each validation makes a handful of upstream requests, so this caps the Eventbrite-related requests per plan.
+        """
+        return int(os.getenv("PLANNER_EVENTBRITE_MAX_CANDIDATES") or "20")  # Use "or" to cover empty string
+
+    @cached_property
+    def planner_places_activity_search_ahead_enabled(self) -> bool:
+        """
+        By default, the planner only searches Google Places for a fallback activity once the Eventbrite and evergreen
+        sources have come up empty, because nearby searches are billed.
+        This lets the searches run while the other sources are still being searched, which is faster when the fallback
+        is used, but pays for the searches on every plan.
+        """
+        return os.getenv("PLANNER_PLACES_ACTIVITY_SEARCH_AHEAD_ENABLED") == "1"
+
+    @cached_property
+    def planner_speculative_restaurant_search_disabled(self) -> bool:
+        """
+        By default, the planner searches for restaurants in the survey's search regions while the activity is being planned.
+        This disables that speculative search, so that restaurants are only searched for after the activity is chosen.
+        """
+        return os.getenv("PLANNER_SPECULATIVE_RESTAURANT_SEARCH_DISABLED") == "1"
+
+    @cached_property
+    def planner_merged_restaurant_search_disabled(self) -> bool:
+        """
+        By default, the planner searches for all of the restaurant category groups in a single Places request per area,
+        and partitions the results back into the groups by each place's primary type.
+        This disables the merged search, so that one request is made per category group per area.
+        """
+        return os.getenv("PLANNER_MERGED_RESTAURANT_SEARCH_DISABLED") == "1"
+
 
 CORE_API_APP_CONFIG = _AppConfig()
@@ -0,0 +1,164 @@
+# isort: off
+
+import sys
+
+sys.path.append(".")
+
+# isort: on
+
+# ruff: noqa: E402
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from pprint import pprint
+from typing import Any
+
+from sqlalchemy import update
+
+import eave.core.database
+from eave.core.lib.address import format_address
+from eave.core.lib.google_places import GooglePlacesUtility
+from eave.core.orm.eventbrite_event import EventbriteEventOrm
+from eave.core.orm.evergreen_activity import EvergreenActivityOrm
+from eave.stdlib.logging import LOGGER
+
+# Backfills the directions URIs for Eventbrite events and evergreen activities that are missing them.
+# Directions URIs are normally computed when an event is imported, but that can fail (eg if the Maps APIs are unavailable),
+# and rows created before the column existed don't have them. Evergreen activities are curated directly in the database,
+# so this is what fills in their directions URIs.
+
+_PAGE_SIZE = 100
+
+# Each lookup makes one or two Maps API requests (a geocode and/or place details).
+_MAX_CONCURRENT_REQUESTS = 8
+
+_run_stats: dict[str, Any] = {
+    "eventbrite_events_processed": 0,
+    "eventbrite_events_updated": 0,
+    "evergreen_activities_processed": 0,
+    "evergreen_activities_updated": 0,
+}
+
+
+async def _google_maps_uris(
+    places: GooglePlacesUtility, lookups: list[tuple[str | None, str | None]]
+) -> list[str | None]:
+    """
+    Looks up the directions URIs for a page of (google_place_id, address), with bounded concurrency.
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+    async def _google_maps_uri(google_place_id: str | None, address: str | None) -> str | None:
+        async with semaphore:
+            return await places.google_maps_uri(google_place_id=google_place_id, address=address)
+
+    return await asyncio.gather(*[_google_maps_uri(google_place_id, address) for google_place_id, address in lookups])
+
+
+async def _refresh_eventbrite_events(places: GooglePlacesUtility) -> None:
+    # Events are processed in pages ordered by id, so that rows that still can't be resolved aren't selected again.
+    last_id = None
+
+    while True:
+        # The page is read and written in separate transactions, so that no transaction is open during the Maps requests.
+        async with eave.core.database.async_session.begin() as db_session:
+            query = (
+                EventbriteEventOrm.select()
+                .where(
+                    EventbriteEventOrm.directions_uri.is_(None),
+                    EventbriteEventOrm.google_place_id.is_not(None),
+                    EventbriteEventOrm.start_time_utc >= datetime.now(UTC),
+                )
+                .order_by(EventbriteEventOrm.id)
+                .limit(_PAGE_SIZE)
+            )
+
+            if last_id is not None:
+                query = query.where(EventbriteEventOrm.id > last_id)
+
+            events = (await db_session.scalars(query)).all()
+
+        if len(events) == 0:
+            break
+
+        last_id = events[-1].id
+        _run_stats["eventbrite_events_processed"] += len(events)
+
+        directions_uris = await _google_maps_uris(places, [(event.google_place_id, None) for event in events])
+
+        updates = [
+            {"id": event.id, "directions_uri": directions_uri}
+            for event, directions_uri in zip(events, directions_uris, strict=True)
+            if directions_uri
+        ]
+
+        if len(updates) > 0:
+            async with eave.core.database.async_session.begin() as db_session:
+                await db_session.execute(update(EventbriteEventOrm), updates)
+
+            _run_stats["eventbrite_events_updated"] += len(updates)
+
+
+async def _refresh_evergreen_activities(places: GooglePlacesUtility) -> None:
+    last_id = None
+
+    while True:
+        async with eave.core.database.async_session.begin() as db_session:
+            query = (
+                EvergreenActivityOrm.select()
+                .where(EvergreenActivityOrm.directions_uri.is_(None))
+                .order_by(EvergreenActivityOrm.id)
+                .limit(_PAGE_SIZE)
+            )
+
+            if last_id is not None:
+                query = query.where(EvergreenActivityOrm.id > last_id)
+
+            activities = (await db_session.scalars(query)).all()
+
+        if len(activities) == 0:
+            break
+
+        last_id = activities[-1].id
+        _run_stats["evergreen_activities_processed"] += len(activities)
+
+        directions_uris = await _google_maps_uris(
+            places,
+            [(activity.google_place_id, format_address(activity.address, singleline=True)) for activity in activities],
+        )
+
+        updates = [
+            {"id": activity.id, "directions_uri": directions_uri}
+            for activity, directions_uri in zip(activities, directions_uris, strict=True)
+            if directions_uri
+        ]
+
+        if len(updates) > 0:
+            async with eave.core.database.async_session.begin() as db_session:
+                await db_session.execute(update(EvergreenActivityOrm), updates)
+
+            _run_stats["evergreen_activities_updated"] += len(updates)
+
+
+async def _refresh_directions_uris() -> None:
+    places = GooglePlacesUtility()
+
+    await _refresh_eventbrite_events(places)
+    await _refresh_evergreen_activities(places)
+
+
+if __name__ == "__main__":
+    _perf_start = time.perf_counter()
+    _run_stats["start_time"] = datetime.now().isoformat()
+
+    try:
+        asyncio.run(_refresh_directions_uris())
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        LOGGER.error(e)
+    finally:
+        _run_stats["end_time"] = datetime.now().isoformat()
+        _run_stats["runtime_seconds"] = int(time.perf_counter() - _perf_start)
+        pprint(_run_stats)
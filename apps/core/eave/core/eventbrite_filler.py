@@ -8,24 +8,33 @@ sys.path.append(".")
 
 # ruff: noqa: E402
 
+import argparse
 import asyncio
+import hashlib
+import json
 import random
 import time
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from pprint import pprint
 from typing import Any
+from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from aiohttp import ClientResponseError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import eave.core.database
+from eave.core.config import CORE_API_APP_CONFIG
+from eave.core.lib import google_places_cache
 from eave.core.lib.eventbrite import EventbriteUtility
-from eave.core.lib.google_places import GoogleMapsUtility
+from eave.core.lib.google_places import GoogleMapsUtility, GooglePlacesUtility
 from eave.core.orm.activity_category import ActivityCategoryOrm
 from eave.core.orm.activity_format import ActivityFormatOrm
-from eave.core.orm.eventbrite_event import EventbriteEventOrm
+from eave.core.orm.eventbrite_event import EventbriteEventOrm, TicketClassSnapshot
+from eave.core.orm.eventbrite_import_progress import EventbriteImportProgressOrm
+from eave.core.orm.eventbrite_organizer_checkpoint import EventbriteOrganizerCheckpointOrm
+from eave.stdlib import singleflight
 from eave.stdlib.config import SHARED_CONFIG
-from eave.stdlib.eventbrite.client import ListEventsQuery, OrderBy
+from eave.stdlib.eventbrite.client import ListEventsQuery, OrderBy, RequestPolicy, close_shared_session
 from eave.stdlib.eventbrite.models.event import EventStatus
 from eave.stdlib.eventbrite.models.expansions import Expansion
 from eave.stdlib.logging import LOGGER
@@ -227,298 +236,761 @@ _EVENTBRITE_ORGANIZER_IDS = {
     "86612512073",
 }
 
+
+@dataclass(kw_only=True)
+class _ImportableEvent:
+    eventbrite_event_id: str
+    eventbrite_organizer_id: str
+    title: str
+    eventbrite_venue_id: str | None
+    localized_address: str | None
+    google_place_id: str | None = None
+    start_time_utc: datetime
+    end_time_utc: datetime | None
+    timezone: ZoneInfo
+    min_cost_cents: int
+    max_cost_cents: int
+    lat: float
+    lon: float
+    vivial_activity_category_id: UUID
+    vivial_activity_format_id: UUID
+
+    def payload_hash(self) -> str:
+        """
+        A hash of the fields that are written to the database (other than the ones derived from the address).
+        If it hasn't changed since the last import, the event doesn't need to be written again.
+        """
+        payload = {
+            "eventbrite_organizer_id": self.eventbrite_organizer_id,
+            "title": self.title,
+            "localized_address": self.localized_address,
+            "start_time_utc": self.start_time_utc.isoformat(),
+            "end_time_utc": self.end_time_utc.isoformat() if self.end_time_utc else None,
+            "timezone": self.timezone.key,
+            "min_cost_cents": self.min_cost_cents,
+            "max_cost_cents": self.max_cost_cents,
+            "lat": self.lat,
+            "lon": self.lon,
+            "vivial_activity_category_id": str(self.vivial_activity_category_id),
+            "vivial_activity_format_id": str(self.vivial_activity_format_id),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def venue_key(self) -> str | None:
+        """
+        The key that the venue's Google Place ID is memoized under: the Eventbrite venue ID, or the normalized address
+        for venues without one. None if the venue can't be geocoded.
+        """
+        if not self.localized_address:
+            return None
+
+        if self.eventbrite_venue_id:
+            return f"eventbrite-venue:{self.eventbrite_venue_id}"
+
+        return f"address:{google_places_cache.normalize_address(self.localized_address)}"
+
+
+# The importer runs as fast as Eventbrite's quota allows (2,000 requests per hour per token, unless configured otherwise),
+# and rides out 429 and 5xx responses, waiting as long as Eventbrite asks it to.
+_REQUEST_POLICY = RequestPolicy(
+    max_requests_per_second=CORE_API_APP_CONFIG.eventbrite_max_requests_per_second or 2000 / 3600,
+    burst=10,
+    max_concurrent_requests_per_endpoint=CORE_API_APP_CONFIG.eventbrite_max_concurrent_requests_per_endpoint,
+    max_retries=6,
+    max_retry_wait_seconds=10 * 60,
+)
+
 _organizer_stats: dict[str, dict[str, float]] = {}
 
+# Venue key (see _ImportableEvent.venue_key) -> Google Place ID, for the venues geocoded during this run.
+# Organizers run many events at the same venue, so each venue only needs to be geocoded once.
+_google_place_ids_by_venue_key: dict[str, str] = {}
+
 _run_stats: dict[str, Any] = {
     "events_processed": 0,
     "events_imported": 0,
+    "events_inserted": 0,
+    "events_updated": 0,
+    "events_unchanged": 0,
+    "geocode_calls_saved": 0,
+    "organizers_completed": 0,
+    "organizers_failed": 0,
+    "organizers_skipped_on_resume": 0,
+    "pages_skipped_on_resume": 0,
     "runtime_seconds": 0,
 }
 
 
-async def _get_eventbrite_events() -> None:
+@dataclass(kw_only=True, frozen=True)
+class _Shard:
+    index: int
+    count: int
+
+    @property
+    def job_key(self) -> str:
+        """
+        Identifies the job's progress in the database. A restarted job resumes from the progress of the same shard.
+        """
+        return f"{self.index}/{self.count}"
+
+    def includes(self, organizer_id: str) -> bool:
+        # A stable hash, so that an organizer stays in the same shard across processes and runs.
+        return int(hashlib.sha256(organizer_id.encode()).hexdigest(), 16) % self.count == self.index
+
+
+def _parse_shard(value: str) -> _Shard:
+    """
+    Parses a shard argument like "0/4" (the first of 4 shards).
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}") from None
+
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"expected 0 <= i < N, got {value!r}")
+
+    return _Shard(index=index, count=count)
+
+
+async def _get_eventbrite_events(*, concurrency: int, incremental: bool, shard: _Shard, restart: bool) -> None:
     LOGGER.info(f"GOOGLE_CLOUD_PROJECT: {SHARED_CONFIG.google_cloud_project}")
 
-    eventbrite = EventbriteUtility()
+    eventbrite = EventbriteUtility(request_policy=_REQUEST_POLICY)
     maps = GoogleMapsUtility()
+    places = GooglePlacesUtility()
 
-    organizer_ids_copy = list(_EVENTBRITE_ORGANIZER_IDS)
+    organizer_ids_copy = [organizer_id for organizer_id in _EVENTBRITE_ORGANIZER_IDS if shard.includes(organizer_id)]
     random.shuffle(organizer_ids_copy)
+    _run_stats["organizers_in_shard"] = len(organizer_ids_copy)
 
-    org_num = 0
+    async with eave.core.database.async_session.begin() as db_session:
+        progress = await EventbriteImportProgressOrm.get_all_for_job(db_session, job_key=shard.job_key)
 
-    for organizer_id in organizer_ids_copy:
-        org_num += 1
+        # A job resumes the previous run of its shard, unless that run completed (or a restart was asked for).
+        previous_run_completed = all(
+            organizer_id in progress and progress[organizer_id].completed for organizer_id in organizer_ids_copy
+        )
 
-        await asyncio.sleep(2)
+        if restart or previous_run_completed:
+            await EventbriteImportProgressOrm.delete_all_for_job(db_session, job_key=shard.job_key)
+            progress = {}
+
+    _run_stats["resumed"] = len(progress) > 0
+    if progress:
+        LOGGER.info(f"Resuming job {shard.job_key} from its checkpoint")
+
+    # Shared by the workers, so that each organizer is taken by exactly one of them.
+    organizers = enumerate(organizer_ids_copy, start=1)
+
+    async def _worker() -> None:
+        for org_num, organizer_id in organizers:
+            organizer_progress = progress.get(organizer_id)
+
+            if organizer_progress and organizer_progress.completed:
+                _run_stats["organizers_skipped_on_resume"] += 1
+                continue
+
+            await _import_organizer(
+                organizer_id=organizer_id,
+                org_num=org_num,
+                org_count=len(organizer_ids_copy),
+                eventbrite=eventbrite,
+                maps=maps,
+                places=places,
+                incremental=incremental,
+                job_key=shard.job_key,
+                resume_after_page=organizer_progress.pages_imported if organizer_progress else 0,
+            )
+
+    # All of the workers share the Eventbrite rate limiter (see _REQUEST_POLICY), so adding workers can't exceed the quota.
+    await asyncio.gather(*[_worker() for _ in range(max(1, concurrency))])
+
+
+async def _import_organizer(
+    *,
+    organizer_id: str,
+    org_num: int,
+    org_count: int,
+    eventbrite: EventbriteUtility,
+    maps: GoogleMapsUtility,
+    places: GooglePlacesUtility,
+    incremental: bool,
+    job_key: str,
+    resume_after_page: int,
+) -> None:
+    """
+    In incremental mode, events that haven't changed since the organizer's last checkpoint aren't geocoded or written.
+    In either mode, the checkpoint is saved after all of the organizer's events were imported successfully.
+
+    The job's progress is saved with each page that's written. When resuming, the pages that were already written
+    are still listed (Eventbrite's continuation tokens don't outlive a run), but they aren't geocoded or written again.
+    """
+    org_perf_start = time.perf_counter()
+
+    org_stats: dict[str, Any] = {
+        "events_processed": 0,
+        "events_imported": 0,
+        "events_inserted": 0,
+        "events_updated": 0,
+        "events_unchanged": 0,
+        "runtime_seconds": 0,
+    }
+
+    _organizer_stats[organizer_id] = org_stats
+
+    paginator = eventbrite.client.list_events_for_organizer(
+        organizer_id=organizer_id,
+        query=ListEventsQuery(
+            order_by=OrderBy.START_ASC,
+            status=EventStatus.LIVE,
+            only_public=True,
+            expand=Expansion.all(),
+        ),
+        # The next page is fetched while the current one is geocoded and written.
+        prefetch=1,
+    )
+
+    latest_event_date_for_organizer = datetime.now(UTC)
+
+    previous_event_payload_hashes: dict[str, str] = {}
+    if incremental:
+        async with eave.core.database.async_session.begin() as db_session:
+            checkpoint = await EventbriteOrganizerCheckpointOrm.get_one_or_none(
+                db_session, eventbrite_organizer_id=organizer_id
+            )
+
+        if checkpoint:
+            previous_event_payload_hashes = checkpoint.event_payload_hashes
+
+    # These become the organizer's new checkpoint.
+    event_payload_hashes: dict[str, str] = {}
+
+    pagenum = 0
+    try:
+        async for batch in paginator:
+            pagenum += 1
+
+            LOGGER.info(
+                f"[org={organizer_id} ({org_num}/{org_count}); page={pagenum}]",
+                {"eventbrite_organizer_id": organizer_id},
+            )
+
+            stop_paginating = False
+
+            # Events that passed the checks below. They're geocoded and written to the database after the page is checked.
+            importable_events: list[_ImportableEvent] = []
+
+            evnum = 0
+            for event in batch:
+                # FIXME: This will ignore events that may have previously been added into the database, if their settings were changed to become excluded.
+
+                _run_stats["events_processed"] += 1
+                org_stats["events_processed"] += 1
+                evnum += 1
+
+                if (eventbrite_event_id := event.get("id")) is None:
+                    org_stats.setdefault("no_id", 0)
+                    org_stats["no_id"] += 1
+                    LOGGER.debug("No eventbrite event id; skipping")
+                    continue
+
+                pfx = f"[org={organizer_id} ({org_num}/{org_count}); page={pagenum}; eventnum={evnum}/{len(batch)}; id={eventbrite_event_id}]"
+                logmeta: JsonObject = {
+                    "eventbrite_organizer_id": organizer_id,
+                    "eventbrite_event_id": eventbrite_event_id,
+                }
+
+                LOGGER.debug(f"{pfx} processing event", logmeta)
+
+                if event_start := event.get("start"):
+                    start_time_utc = datetime.fromisoformat(event_start["utc"])
+                    start_timezone = ZoneInfo(event_start["timezone"])
+
+                    if start_time_utc > datetime.now(UTC) + timedelta(days=45):
+                        # We only need to import the next 45 days of events.
+                        # Many organizers have event series lasting for many years, and this endpoint returns all of them.
+                        # Without this limitation, this script currently imports something like 30,000 events, most of them a long time away.
+                        LOGGER.warning(
+                            f"Organizer {organizer_id} hit date cap at {start_time_utc.isoformat()} after {org_stats['events_processed']} events"
+                        )
+                        org_stats["hit_date_ceiling"] = True
+                        stop_paginating = True
+                        break  # Out of the batch
+                else:
+                    LOGGER.debug(f"{pfx} No start time; skipping", logmeta)
+                    continue
+
+                if event_end := event.get("end"):
+                    end_time_utc = datetime.fromisoformat(event_end["utc"])
+                    end_timezone = ZoneInfo(event_end["timezone"])
+                else:
+                    end_timezone = None
+                    end_time_utc = None
+
+                if event.get("status") != EventStatus.LIVE:
+                    org_stats.setdefault("invalid_status", 0)
+                    org_stats["invalid_status"] += 1
+                    LOGGER.debug(f"{pfx} Status is not LIVE; skipping", logmeta)
+                    continue
+
+                if event.get("online_event") is True:
+                    org_stats.setdefault("online_event", 0)
+                    org_stats["online_event"] += 1
+                    LOGGER.debug(f"{pfx} online_event=True; skipping", logmeta)
+                    continue
+
+                if event.get("is_locked") is True:
+                    org_stats.setdefault("is_locked", 0)
+                    org_stats["is_locked"] += 1
+                    LOGGER.debug(f"{pfx} is_locked=True; skipping", logmeta)
+                    continue
+
+                if event.get("show_pick_a_seat") is True:
+                    org_stats.setdefault("show_pick_a_seat", 0)
+                    org_stats["show_pick_a_seat"] += 1
+                    LOGGER.debug(f"{pfx} show_pick_a_seat=True skipping", logmeta)
+                    continue
+
+                if event.get("is_sold_out") is True:
+                    org_stats.setdefault("is_sold_out", 0)
+                    org_stats["is_sold_out"] += 1
+                    LOGGER.debug(f"{pfx} is_sold_out=True; skipping", logmeta)
+                    continue
+
+                if not (event_name := event.get("name")):
+                    org_stats.setdefault("no_name", 0)
+                    org_stats["no_name"] += 1
+                    LOGGER.debug(f"{pfx} No eventbrite event name; skipping", logmeta)
+                    continue
+
+                if (venue := event.get("venue")) is None:
+                    org_stats.setdefault("no_venue", 0)
+                    org_stats["no_venue"] += 1
+                    LOGGER.debug(f"{pfx} No eventbrite event venue; skipping", logmeta)
+                    continue
+
+                if (lat := venue.get("latitude")) is None:
+                    org_stats.setdefault("no_lat", 0)
+                    org_stats["no_lat"] += 1
+                    LOGGER.debug(f"{pfx} No venue latitude; skipping", logmeta)
+                    continue
+
+                if (lon := venue.get("longitude")) is None:
+                    org_stats.setdefault("no_lon", 0)
+                    org_stats["no_lon"] += 1
+                    LOGGER.debug(f"{pfx} No venue longitude; skipping", logmeta)
+                    continue
+
+                if (ticket_availability := event.get("ticket_availability")) is None:
+                    org_stats.setdefault("no_ticket_availability", 0)
+                    org_stats["no_ticket_availability"] += 1
+                    LOGGER.debug(
+                        f"{pfx} No eventbrite ticket_availability; skipping",
+                        logmeta,
+                    )
+                    continue
+
+                if event.get("category_id") is None:
+                    org_stats.setdefault("no_category_id", 0)
+                    org_stats["no_category_id"] += 1
+                    LOGGER.debug(f"{pfx} category_id=None; skipping", logmeta)
+                    continue
+
+                if (eb_subcategory_id := event.get("subcategory_id")) is None:
+                    org_stats.setdefault("no_subcategory_id", 0)
+                    org_stats["no_subcategory_id"] += 1
+                    LOGGER.debug(f"{pfx} subcategory_id=None; skipping", logmeta)
+                    continue
+
+                if not (
+                    vivial_category := ActivityCategoryOrm.get_by_eventbrite_subcategory_id(
+                        eventbrite_subcategory_id=eb_subcategory_id
+                    )
+                ):
+                    org_stats.setdefault("no_category_mapping", 0)
+                    org_stats["no_category_mapping"] += 1
+                    logmeta["eventbrite_subcategory_id"] = eb_subcategory_id
+                    LOGGER.debug(f"{pfx} No mapped vivial category; skipping", logmeta)
+                    continue
+
+                if (eb_format_id := event.get("format_id")) is None:
+                    org_stats.setdefault("no_format_id", 0)
+                    org_stats["no_format_id"] += 1
+                    LOGGER.debug(f"{pfx} format_id=None; skipping", logmeta)
+                    continue
+
+                if not (vivial_format := ActivityFormatOrm.get_by_eventbrite_id(eventbrite_format_id=eb_format_id)):
+                    org_stats.setdefault("no_format_mapping", 0)
+                    org_stats["no_format_mapping"] += 1
+                    logmeta["eventbrite_format_id"] = eb_format_id
+                    LOGGER.debug(f"{pfx} No mapped vivial format; skipping", logmeta)
+                    continue
+
+                if minimum_ticket_price := ticket_availability.get("minimum_ticket_price"):
+                    min_cost_cents = minimum_ticket_price["value"]
+                else:
+                    min_cost_cents = 0
+
+                if maximum_ticket_price := ticket_availability.get("maximum_ticket_price"):
+                    max_cost_cents = maximum_ticket_price["value"]
+                else:
+                    max_cost_cents = 0
+
+                # These should never be different, but we need to choose one.
+                timezone = start_timezone or end_timezone or LOS_ANGELES_TIMEZONE
+
+                localized_address = None
+                if address := venue.get("address"):
+                    localized_address = address.get("localized_address_display")
+
+                importable_events.append(
+                    _ImportableEvent(
+                        eventbrite_event_id=eventbrite_event_id,
+                        eventbrite_organizer_id=event.get("organizer_id", organizer_id),
+                        title=event_name["text"],
+                        eventbrite_venue_id=venue.get("id") or event.get("venue_id"),
+                        localized_address=localized_address,
+                        start_time_utc=start_time_utc,
+                        end_time_utc=end_time_utc,
+                        timezone=timezone,
+                        min_cost_cents=min_cost_cents,
+                        max_cost_cents=max_cost_cents,
+                        lat=float(lat),
+                        lon=float(lon),
+                        vivial_activity_category_id=vivial_category.id,
+                        vivial_activity_format_id=vivial_format.id,
+                    )
+                )
 
-        org_perf_start = time.perf_counter()
+            changed_events: list[_ImportableEvent] = []
+            unchanged_event_ids: list[str] = []
+            for importable_event in importable_events:
+                payload_hash = importable_event.payload_hash()
+                event_payload_hashes[importable_event.eventbrite_event_id] = payload_hash
 
-        org_stats: dict[str, Any] = {
-            "events_processed": 0,
-            "events_imported": 0,
-            "runtime_seconds": 0,
-        }
+                if previous_event_payload_hashes.get(importable_event.eventbrite_event_id) == payload_hash:
+                    org_stats["events_unchanged"] += 1
+                    _run_stats["events_unchanged"] += 1
+                    unchanged_event_ids.append(importable_event.eventbrite_event_id)
+                else:
+                    changed_events.append(importable_event)
 
-        _organizer_stats[organizer_id] = org_stats
+            if pagenum <= resume_after_page:
+                org_stats.setdefault("pages_skipped_on_resume", 0)
+                org_stats["pages_skipped_on_resume"] += 1
+                _run_stats["pages_skipped_on_resume"] += 1
 
-        paginator = eventbrite.client.list_events_for_organizer(
-            organizer_id=organizer_id,
-            query=ListEventsQuery(
-                order_by=OrderBy.START_ASC,
-                status=EventStatus.LIVE,
-                only_public=True,
-                expand=Expansion.all(),
-            ),
-        )
+                if stop_paginating:
+                    break
 
-        latest_event_date_for_organizer = datetime.now(UTC)
+                continue
 
-        pagenum = 0
-        try:
-            async for batch in paginator:
-                pagenum += 1
+            await _refresh_ticket_classes_snapshots(
+                eventbrite, eventbrite_event_ids=unchanged_event_ids, org_stats=org_stats
+            )
+
+            importable_events = changed_events
+            if len(importable_events) == 0:
+                if stop_paginating:
+                    break
 
-                LOGGER.info(
-                    f"[org={organizer_id} ({org_num}/{len(organizer_ids_copy)}); page={pagenum}]",
-                    {"eventbrite_organizer_id": organizer_id},
+                continue
+
+            await _resolve_google_place_ids(maps, importable_events)
+
+            # Compute the directions URIs now, so that they don't need to be looked up when the events are shown.
+            google_place_ids = list({e.google_place_id for e in importable_events if e.google_place_id})
+            directions_uris_by_google_place_id = dict(
+                zip(
+                    google_place_ids,
+                    await asyncio.gather(
+                        *[
+                            places.google_maps_uri(google_place_id=google_place_id)
+                            for google_place_id in google_place_ids
+                        ]
+                    ),
+                    strict=True,
+                )
+            )
+
+            # Snapshot the ticket classes, so that the planner doesn't have to fetch them for every candidate event.
+            ticket_classes_snapshots = await asyncio.gather(
+                *[
+                    _ticket_classes_snapshot(eventbrite, eventbrite_event_id=e.eventbrite_event_id, org_stats=org_stats)
+                    for e in importable_events
+                ]
+            )
+
+            events = [
+                EventbriteEventOrm(
+                    None,
+                    eventbrite_event_id=importable_event.eventbrite_event_id,
+                    eventbrite_organizer_id=importable_event.eventbrite_organizer_id,
+                    title=importable_event.title,
+                    google_place_id=importable_event.google_place_id,
+                    directions_uri=directions_uris_by_google_place_id.get(importable_event.google_place_id)
+                    if importable_event.google_place_id
+                    else None,
+                    start_time=importable_event.start_time_utc,
+                    end_time=importable_event.end_time_utc,
+                    timezone=importable_event.timezone,
+                    min_cost_cents=importable_event.min_cost_cents,
+                    max_cost_cents=importable_event.max_cost_cents,
+                    lat=importable_event.lat,
+                    lon=importable_event.lon,
+                    vivial_activity_category_id=importable_event.vivial_activity_category_id,
+                    vivial_activity_format_id=importable_event.vivial_activity_format_id,
+                    ticket_classes_snapshot=ticket_classes_snapshot,
                 )
+                for importable_event, ticket_classes_snapshot in zip(
+                    importable_events, ticket_classes_snapshots, strict=True
+                )
+            ]
 
-                stop_paginating = False
-
-                evnum = 0
-                for event in batch:
-                    # FIXME: This will ignore events that may have previously been added into the database, if their settings were changed to become excluded.
-
-                    _run_stats["events_processed"] += 1
-                    org_stats["events_processed"] += 1
-                    evnum += 1
-
-                    if (eventbrite_event_id := event.get("id")) is None:
-                        org_stats.setdefault("no_id", 0)
-                        org_stats["no_id"] += 1
-                        LOGGER.debug("No eventbrite event id; skipping")
-                        continue
-
-                    pfx = f"[org={organizer_id} ({org_num}/{len(organizer_ids_copy)}); page={pagenum}; eventnum={evnum}/{len(batch)}; id={eventbrite_event_id}]"
-                    logmeta: JsonObject = {
-                        "eventbrite_organizer_id": organizer_id,
-                        "eventbrite_event_id": eventbrite_event_id,
-                    }
-
-                    LOGGER.debug(f"{pfx} processing event", logmeta)
-
-                    if event_start := event.get("start"):
-                        start_time_utc = datetime.fromisoformat(event_start["utc"])
-                        start_timezone = ZoneInfo(event_start["timezone"])
-
-                        if start_time_utc > datetime.now(UTC) + timedelta(days=45):
-                            # We only need to import the next 45 days of events.
-                            # Many organizers have event series lasting for many years, and this endpoint returns all of them.
-                            # Without this limitation, this script currently imports something like 30,000 events, most of them a long time away.
-                            LOGGER.warning(
-                                f"Organizer {organizer_id} hit date cap at {start_time_utc.isoformat()} after {org_stats["events_processed"]} events"
-                            )
-                            org_stats["hit_date_ceiling"] = True
-                            stop_paginating = True
-                            break  # Out of the batch
-                    else:
-                        LOGGER.debug(f"{pfx} No start time; skipping", logmeta)
-                        continue
-
-                    if event_end := event.get("end"):
-                        end_time_utc = datetime.fromisoformat(event_end["utc"])
-                        end_timezone = ZoneInfo(event_end["timezone"])
-                    else:
-                        end_timezone = None
-                        end_time_utc = None
-
-                    if event.get("status") != EventStatus.LIVE:
-                        org_stats.setdefault("invalid_status", 0)
-                        org_stats["invalid_status"] += 1
-                        LOGGER.debug(f"{pfx} Status is not LIVE; skipping", logmeta)
-                        continue
-
-                    if event.get("online_event") is True:
-                        org_stats.setdefault("online_event", 0)
-                        org_stats["online_event"] += 1
-                        LOGGER.debug(f"{pfx} online_event=True; skipping", logmeta)
-                        continue
-
-                    if event.get("is_locked") is True:
-                        org_stats.setdefault("is_locked", 0)
-                        org_stats["is_locked"] += 1
-                        LOGGER.debug(f"{pfx} is_locked=True; skipping", logmeta)
-                        continue
-
-                    if event.get("show_pick_a_seat") is True:
-                        org_stats.setdefault("show_pick_a_seat", 0)
-                        org_stats["show_pick_a_seat"] += 1
-                        LOGGER.debug(f"{pfx} show_pick_a_seat=True skipping", logmeta)
-                        continue
-
-                    if event.get("is_sold_out") is True:
-                        org_stats.setdefault("is_sold_out", 0)
-                        org_stats["is_sold_out"] += 1
-                        LOGGER.debug(f"{pfx} is_sold_out=True; skipping", logmeta)
-                        continue
-
-                    if not (event_name := event.get("name")):
-                        org_stats.setdefault("no_name", 0)
-                        org_stats["no_name"] += 1
-                        LOGGER.debug(f"{pfx} No eventbrite event name; skipping", logmeta)
-                        continue
-
-                    if (venue := event.get("venue")) is None:
-                        org_stats.setdefault("no_venue", 0)
-                        org_stats["no_venue"] += 1
-                        LOGGER.debug(f"{pfx} No eventbrite event venue; skipping", logmeta)
-                        continue
-
-                    if (lat := venue.get("latitude")) is None:
-                        org_stats.setdefault("no_lat", 0)
-                        org_stats["no_lat"] += 1
-                        LOGGER.debug(f"{pfx} No venue latitude; skipping", logmeta)
-                        continue
-
-                    if (lon := venue.get("longitude")) is None:
-                        org_stats.setdefault("no_lon", 0)
-                        org_stats["no_lon"] += 1
-                        LOGGER.debug(f"{pfx} No venue longitude; skipping", logmeta)
-                        continue
-
-                    if (ticket_availability := event.get("ticket_availability")) is None:
-                        org_stats.setdefault("no_ticket_availability", 0)
-                        org_stats["no_ticket_availability"] += 1
-                        LOGGER.debug(
-                            f"{pfx} No eventbrite ticket_availability; skipping",
-                            logmeta,
-                        )
-                        continue
-
-                    if event.get("category_id") is None:
-                        org_stats.setdefault("no_category_id", 0)
-                        org_stats["no_category_id"] += 1
-                        LOGGER.debug(f"{pfx} category_id=None; skipping", logmeta)
-                        continue
-
-                    if (eb_subcategory_id := event.get("subcategory_id")) is None:
-                        org_stats.setdefault("no_subcategory_id", 0)
-                        org_stats["no_subcategory_id"] += 1
-                        LOGGER.debug(f"{pfx} subcategory_id=None; skipping", logmeta)
-                        continue
-
-                    if not (
-                        vivial_category := ActivityCategoryOrm.get_by_eventbrite_subcategory_id(
-                            eventbrite_subcategory_id=eb_subcategory_id
-                        )
-                    ):
-                        org_stats.setdefault("no_category_mapping", 0)
-                        org_stats["no_category_mapping"] += 1
-                        logmeta["eventbrite_subcategory_id"] = eb_subcategory_id
-                        LOGGER.debug(f"{pfx} No mapped vivial category; skipping", logmeta)
-                        continue
-
-                    if (eb_format_id := event.get("format_id")) is None:
-                        org_stats.setdefault("no_format_id", 0)
-                        org_stats["no_format_id"] += 1
-                        LOGGER.debug(f"{pfx} format_id=None; skipping", logmeta)
-                        continue
-
-                    if not (vivial_format := ActivityFormatOrm.get_by_eventbrite_id(eventbrite_format_id=eb_format_id)):
-                        org_stats.setdefault("no_format_mapping", 0)
-                        org_stats["no_format_mapping"] += 1
-                        logmeta["eventbrite_format_id"] = eb_format_id
-                        LOGGER.debug(f"{pfx} No mapped vivial format; skipping", logmeta)
-                        continue
-
-                    if minimum_ticket_price := ticket_availability.get("minimum_ticket_price"):
-                        min_cost_cents = minimum_ticket_price["value"]
-                    else:
-                        min_cost_cents = 0
-
-                    if maximum_ticket_price := ticket_availability.get("maximum_ticket_price"):
-                        max_cost_cents = maximum_ticket_price["value"]
-                    else:
-                        max_cost_cents = 0
-
-                    # These should never be different, but we need to choose one.
-                    timezone = start_timezone or end_timezone or LOS_ANGELES_TIMEZONE
-
-                    google_place_id = None
-                    if (address := venue.get("address")) and (
-                        localized_address := address.get("localized_address_display")
-                    ):
-                        geocode_results = maps.geocode(address=localized_address)
-                        if len(geocode_results) > 0:
-                            google_place_id = geocode_results[0].get("place_id")
-
-                    async with eave.core.database.async_session.begin() as db_session:
-                        query = EventbriteEventOrm.select(
-                            eventbrite_event_id=eventbrite_event_id,
-                        ).limit(1)
-
-                        target = (await db_session.scalars(query)).one_or_none()
-                        if not target:
-                            LOGGER.debug(f"{pfx} new event - adding to database", logmeta)
-
-                            target = EventbriteEventOrm(
-                                db_session,
-                                eventbrite_event_id=eventbrite_event_id,
-                                eventbrite_organizer_id=event.get("organizer_id", organizer_id),
-                                title=event_name["text"],
-                                google_place_id=google_place_id,
-                                start_time=start_time_utc,
-                                end_time=end_time_utc,
-                                timezone=timezone,
-                                min_cost_cents=min_cost_cents,
-                                max_cost_cents=max_cost_cents,
-                                lat=float(lat),
-                                lon=float(lon),
-                                vivial_activity_category_id=vivial_category.id,
-                                vivial_activity_format_id=vivial_format.id,
-                            )
-                        else:
-                            LOGGER.debug(f"{pfx} existing event - updating database", logmeta)
-
-                        target.update(
-                            title=event_name["text"],
-                            google_place_id=google_place_id,
-                            start_time=start_time_utc,
-                            end_time=end_time_utc,
-                            timezone=timezone,
-                            min_cost_cents=min_cost_cents,
-                            max_cost_cents=max_cost_cents,
-                            lat=float(lat),
-                            lon=float(lon),
-                            vivial_activity_category_id=vivial_category.id,
-                            vivial_activity_format_id=vivial_format.id,
-                        )
+            # The whole page is written in one statement and one transaction, along with the job's progress.
+            async with eave.core.database.async_session.begin() as db_session:
+                upsert_result = await EventbriteEventOrm.upsert_many(db_session, events)
 
-                    org_stats["events_imported"] += 1
-                    _run_stats["events_imported"] += 1
+                progress = await _get_or_create_progress(db_session, job_key=job_key, organizer_id=organizer_id)
+                progress.pages_imported = pagenum
 
-                if stop_paginating:
-                    break
+            LOGGER.debug(
+                f"[org={organizer_id} ({org_num}/{org_count}); page={pagenum}] {upsert_result.inserted} new events, {upsert_result.updated} updated events",
+                {"eventbrite_organizer_id": organizer_id},
+            )
+
+            for stats in (org_stats, _run_stats):
+                stats["events_imported"] += upsert_result.inserted + upsert_result.updated
+                stats["events_inserted"] += upsert_result.inserted
+                stats["events_updated"] += upsert_result.updated
+
+            if stop_paginating:
+                break
+
+        async with eave.core.database.async_session.begin() as db_session:
+            checkpoint = await EventbriteOrganizerCheckpointOrm.get_one_or_none(
+                db_session, eventbrite_organizer_id=organizer_id
+            )
+
+            if checkpoint:
+                org_stats["unchanged_since_checkpoint"] = (
+                    checkpoint.content_hash
+                    == EventbriteOrganizerCheckpointOrm.hash_event_payload_hashes(event_payload_hashes)
+                )
+                checkpoint.update(event_payload_hashes=event_payload_hashes)
+            else:
+                EventbriteOrganizerCheckpointOrm(
+                    db_session,
+                    eventbrite_organizer_id=organizer_id,
+                    event_payload_hashes=event_payload_hashes,
+                )
 
-        except ClientResponseError as e:
-            LOGGER.exception(e)
-            await asyncio.sleep(10)
+            progress = await _get_or_create_progress(db_session, job_key=job_key, organizer_id=organizer_id)
+            progress.pages_imported = pagenum
+            progress.completed = True
 
-        except Exception as e:
-            LOGGER.exception(e)
+        _run_stats["organizers_completed"] += 1
+
+    except Exception as e:
+        LOGGER.exception(e)
+        org_stats["failed"] = True
+        _run_stats["organizers_failed"] += 1
 
-        finally:
-            org_stats["runtime_seconds"] = int(time.perf_counter() - org_perf_start)
-            org_stats["latest_event_date"] = latest_event_date_for_organizer.isoformat()
+    finally:
+        org_stats["runtime_seconds"] = int(time.perf_counter() - org_perf_start)
+        org_stats["latest_event_date"] = latest_event_date_for_organizer.isoformat()
+
+
+async def _get_or_create_progress(
+    db_session: AsyncSession, *, job_key: str, organizer_id: str
+) -> EventbriteImportProgressOrm:
+    progress = await EventbriteImportProgressOrm.get_one_or_none(
+        db_session, job_key=job_key, eventbrite_organizer_id=organizer_id
+    )
+
+    if progress is None:
+        progress = EventbriteImportProgressOrm(db_session, job_key=job_key, eventbrite_organizer_id=organizer_id)
+
+    return progress
+
+
+async def _resolve_google_place_ids(maps: GoogleMapsUtility, importable_events: list[_ImportableEvent]) -> None:
+    """
+    Sets the Google Place ID of each event's venue.
+    Venues are looked up by venue key in this run's memo first, then in the cache (which persists between runs),
+    and only the remaining venues are geocoded, once each, for the whole page at once.
+    """
+    events_by_venue_key: dict[str, list[_ImportableEvent]] = {}
+
+    for importable_event in importable_events:
+        if (venue_key := importable_event.venue_key()) is None:
+            continue
+
+        if google_place_id := _google_place_ids_by_venue_key.get(venue_key):
+            importable_event.google_place_id = google_place_id
+            _run_stats["geocode_calls_saved"] += 1
+        else:
+            events_by_venue_key.setdefault(venue_key, []).append(importable_event)
+
+    cached_google_place_ids = await asyncio.gather(
+        *[google_places_cache.get_cached_venue_place_id(venue_key) for venue_key in events_by_venue_key]
+    )
+
+    # Venue key -> address to geocode. Events at the same venue share the geocode call.
+    addresses_by_venue_key: dict[str, str] = {}
+
+    for (venue_key, events), google_place_id in zip(events_by_venue_key.items(), cached_google_place_ids, strict=True):
+        if google_place_id:
+            _google_place_ids_by_venue_key[venue_key] = google_place_id
+            _run_stats["geocode_calls_saved"] += len(events)
+        else:
+            # venue_key() guarantees that the address is set.
+            addresses_by_venue_key[venue_key] = events[0].localized_address or ""
+            _run_stats["geocode_calls_saved"] += len(events) - 1
+
+    geocode_results_by_address = await maps.geocode_many(addresses_by_venue_key.values())
+
+    new_google_place_ids_by_venue_key: dict[str, str] = {}
+    for venue_key, address in addresses_by_venue_key.items():
+        if (geocode_results := geocode_results_by_address.get(address)) and (
+            google_place_id := geocode_results[0].get("place_id")
+        ):
+            new_google_place_ids_by_venue_key[venue_key] = google_place_id
+
+    # Venues that couldn't be geocoded aren't memoized, so that they're tried again on the next page or run.
+    _google_place_ids_by_venue_key.update(new_google_place_ids_by_venue_key)
+    await asyncio.gather(
+        *[
+            google_places_cache.set_cached_venue_place_id(venue_key, google_place_id)
+            for venue_key, google_place_id in new_google_place_ids_by_venue_key.items()
+        ]
+    )
+
+    for venue_key, events in events_by_venue_key.items():
+        for importable_event in events:
+            importable_event.google_place_id = _google_place_ids_by_venue_key.get(venue_key)
+
+
+async def _ticket_classes_snapshot(
+    eventbrite: EventbriteUtility, *, eventbrite_event_id: str, org_stats: dict[str, Any]
+) -> list[TicketClassSnapshot] | None:
+    """
+    Returns None if the ticket classes couldn't be fetched, in which case the event's existing snapshot is kept.
+    """
+    try:
+        return await eventbrite.list_ticket_class_snapshots(event_id=eventbrite_event_id)
+    except Exception as e:
+        LOGGER.exception(e)
+        org_stats.setdefault("ticket_classes_snapshot_failed", 0)
+        org_stats["ticket_classes_snapshot_failed"] += 1
+        return None
+
+
+async def _refresh_ticket_classes_snapshots(
+    eventbrite: EventbriteUtility, *, eventbrite_event_ids: list[str], org_stats: dict[str, Any]
+) -> None:
+    """
+    Unchanged events aren't written again in incremental mode, but their ticket classes snapshots still age.
+    Snapshots past half of the planner's max age are refreshed, so that they're still fresh until the next run.
+    """
+    if len(eventbrite_event_ids) == 0:
+        return
+
+    async with eave.core.database.async_session.begin() as db_session:
+        stale_event_ids = await EventbriteEventOrm.stale_ticket_classes_snapshot_event_ids(
+            db_session,
+            eventbrite_event_ids=eventbrite_event_ids,
+            max_age_seconds=CORE_API_APP_CONFIG.eventbrite_ticket_classes_snapshot_max_age_seconds / 2,
+        )
+
+    if len(stale_event_ids) == 0:
+        return
+
+    ticket_classes_snapshots = await asyncio.gather(
+        *[
+            _ticket_classes_snapshot(eventbrite, eventbrite_event_id=eventbrite_event_id, org_stats=org_stats)
+            for eventbrite_event_id in stale_event_ids
+        ]
+    )
+
+    refreshed = {
+        eventbrite_event_id: ticket_classes_snapshot
+        for eventbrite_event_id, ticket_classes_snapshot in zip(stale_event_ids, ticket_classes_snapshots, strict=True)
+        if ticket_classes_snapshot is not None
+    }
+
+    async with eave.core.database.async_session.begin() as db_session:
+        await EventbriteEventOrm.update_ticket_classes_snapshots(db_session, refreshed)
+
+    for stats in (org_stats, _run_stats):
+        stats.setdefault("ticket_classes_snapshots_refreshed", 0)
+        stats["ticket_classes_snapshots_refreshed"] += len(refreshed)
+
+
+async def _main(*, concurrency: int, incremental: bool, shard: _Shard, restart: bool) -> None:
+    try:
+        await _get_eventbrite_events(concurrency=concurrency, incremental=incremental, shard=shard, restart=restart)
+    finally:
+        await close_shared_session()
+
+
+def _emit_run_summary(summary_path: str | None) -> None:
+    """
+    Logs the run summary, and writes it to `summary_path` as JSON if given.
+    """
+    summary = {
+        "run": _run_stats,
+        "organizers": _organizer_stats,
+        "google_places_cache": dict(google_places_cache.CACHE_STATS),
+        "singleflight": singleflight.all_stats(),
+    }
+    LOGGER.info("eventbrite import summary", {"eventbrite_import_summary": summary})
+
+    if summary_path:
+        with open(summary_path, "w") as f:
+            json.dump(summary, f, default=str, indent=2)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import upcoming events from the hand-picked Eventbrite organizers.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of organizers to import concurrently. Requests are rate limited regardless.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only write events that changed since the last import. Run without this flag occasionally to rewrite everything.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        default=_Shard(index=0, count=1),
+        help="Only import the organizers in shard i of N (0 <= i < N), eg 0/4. Each shard can run in its own process.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Discard the shard's checkpoint and start over, instead of resuming an unfinished run.",
+    )
+    parser.add_argument("--summary-path", help="Also write the JSON run summary to this file.")
+    args = parser.parse_args()
+
     _perf_start = time.perf_counter()
     _run_stats["start_time"] = datetime.now().isoformat()
+    _run_stats["concurrency"] = args.concurrency
+    _run_stats["incremental"] = args.incremental
+    _run_stats["shard"] = args.shard.job_key
 
+    _succeeded = False
     try:
-        asyncio.run(_get_eventbrite_events())
+        asyncio.run(
+            _main(concurrency=args.concurrency, incremental=args.incremental, shard=args.shard, restart=args.restart)
+        )
+        _succeeded = _run_stats["organizers_failed"] == 0
     except KeyboardInterrupt:
         pass
     except Exception as e:
@@ -526,5 +998,8 @@ if __name__ == "__main__":
     finally:
         _run_stats["end_time"] = datetime.now().isoformat()
         _run_stats["runtime_minutes"] = int((time.perf_counter() - _perf_start) / 60)
-        pprint(_organizer_stats)
-        pprint(_run_stats)
+        _run_stats["succeeded"] = _succeeded
+        _emit_run_summary(args.summary_path)
+
+    # A failed run exits non-zero, so that the job runner retries it. The retry resumes from the checkpoint.
+    sys.exit(0 if _succeeded else 1)
@@ -22,7 +22,7 @@ class OutingInput:
 
 async def get_outing_query(*, info: strawberry.Info[GraphQLContext], input: OutingInput) -> Outing | None:
     async with database.async_session.begin() as db_session:
-        outing_orm = await OutingOrm.get_one(db_session, input.id)
+        outing_orm = await OutingOrm.get_one(db_session, input.id, profile="details")
 
     one_day_from_now = datetime.now(UTC) + timedelta(hours=24)
 
@@ -69,7 +69,7 @@ async def list_bookings_query(
     account_id = unwrap(info.context.get("authenticated_account_id"))
 
     async with database.async_session.begin() as db_session:
-        account = await AccountOrm.get_one(db_session, account_id)
+        account = await AccountOrm.get_one(db_session, account_id, profile="bookings_peek")
 
     booking_peeks = []
 
@@ -124,7 +124,7 @@ async def get_booking_details_query(
     account_id = unwrap(info.context.get("authenticated_account_id"))
 
     async with database.async_session.begin() as session:
-        account = await AccountOrm.get_one(session, account_id)
+        account = await AccountOrm.get_one(session, account_id, profile="bookings")
         booking_orm = account.get_booking(booking_id=input.booking_id)
 
     if not booking_orm:
@@ -14,7 +14,7 @@ async def get_outing_preferences_query(
     account_id = unwrap(info.context.get("authenticated_account_id"))
 
     async with database.async_session.begin() as session:
-        account = await AccountOrm.get_one(session, account_id)
+        account = await AccountOrm.get_one(session, account_id, profile="outing_preferences")
 
     if not account.outing_preferences:
         return OutingPreferences(
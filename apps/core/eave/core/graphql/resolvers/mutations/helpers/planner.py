@@ -1,10 +1,14 @@
+import asyncio
 import dataclasses
 import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Any, Literal
 from uuid import UUID
 
-from sqlalchemy import func
+from google.maps.places import Place
 
 import eave.core.database
 from eave.core.config import CORE_API_APP_CONFIG
@@ -14,7 +18,8 @@ from eave.core.graphql.types.cost_breakdown import CostBreakdown
 from eave.core.graphql.types.outing import OutingPreferencesInput
 from eave.core.graphql.types.restaurant import Reservation, Restaurant
 from eave.core.graphql.types.survey import Survey
-from eave.core.lib.event_helpers import get_internal_activity
+from eave.core.lib import google_places_cache
+from eave.core.lib.event_helpers import internal_activity_from_orm
 from eave.core.lib.eventbrite import EventbriteUtility
 from eave.core.lib.google_places import GooglePlacesUtility
 from eave.core.lib.time_category import is_early_evening, is_early_morning, is_late_evening, is_late_morning
@@ -24,7 +29,9 @@ from eave.core.orm.evergreen_activity import EvergreenActivityOrm
 from eave.core.orm.restaurant_category import MAGIC_BAR_RESTAURANT_CATEGORY_ID, RestaurantCategoryOrm
 from eave.core.orm.search_region import SearchRegionOrm
 from eave.core.orm.survey import SurveyOrm
-from eave.core.shared.geo import Distance, GeoArea
+from eave.core.shared.enums import ActivitySource
+from eave.core.shared.geo import Distance, GeoArea, GeoPoint
+from eave.stdlib import singleflight
 from eave.stdlib.config import SHARED_CONFIG
 from eave.stdlib.logging import LOGGER
 
@@ -41,6 +48,9 @@ _BRUNCH_GOOGLE_RESTAURANT_CATEGORY_IDS = (
     "cafe",
 )
 
+# When an activity has been chosen, restaurants within these distances from the venue are preferred, in order.
+_RESTAURANT_RADIUS_MILES = (5, 10, 15, 20)
+
 
 @dataclass(kw_only=True)
 class PlannerResult:
@@ -49,6 +59,94 @@ class PlannerResult:
     reservation: Reservation | None
 
 
+@dataclass(kw_only=True)
+class ActivitySourceTiming:
+    source: ActivitySource
+    elapsed_seconds: float
+    outcome: Literal["found", "exhausted", "cancelled", "error"]
+
+
+@dataclass(kw_only=True)
+class RestaurantSearchResult:
+    area: GeoArea
+    google_category_id_group: list[str]
+    places: list[Place]
+
+
+def _place_is_within_area(*, place: Place, area: GeoArea) -> bool:
+    place_coordinates = GeoPoint(lat=place.location.latitude, lon=place.location.longitude)
+    return area.center.haversine_distance(to_point=place_coordinates) <= area.rad.miles
+
+
+def _unique_places(places: Iterable[Place]) -> list[Place]:
+    """
+    The same place can be returned by multiple searches (eg overlapping search regions).
+    """
+    unique: dict[str, Place] = {}
+    for place in places:
+        unique.setdefault(place.id, place)
+
+    return list(unique.values())
+
+
+# The Places API accepts at most this many `included_primary_types` in a single nearby search.
+_MAX_INCLUDED_PRIMARY_TYPES = 50
+
+
+def _unique_google_category_ids(google_category_id_groups: Iterable[list[str]]) -> list[str]:
+    return list(
+        dict.fromkeys(cid for google_category_id_group in google_category_id_groups for cid in google_category_id_group)
+    )
+
+
+def _merge_google_category_id_groups(google_category_id_groups: list[list[str]]) -> list[list[list[str]]]:
+    """
+    Splits the (preference-ordered) category groups into consecutive runs, such that the union of each run's
+    Google category IDs fits in a single nearby search.
+    """
+    merged: list[list[list[str]]] = []
+
+    for google_category_id_group in google_category_id_groups:
+        if len(merged) > 0 and (
+            len(_unique_google_category_ids([*merged[-1], google_category_id_group])) <= _MAX_INCLUDED_PRIMARY_TYPES
+        ):
+            merged[-1].append(google_category_id_group)
+        else:
+            merged.append([google_category_id_group])
+
+    return merged
+
+
+def _partition_by_google_category_id_group(
+    *, search_result: RestaurantSearchResult, google_category_id_groups: list[list[str]]
+) -> list[RestaurantSearchResult]:
+    """
+    Buckets the places from a merged search back into the given category groups, by each place's primary type.
+    A primary type that belongs to more than one group is assigned to the most preferred group.
+    The search only returns places whose primary type is in one of the groups, but in case one doesn't match,
+    it's assigned to the first group that matches any of its types, or else the most preferred group.
+    """
+    places_by_group: list[list[Place]] = [[] for _ in google_category_id_groups]
+
+    for place in search_result.places:
+        group_index = next(
+            (i for i, group in enumerate(google_category_id_groups) if place.primary_type in group),
+            next((i for i, group in enumerate(google_category_id_groups) if any(t in group for t in place.types)), 0),
+        )
+        places_by_group[group_index].append(place)
+
+    return [
+        RestaurantSearchResult(
+            area=search_result.area, google_category_id_group=google_category_id_group, places=places
+        )
+        for google_category_id_group, places in zip(google_category_id_groups, places_by_group, strict=True)
+    ]
+
+
+async def _collect[T](iterator: AsyncIterator[T]) -> list[T]:
+    return [item async for item in iterator]
+
+
 def _combine_restaurant_categories(individual_preferences: list[OutingPreferencesInput]) -> list[RestaurantCategoryOrm]:
     """
     Given a group of users, combine their restaurant category preferences
@@ -165,6 +263,10 @@ class OutingPlanner:
     excluded_google_place_ids: list[str]
     excluded_evergreen_activity_ids: list[UUID]
 
+    activity_source_timings: list[ActivitySourceTiming]
+    _upstream_semaphore: asyncio.Semaphore
+    _google_category_id_groups: list[list[str]] | None
+
     ctx: GraphQLContext
 
     def __init__(
@@ -208,6 +310,12 @@ class OutingPlanner:
         else:
             self.excluded_evergreen_activity_ids = excluded_evergreen_activity_ids or []
 
+        self.activity_source_timings = []
+        self._google_category_id_groups = None
+
+        # Limits the number of concurrent upstream API requests (Eventbrite, Google) made while planning this outing.
+        self._upstream_semaphore = asyncio.Semaphore(CORE_API_APP_CONFIG.planner_max_concurrent_upstream_requests)
+
         self.ctx = ctx
 
     async def plan_activity(self) -> Activity | None:
@@ -218,6 +326,13 @@ class OutingPlanner:
         For now, the activity always happens after a meal. We plan the activity
         first, then we find a restaurant nearby that users can eat at before
         the activity.
+
+        All of the activity sources are searched concurrently, but the result is
+        chosen in priority order: Eventbrite, then evergreen activities, then
+        Google Places. Lower-priority sources can search ahead (Google Places only
+        when it's enabled in the config), but they don't materialize a candidate
+        until every higher-priority source has come up empty, and they're cancelled
+        as soon as a higher-priority candidate is found.
         """
 
         start_time_local = self.survey.start_time_local
@@ -228,7 +343,6 @@ class OutingPlanner:
             start_time_local += timedelta(minutes=120)
 
         self.activity_start_time_local = start_time_local
-        end_time_local = start_time_local + timedelta(minutes=90)
 
         log_ctx = self._log_ctx()
 
@@ -245,61 +359,197 @@ class OutingPlanner:
         random.shuffle(regions)
 
         within_areas = [region.area for region in regions]
-        group_activity_category_preferences_ids = [cat.id for cat in self.group_activity_category_preferences]
 
-        LOGGER.debug("searching for eventbrite events", log_ctx)
+        self.activity_source_timings = []
+        self.activity = await self._first_activity_in_priority_order(
+            [
+                (
+                    ActivitySource.EVENTBRITE,
+                    lambda _: self._find_eventbrite_activity(within_areas=within_areas),
+                ),
+                (
+                    ActivitySource.INTERNAL,
+                    lambda _: self._find_evergreen_activity(within_areas=within_areas),
+                ),
+                (
+                    ActivitySource.GOOGLE_PLACES,
+                    lambda turn: self._find_google_places_activity(within_areas=within_areas, turn=turn),
+                ),
+            ]
+        )
+
+        LOGGER.info(
+            "activity source timings",
+            log_ctx,
+            {"activity_source_timings": [dataclasses.asdict(t) for t in self.activity_source_timings]},
+        )
+
+        if not self.activity:
+            # CASE 4: No suitable activity was found :(
+            LOGGER.warning("no activity found", log_ctx)
+
+        return self.activity
+
+    async def _first_activity_in_priority_order(
+        self,
+        sources: list[tuple[ActivitySource, Callable[[asyncio.Event], Coroutine[Any, Any, Activity | None]]]],
+    ) -> Activity | None:
+        """
+        Run every activity source concurrently and return the first activity found, in priority order.
+
+        Each source is given an event which is set once every higher-priority source has been exhausted.
+        Sources should wait for it before doing anything expensive that only matters if their candidate is used.
+        Sources that have nothing to wait for ignore it.
+        """
+        turns = [asyncio.Event() for _ in sources]
+        tasks = [
+            asyncio.create_task(self._timed_activity_source(source=source, coro=factory(turn)))
+            for (source, factory), turn in zip(sources, turns, strict=True)
+        ]
+
+        try:
+            for turn, task in zip(turns, tasks, strict=True):
+                turn.set()
+                if activity := await task:
+                    return activity
+
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            # Collect the cancelled tasks, and any errors from lower-priority sources that no longer matter.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _timed_activity_source(
+        self, *, source: ActivitySource, coro: Coroutine[Any, Any, Activity | None]
+    ) -> Activity | None:
+        timing = ActivitySourceTiming(source=source, elapsed_seconds=0, outcome="error")
+        self.activity_source_timings.append(timing)
+
+        start = time.perf_counter()
+        try:
+            activity = await coro
+            timing.outcome = "found" if activity else "exhausted"
+            return activity
+        except asyncio.CancelledError:
+            timing.outcome = "cancelled"
+            raise
+        finally:
+            timing.elapsed_seconds = time.perf_counter() - start
+
+    async def _find_eventbrite_activity(self, *, within_areas: list[GeoArea]) -> Activity | None:
+        """
+        CASE 1: Recommend an Eventbrite event.
+
+        Validating an event is the expensive part, and it has to happen before we know whether the event is usable,
+        so this source never waits for its turn (it's the highest priority anyway).
+
+        Candidates are validated in concurrent batches. Within a batch, the first valid candidate in the (random) query
+        order wins, so the result doesn't depend on which request happens to finish first.
+        """
+        assert self.activity_start_time_local
+        LOGGER.debug("searching for eventbrite events", self._log_ctx())
+
+        # Each validation makes several upstream requests (event, ticket classes, directions),
+        # so the number of candidates validated is what caps the upstream requests for this plan.
+        max_candidates = CORE_API_APP_CONFIG.planner_eventbrite_max_candidates
+        fan_out = max(1, CORE_API_APP_CONFIG.planner_eventbrite_validation_fan_out)
 
-        # CASE 1: Recommend an Eventbrite event.
         async with eave.core.database.async_session.begin() as db_session:
             eventbrite_events_query = EventbriteEventOrm.select(
-                start_time=start_time_local,
+                start_time=self.activity_start_time_local,
                 budget=self.survey.budget,
                 within_areas=within_areas,
-                vivial_activity_category_ids=group_activity_category_preferences_ids,
+                vivial_activity_category_ids=[cat.id for cat in self.group_activity_category_preferences],
                 excluded_eventbrite_event_ids=self.excluded_eventbrite_event_ids,
-            ).order_by(func.random())
+            )
 
-            eventbrite_events_results = await db_session.scalars(eventbrite_events_query)
+            candidates = await EventbriteEventOrm.sample(db_session, eventbrite_events_query, k=max_candidates)
 
-            for event_orm in eventbrite_events_results:
-                try:
-                    if activity := await self.eventbrite.get_eventbrite_activity(
-                        event_id=event_orm.eventbrite_event_id,
-                        survey=self.survey,
-                    ):
-                        self.activity = activity
-                        return activity
-                except Exception as e:
-                    if SHARED_CONFIG.is_local:
-                        raise
-                    else:
-                        LOGGER.exception(e)
-                        continue
+        for i in range(0, len(candidates), fan_out):
+            batch = candidates[i : i + fan_out]
+            tasks = [
+                asyncio.create_task(self._validate_eventbrite_candidate(eventbrite_event_orm=event_orm))
+                for event_orm in batch
+            ]
 
-        LOGGER.debug("searching for evergreen activities", log_ctx)
+            try:
+                for task in tasks:
+                    if activity := await task:
+                        return activity
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return None
+
+    async def _validate_eventbrite_candidate(self, *, eventbrite_event_orm: EventbriteEventOrm) -> Activity | None:
+        try:
+            async with self._upstream_semaphore:
+                return await self.eventbrite.get_eventbrite_activity(
+                    event_id=eventbrite_event_orm.eventbrite_event_id,
+                    survey=self.survey,
+                    # The candidate row already has the directions URI and ticket classes snapshot.
+                    eventbrite_event_orm=eventbrite_event_orm,
+                    # The price is verified again when the outing is booked.
+                    use_ticket_classes_snapshot=True,
+                )
+        except Exception as e:
+            if SHARED_CONFIG.is_local:
+                raise
+            else:
+                LOGGER.exception(e)
+                return None
+
+    async def _find_evergreen_activity(self, *, within_areas: list[GeoArea]) -> Activity | None:
+        """
+        CASE 2: Recommend an "evergreen" activity from our manually curated database.
+        """
+        assert self.activity_start_time_local
+        LOGGER.debug("searching for evergreen activities", self._log_ctx())
 
-        # CASE 2: Recommend an "evergreen" activity from our manually curated database.
         async with eave.core.database.async_session.begin() as db_session:
             evergreen_activities_query = EvergreenActivityOrm.select(
                 within_areas=within_areas,
-                activity_category_ids=group_activity_category_preferences_ids,
-                open_at_local=start_time_local,
+                activity_category_ids=[cat.id for cat in self.group_activity_category_preferences],
+                open_at_local=self.activity_start_time_local,
                 budget=self.survey.budget,
                 excluded_evergreen_activity_ids=self.excluded_evergreen_activity_ids,
-            ).order_by(func.random())
+            )
+
+            # Images and ticket types are loaded with the activity, so that building the Activity doesn't need
+            # any more queries.
+            evergreen_activities_query = evergreen_activities_query.options(
+                *EvergreenActivityOrm.load_options("details")
+            )
 
-            evergreen_activity_orms = await db_session.scalars(evergreen_activities_query)
+            # Every row that the query returns is eligible, so only one is needed.
+            evergreen_activity_orms = await EvergreenActivityOrm.sample(db_session, evergreen_activities_query, k=1)
 
-        for evergreen_activity_orm in evergreen_activity_orms:
-            if evergreen_activity := await get_internal_activity(
-                event_id=str(evergreen_activity_orm.id), survey=self.survey
-            ):
-                self.activity = evergreen_activity
-                return self.activity
+        if len(evergreen_activity_orms) == 0:
+            return None
 
-        LOGGER.debug("searching for ice cream/bar fallback", log_ctx)
+        # Building the Activity from the loaded ORM object doesn't make any database or Maps requests,
+        # so there's nothing expensive to wait for the turn for.
+        return internal_activity_from_orm(evergreen_activity_orms[0], survey=self.survey)
+
+    async def _find_google_places_activity(
+        self, *, within_areas: list[GeoArea], turn: asyncio.Event
+    ) -> Activity | None:
+        """
+        CASE 3: Recommend a bar or an ice cream shop as a fallback activity.
+
+        Nearby searches are billed, so unless searching ahead is enabled, nothing is searched until this source's turn.
+        """
+        assert self.activity_start_time_local
+        LOGGER.debug("searching for ice cream/bar fallback", self._log_ctx())
+
+        start_time_local = self.activity_start_time_local
+        end_time_local = start_time_local + timedelta(minutes=90)
 
-        # CASE 3: Recommend a bar or an ice cream shop as a fallback activity.
         is_evening = is_early_evening(self.survey.start_time_utc, self.survey.timezone) or is_late_evening(
             self.survey.start_time_utc, self.survey.timezone
         )
@@ -310,12 +560,16 @@ class OutingPlanner:
         if is_evening and self.group_open_to_bars:
             place_type = "bar"
 
+        if not CORE_API_APP_CONFIG.planner_places_activity_search_ahead_enabled:
+            await turn.wait()
+
         for search_area in within_areas:
             try:
-                places_nearby = await self.places.get_places_nearby(
-                    area=search_area,
-                    included_primary_types=[place_type],
-                )
+                async with self._upstream_semaphore:
+                    places_nearby = await self.places.get_places_nearby(
+                        area=search_area,
+                        included_primary_types=[place_type],
+                    )
             except Exception as e:
                 if SHARED_CONFIG.is_local:
                     raise
@@ -338,9 +592,12 @@ class OutingPlanner:
 
                 # Select activities that are within (<=) their requested budget.
                 if will_be_open and place.price_level <= self.survey.budget.google_places_price_level:
+                    # Fetching photos for the place costs money, so only do it if this source's result will be used.
+                    await turn.wait()
+
                     try:
-                        self.activity = await self.places.activity_from_google_place(place=place)
-                        return self.activity
+                        async with self._upstream_semaphore:
+                            return await self.places.activity_from_google_place(place=place)
                     except Exception as e:
                         if SHARED_CONFIG.is_local:
                             raise
@@ -348,18 +605,19 @@ class OutingPlanner:
                             LOGGER.exception(e)
                             continue
 
-        LOGGER.warning("no activity found", log_ctx)
-
-        # CASE 4: No suitable activity was found :(
-        self.activity = None
-        return self.activity
+        return None
 
-    async def plan_restaurant(self) -> Restaurant | None:
+    async def plan_restaurant(
+        self, *, speculative_search_results: list[RestaurantSearchResult] | None = None
+    ) -> Restaurant | None:
         """
         Plan a restaurant for the outing, taking into consideration the outing
         activity, outing constraints and group preferences.
 
         For now, the meal always happens before the activity.
+
+        `speculative_search_results` are the results of `search_restaurants_in_search_regions()`, which can run while
+        the activity is being planned. They're used before any follow-up searches are made around the activity venue.
         """
         arrival_time_local = self.survey.start_time_local
         self.restaurant_arrival_time_local = arrival_time_local
@@ -368,6 +626,264 @@ class OutingPlanner:
 
         log_ctx = self._log_ctx()
 
+        LOGGER.debug("finding restaurant", log_ctx)
+
+        # Find a restaurant that meets the outing constraints.
+        async for search_result in self._restaurant_search_results(
+            speculative_search_results=speculative_search_results
+        ):
+            restaurants_nearby = search_result.places
+
+            if len(self.excluded_google_place_ids):
+                restaurants_nearby = [r for r in restaurants_nearby if r.id not in self.excluded_google_place_ids]
+
+            if len(restaurants_nearby) == 0:
+                # Call `continue` because there is no need to continue if everything was filtered out.
+                # That's a confusing sentence.
+                LOGGER.warning(
+                    "no restaurants found for google category ids",
+                    log_ctx,
+                    {"google_category_ids": search_result.google_category_id_group},
+                )
+                continue
+
+            if restaurant := await self._choose_restaurant(
+                restaurants_nearby=restaurants_nearby,
+                arrival_time_local=arrival_time_local,
+                departure_time_local=departure_time_local,
+            ):
+                self.restaurant = restaurant
+                return self.restaurant
+
+        LOGGER.warning("no restaurant found", log_ctx)
+
+        # No restaurant was found :(
+        self.restaurant = None
+        return self.restaurant
+
+    async def search_restaurants_in_search_regions(self) -> list[RestaurantSearchResult]:
+        """
+        Search for restaurants in each of the survey's search regions.
+        This doesn't depend on the activity, so it can run while the activity is being planned.
+        """
+        search_results_by_area = await asyncio.gather(
+            *[_collect(self._search_restaurants_in_area(area=area)) for area in self._restaurant_search_region_areas()]
+        )
+
+        return [search_result for search_results in search_results_by_area for search_result in search_results]
+
+    async def _restaurant_search_results(
+        self, *, speculative_search_results: list[RestaurantSearchResult] | None
+    ) -> AsyncIterator[RestaurantSearchResult]:
+        """
+        Yields restaurant search results in order of preference.
+        Searches are made lazily, so that no unnecessary requests are made once a restaurant is chosen.
+        """
+        google_category_id_groups = self._restaurant_google_category_id_groups()
+
+        if self.activity:
+            # If an activity has been selected, prefer restaurants close to the venue.
+            venue_coordinates = self.activity.venue.location.coordinates
+
+            # Each place is only considered once, in the most preferred search result that contains it.
+            considered_place_ids: set[str] = set()
+
+            if speculative_search_results is not None:
+                speculative_places: dict[tuple[str, ...], list[Place]] = {}
+                for search_result in speculative_search_results:
+                    speculative_places.setdefault(tuple(search_result.google_category_id_group), []).extend(
+                        search_result.places
+                    )
+
+                async def _speculative_places_for_group(
+                    area: GeoArea, google_category_id_group: list[str]
+                ) -> list[Place]:
+                    return speculative_places.get(tuple(google_category_id_group), [])
+
+                async for search_result in self._restaurants_near_venue(
+                    venue_coordinates=venue_coordinates,
+                    google_category_id_groups=google_category_id_groups,
+                    places_for_group=_speculative_places_for_group,
+                    considered_place_ids=considered_place_ids,
+                ):
+                    yield search_result
+
+            # Follow-up searches are made per radius ring, so that the most popular places in each ring are found.
+            # A ring is only searched once the closer rings have run out of candidates.
+            follow_up_searches: dict[int, AsyncIterator[RestaurantSearchResult]] = {}
+            follow_up_places: dict[int, dict[tuple[str, ...], list[Place]]] = {}
+
+            async def _follow_up_places_for_group(area: GeoArea, google_category_id_group: list[str]) -> list[Place]:
+                ring = round(area.rad.meters)
+                key = tuple(google_category_id_group)
+
+                if ring not in follow_up_searches:
+                    follow_up_searches[ring] = self._search_restaurants_in_area(area=area)
+                    follow_up_places[ring] = {}
+
+                ring_places = follow_up_places[ring]
+
+                # Each ring's search yields the groups in preference order, so advance it until this group is reached.
+                if key not in ring_places:
+                    async for search_result in follow_up_searches[ring]:
+                        ring_places[tuple(search_result.google_category_id_group)] = search_result.places
+                        if tuple(search_result.google_category_id_group) == key:
+                            break
+
+                return ring_places.get(key, [])
+
+            async for search_result in self._restaurants_near_venue(
+                venue_coordinates=venue_coordinates,
+                google_category_id_groups=google_category_id_groups,
+                places_for_group=_follow_up_places_for_group,
+                considered_place_ids=considered_place_ids,
+            ):
+                yield search_result
+
+        elif speculative_search_results is not None:
+            # Without an activity, the speculative results are exactly the searches that would be made.
+            for search_result in speculative_search_results:
+                yield search_result
+
+        else:
+            for area in self._restaurant_search_region_areas():
+                async for search_result in self._search_restaurants_in_area(area=area):
+                    yield search_result
+
+    async def _restaurants_near_venue(
+        self,
+        *,
+        venue_coordinates: GeoPoint,
+        google_category_id_groups: list[list[str]],
+        places_for_group: Callable[[GeoArea, list[str]], Awaitable[list[Place]]],
+        considered_place_ids: set[str],
+    ) -> AsyncIterator[RestaurantSearchResult]:
+        """
+        Yields the candidates for each category group, bucketed by distance to the venue.
+        Closer buckets are preferred over the category group preference order, eg a 5-mile result for the
+        second category group is preferred over a 10-mile result for the first category group.
+
+        `places_for_group` is called with each ring's area, and only when a group's candidates in that ring are needed.
+        """
+        for miles in _RESTAURANT_RADIUS_MILES:
+            area = GeoArea(center=venue_coordinates, rad=Distance(miles=miles))
+
+            for google_category_id_group in google_category_id_groups:
+                places = _unique_places(
+                    place
+                    for place in await places_for_group(area, google_category_id_group)
+                    if place.id not in considered_place_ids and _place_is_within_area(place=place, area=area)
+                )
+
+                considered_place_ids.update(place.id for place in places)
+
+                if len(places) > 0:
+                    yield RestaurantSearchResult(
+                        area=area, google_category_id_group=google_category_id_group, places=places
+                    )
+
+    async def _search_restaurants_in_area(self, *, area: GeoArea) -> AsyncIterator[RestaurantSearchResult]:
+        """
+        Yields one search result per restaurant category group, in order of preference.
+        Unless merged searches are disabled, the groups are searched for together and partitioned locally.
+        Either way, searches are made lazily.
+        """
+        google_category_id_groups = self._restaurant_google_category_id_groups()
+
+        if CORE_API_APP_CONFIG.planner_merged_restaurant_search_disabled:
+            for google_category_id_group in google_category_id_groups:
+                yield await self._search_restaurants(area=area, google_category_id_group=google_category_id_group)
+
+            return
+
+        for merged_groups in _merge_google_category_id_groups(google_category_id_groups):
+            if len(merged_groups) == 1:
+                yield await self._search_restaurants(area=area, google_category_id_group=merged_groups[0])
+                continue
+
+            merged_search_result = await self._search_restaurants(
+                area=area,
+                google_category_id_group=_unique_google_category_ids(merged_groups),
+            )
+
+            for search_result in _partition_by_google_category_id_group(
+                search_result=merged_search_result, google_category_id_groups=merged_groups
+            ):
+                yield search_result
+
+    async def _search_restaurants(
+        self, *, area: GeoArea, google_category_id_group: list[str]
+    ) -> RestaurantSearchResult:
+        try:
+            async with self._upstream_semaphore:
+                places = await self.places.get_places_nearby(
+                    area=area,
+                    included_primary_types=google_category_id_group,
+                )
+        except Exception as e:
+            if SHARED_CONFIG.is_local:
+                raise
+            else:
+                LOGGER.exception(e)
+                places = []
+
+        return RestaurantSearchResult(area=area, google_category_id_group=google_category_id_group, places=places)
+
+    async def _choose_restaurant(
+        self, *, restaurants_nearby: list[Place], arrival_time_local: datetime, departure_time_local: datetime
+    ) -> Restaurant | None:
+        restaurants_nearby = list(restaurants_nearby)  # Copy, because the list is sorted in-place.
+        random.shuffle(restaurants_nearby)
+
+        perform_lte_price_level_comparison = arrival_time_local.hour < 11
+        if perform_lte_price_level_comparison:
+            # Before 11am, most restaurants are cheaper ($$ or less).
+            # So if someone chooses $$$-$$$$, we would rarely should them a restaurant recommendation.
+            # So in this case, we sort the (already shuffled) retrieved restaurants by price level descending.
+            # We don't do this for >= 11am because we don't want to recommend McDonald's for an expensive night out.
+            restaurants_nearby.sort(key=lambda place: place.price_level.value, reverse=True)  # in-place sort
+
+        for restaurant in restaurants_nearby:
+            if perform_lte_price_level_comparison:
+                # <=
+                # If we're < 11am, then find restaurants that have price less <= the selected price level
+                price_level_matches = restaurant.price_level <= self.survey.budget.google_places_price_level
+            else:
+                # ==
+                # Otherwise, find only restaurants that match the selected price livel
+                price_level_matches = restaurant.price_level == self.survey.budget.google_places_price_level
+
+            will_be_open = self.places.place_will_be_open(
+                place=restaurant,
+                arrival_time=arrival_time_local,
+                departure_time=departure_time_local,
+                timezone=self.survey.timezone,
+            )
+
+            # Select restaurants that _match_ their requested budget.
+            # So if they request an expensive date, we don't recommend McDonald's.
+            if will_be_open and price_level_matches:
+                try:
+                    async with self._upstream_semaphore:
+                        return await self.places.restaurant_from_google_place(place=restaurant)
+                except Exception as e:
+                    if SHARED_CONFIG.is_local:
+                        raise
+                    else:
+                        LOGGER.exception(e)
+                        continue
+
+        return None
+
+    def _restaurant_google_category_id_groups(self) -> list[list[str]]:
+        """
+        The Google Places types to search for, in order of preference.
+        The result is computed once per planner, so that speculative and follow-up searches use the same groups.
+        """
+        if self._google_category_id_groups is not None:
+            return self._google_category_id_groups
+
+        arrival_time_local = self.survey.start_time_local
         google_category_id_groups: list[list[str]] = []
 
         # If this is a morning outing, override user restaurant preferences and show them breakfast / brunch spots.
@@ -381,7 +897,7 @@ class OutingPlanner:
 
         if len(google_category_id_groups) == 0:
             # Failsafe - This should never happen
-            LOGGER.warning("No google category IDs could be resolved; falling back to defaults", log_ctx)
+            LOGGER.warning("No google category IDs could be resolved; falling back to defaults", self._log_ctx())
 
             # If included_primary_types is empty, this query returns everything, like car rental places and junk.
             # Although self.group_restaurant_category_preferences should never be empty, it's possible for there to be no google_category_ids here.
@@ -389,112 +905,64 @@ class OutingPlanner:
             google_category_id_groups = [cat.google_category_ids for cat in RestaurantCategoryOrm.defaults()]
             random.shuffle(google_category_id_groups)
 
-        # If an activity has been selected, try that search area first.
-        if self.activity:
-            within_areas = [
-                GeoArea(
-                    center=self.activity.venue.location.coordinates,
-                    rad=Distance(miles=miles),
-                )
-                for miles in (5, 10, 15, 20)
-            ]
-        else:
-            within_areas = [
-                SearchRegionOrm.one_or_exception(search_region_id=search_area_id).area
-                for search_area_id in self.survey.search_area_ids
-            ]
-            random.shuffle(within_areas)
+        self._google_category_id_groups = google_category_id_groups
+        return self._google_category_id_groups
+
+    def _restaurant_search_region_areas(self) -> list[GeoArea]:
+        within_areas = [
+            SearchRegionOrm.one_or_exception(search_region_id=search_area_id).area
+            for search_area_id in self.survey.search_area_ids
+        ]
+        random.shuffle(within_areas)
 
         if len(within_areas) == 0:
             # Failsafe - This should never happen
-            LOGGER.warning("No restaurant search areas categories could be resolved; falling back to defaults", log_ctx)
+            LOGGER.warning(
+                "No restaurant search areas categories could be resolved; falling back to defaults", self._log_ctx()
+            )
             # If there are no search areas given (which shouldn't happen but technically could), fallback to all of them.
             within_areas = [s.area for s in SearchRegionOrm.all()]
             random.shuffle(within_areas)
 
-        LOGGER.debug("finding restaurant", log_ctx)
-
-        # Find a restaurant that meets the outing constraints.
-        for area in within_areas:
-            for google_category_id_group in google_category_id_groups:
-                try:
-                    restaurants_nearby = await self.places.get_places_nearby(
-                        area=area,
-                        included_primary_types=google_category_id_group,
-                    )
-                except Exception as e:
-                    if SHARED_CONFIG.is_local:
-                        raise
-                    else:
-                        LOGGER.exception(e)
-                        continue
-
-                if len(self.excluded_google_place_ids):
-                    restaurants_nearby = [r for r in restaurants_nearby if r.id not in self.excluded_google_place_ids]
-
-                if len(restaurants_nearby) == 0:
-                    # Call `continue` because there is no need to continue if everything was filtered out.
-                    # That's a confusing sentence.
-                    LOGGER.warning(
-                        "no restaurants found for google category ids",
-                        log_ctx,
-                        {"google_category_ids": google_category_id_group},
-                    )
-                    continue
-
-                random.shuffle(restaurants_nearby)
-
-                perform_lte_price_level_comparison = arrival_time_local.hour < 11
-                if perform_lte_price_level_comparison:
-                    # Before 11am, most restaurants are cheaper ($$ or less).
-                    # So if someone chooses $$$-$$$$, we would rarely should them a restaurant recommendation.
-                    # So in this case, we sort the (already shuffled) retrieved restaurants by price level descending.
-                    # We don't do this for >= 11am because we don't want to recommend McDonald's for an expensive night out.
-                    restaurants_nearby.sort(key=lambda place: place.price_level.value, reverse=True)  # in-place sort
-
-                for restaurant in restaurants_nearby:
-                    if perform_lte_price_level_comparison:
-                        # <=
-                        # If we're < 11am, then find restaurants that have price less <= the selected price level
-                        price_level_matches = restaurant.price_level <= self.survey.budget.google_places_price_level
-                    else:
-                        # ==
-                        # Otherwise, find only restaurants that match the selected price livel
-                        price_level_matches = restaurant.price_level == self.survey.budget.google_places_price_level
-
-                    will_be_open = self.places.place_will_be_open(
-                        place=restaurant,
-                        arrival_time=arrival_time_local,
-                        departure_time=departure_time_local,
-                        timezone=self.survey.timezone,
-                    )
-
-                    # Select restaurants that _match_ their requested budget.
-                    # So if they request an expensive date, we don't recommend McDonald's.
-                    if will_be_open and price_level_matches:
-                        try:
-                            self.restaurant = await self.places.restaurant_from_google_place(place=restaurant)
-                            return self.restaurant
-                        except Exception as e:
-                            if SHARED_CONFIG.is_local:
-                                raise
-                            else:
-                                LOGGER.exception(e)
-                                continue
-
-        LOGGER.warning("no restaurant found", log_ctx)
-
-        # No restaurant was found :(
-        self.restaurant = None
-        return self.restaurant
+        return within_areas
 
     async def plan(self) -> PlannerResult:
         """
         Plan an outing for a group of users, taking into consideration outing
         constraints and group preferences.
+
+        The restaurant search radius is centered on the chosen activity, but unless it's disabled,
+        restaurants in the survey's search regions are searched speculatively while the activity is being planned.
         """
-        await self.plan_activity()
-        await self.plan_restaurant()
+        if CORE_API_APP_CONFIG.planner_speculative_restaurant_search_disabled:
+            await self.plan_activity()
+            await self.plan_restaurant()
+        else:
+            speculative_search = asyncio.create_task(self.search_restaurants_in_search_regions())
+
+            try:
+                await self.plan_activity()
+            except BaseException:
+                speculative_search.cancel()
+                raise
+
+            speculative_search_results: list[RestaurantSearchResult] | None = None
+            try:
+                speculative_search_results = await speculative_search
+            except Exception as e:
+                # The speculative search is only a head start; the restaurant can still be found without it.
+                LOGGER.exception(e, self._log_ctx())
+
+            await self.plan_restaurant(speculative_search_results=speculative_search_results)
+
+        LOGGER.info(
+            "upstream request stats",
+            self._log_ctx(),
+            {
+                "google_places_cache_stats": dict(google_places_cache.CACHE_STATS),
+                "singleflight_stats": singleflight.all_stats(),
+            },
+        )
 
         total_cost_breakdown = CostBreakdown()
 
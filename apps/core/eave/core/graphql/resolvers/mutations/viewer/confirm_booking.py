@@ -66,7 +66,7 @@ async def confirm_booking_mutation(
     visitor_id = info.context.get("visitor_id")
 
     async with database.async_session.begin() as db_session:
-        account_orm = await AccountOrm.get_one(db_session, account_id)
+        account_orm = await AccountOrm.get_one(db_session, account_id, profile="bookings")
         # It's important that when getting the booking, we use BOTH the account ID and booking ID.
         # Otherwise, it would be possible to confirm any booking, even ones you don't own.
         booking_orm = account_orm.get_booking(booking_id=input.booking_id)
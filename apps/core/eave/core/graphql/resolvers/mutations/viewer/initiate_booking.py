@@ -74,8 +74,8 @@ async def initiate_booking_mutation(
     visitor_id = info.context.get("visitor_id")
 
     async with database.async_session.begin() as db_session:
-        account_orm = await AccountOrm.get_one(db_session, account_id)
-        outing_orm = await OutingOrm.get_one(db_session, input.outing_id)
+        account_orm = await AccountOrm.get_one(db_session, account_id, profile="bookings")
+        outing_orm = await OutingOrm.get_one(db_session, input.outing_id, profile="details")
 
     if start_time_too_soon(start_time=outing_orm.start_time_utc, timezone=outing_orm.timezone):
         return InitiateBookingFailure(failure_reason=InitiateBookingFailureReason.START_TIME_TOO_SOON)
@@ -190,9 +190,7 @@ async def initiate_booking_mutation(
                 )
 
                 async with database.async_session.begin() as db_session:
-                    # We do this in a different session than the one fetching outing_orm because fetching outing_orm loads the
-                    # associated account, which may be the same as the authed account, in which case the session already has the
-                    # account attached and an error is thrown.
+                    # account_orm was loaded in an earlier session, so it's added to this one to save the change.
                     db_session.add(account_orm)
                     account_orm.stripe_customer_id = stripe_customer.id
 
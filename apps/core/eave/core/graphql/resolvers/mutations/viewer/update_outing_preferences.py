@@ -46,7 +46,7 @@ async def update_outing_preferences_mutation(
     account_id = unwrap(info.context.get("authenticated_account_id"))
 
     async with database.async_session.begin() as db_session:
-        account = await AccountOrm.get_one(db_session, account_id)
+        account = await AccountOrm.get_one(db_session, account_id, profile="outing_preferences")
 
         if not account.outing_preferences:
             outing_preferences = OutingPreferencesOrm(
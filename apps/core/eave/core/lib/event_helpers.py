@@ -13,7 +13,7 @@ from eave.core.graphql.types.survey import Survey
 from eave.core.graphql.types.ticket_info import TicketInfo
 from eave.core.lib.address import format_address
 from eave.core.lib.eventbrite import EventbriteUtility
-from eave.core.lib.google_places import GooglePlacesUtility
+from eave.core.lib.google_places import GooglePlacesUtility, google_maps_search_url
 from eave.core.orm.activity_category import ActivityCategoryOrm
 from eave.core.orm.activity_category_group import ActivityCategoryGroupOrm
 from eave.core.orm.booking import BookingOrm
@@ -24,12 +24,18 @@ from eave.core.shared.enums import ActivitySource, OutingBudget, RestaurantSourc
 
 
 async def get_internal_activity(*, event_id: str, survey: SurveyOrm | None) -> Activity | None:
-    places = GooglePlacesUtility()
-
     async with database.async_session.begin() as db_session:
-        activity_orm = await EvergreenActivityOrm.get_one(db_session, uid=uuid.UUID(event_id))
-        images = activity_orm.images
+        activity_orm = await EvergreenActivityOrm.get_one(db_session, uid=uuid.UUID(event_id), profile="details")
+
+    return internal_activity_from_orm(activity_orm, survey=survey)
 
+
+def internal_activity_from_orm(activity_orm: EvergreenActivityOrm, *, survey: SurveyOrm | None) -> Activity:
+    """
+    Builds the Activity from an evergreen activity whose `images` and `ticket_types` are already loaded.
+    This doesn't make any database or network requests.
+    """
+    images = activity_orm.images
     category_group = None
 
     if category := ActivityCategoryOrm.one_or_none(activity_category_id=activity_orm.activity_category_id):
@@ -37,7 +43,10 @@ async def get_internal_activity(*, event_id: str, survey: SurveyOrm | None) -> A
             activity_category_group_id=category.activity_category_group_id
         )
 
-    directions_uri = await places.google_maps_directions_url(format_address(activity_orm.address, singleline=True))
+    # The directions URI is computed ahead of time, so that no Maps requests are made here.
+    directions_uri = activity_orm.directions_uri or google_maps_search_url(
+        format_address(activity_orm.address, singleline=True)
+    )
 
     # Start with a price with all 0's
     most_expensive_eligible_price = CostBreakdown()
@@ -65,7 +74,7 @@ async def get_internal_activity(*, event_id: str, survey: SurveyOrm | None) -> A
             most_expensive_eligible_ticket_type = ticket_type
 
     return Activity(
-        source_id=event_id,
+        source_id=str(activity_orm.id),
         source=ActivitySource.INTERNAL,
         is_bookable=activity_orm.is_bookable,
         name=activity_orm.title,
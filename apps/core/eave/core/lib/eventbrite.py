@@ -1,3 +1,4 @@
+from eave.core import database
 from eave.core.config import CORE_API_APP_CONFIG
 from eave.core.graphql.types.activity import Activity, ActivityCategoryGroup, ActivityVenue
 from eave.core.graphql.types.address import GraphQLAddress
@@ -6,27 +7,113 @@ from eave.core.graphql.types.location import Location
 from eave.core.graphql.types.photos import Photo, Photos
 from eave.core.graphql.types.ticket_info import TicketInfo
 from eave.core.lib.address import format_address
-from eave.core.lib.google_places import GooglePlacesUtility
+from eave.core.lib.google_places import google_maps_search_url
 from eave.core.orm.activity_category import ActivityCategoryOrm
 from eave.core.orm.activity_category_group import ActivityCategoryGroupOrm
+from eave.core.orm.eventbrite_event import EventbriteEventOrm, TicketClassSnapshot
 from eave.core.orm.survey import SurveyOrm
 from eave.core.shared.enums import ActivitySource, OutingBudget
 from eave.core.shared.geo import GeoPoint
-from eave.stdlib.eventbrite.client import EventbriteClient, GetEventQuery, ListTicketClassesForSaleQuery
+from eave.stdlib.eventbrite.client import (
+    EventbriteClient,
+    GetEventQuery,
+    ListTicketClassesForSaleQuery,
+    RequestPolicy,
+)
 from eave.stdlib.eventbrite.models.event import EventStatus
 from eave.stdlib.eventbrite.models.expansions import Expansion
-from eave.stdlib.eventbrite.models.ticket_class import PointOfSale, TicketClass
+from eave.stdlib.eventbrite.models.ticket_class import OnSaleStatus, PointOfSale, TicketClass
 from eave.stdlib.logging import LOGGER
 
 
+def default_request_policy() -> RequestPolicy:
+    return RequestPolicy(
+        max_requests_per_second=CORE_API_APP_CONFIG.eventbrite_max_requests_per_second or None,
+        max_concurrent_requests_per_endpoint=CORE_API_APP_CONFIG.eventbrite_max_concurrent_requests_per_endpoint,
+        max_retries=CORE_API_APP_CONFIG.eventbrite_max_retries,
+    )
+
+
+def ticket_class_snapshot(ticket_class: TicketClass) -> TicketClassSnapshot:
+    cost = ticket_class.get("cost")
+    fee = ticket_class.get("fee")
+    tax = ticket_class.get("tax")
+
+    return TicketClassSnapshot(
+        id=ticket_class["id"],
+        display_name=ticket_class.get("display_name"),
+        description=ticket_class.get("description"),
+        cost_cents=cost["value"] if cost is not None else None,
+        fee_cents=fee["value"] if fee is not None else None,
+        tax_cents=tax["value"] if tax is not None else None,
+        on_sale_status=ticket_class.get("on_sale_status"),
+    )
+
+
+def _most_expensive_eligible_ticket_class(
+    ticket_classes: list[TicketClassSnapshot], *, survey: SurveyOrm | None
+) -> tuple[TicketClassSnapshot, CostBreakdown] | None:
+    """
+    Returns the most expensive ticket class whose total cost fits in the survey's budget, with its cost breakdown.
+    Free ticket classes are never chosen.
+    """
+    # Start with a price with all 0's
+    most_expensive_eligible_price = CostBreakdown()
+    most_expensive_eligible_ticket_class: TicketClassSnapshot | None = None
+
+    max_budget = survey.budget if survey else OutingBudget.default()
+
+    for ticket_class in ticket_classes:
+        if ticket_class["cost_cents"] is None:
+            continue
+
+        cost_breakdown = CostBreakdown(
+            base_cost_cents=ticket_class["cost_cents"],
+            fee_cents=ticket_class["fee_cents"] or 0,
+            tax_cents=ticket_class["tax_cents"] or 0,
+        )
+
+        total_cost_cents = cost_breakdown.calculate_total_cost_cents()
+
+        # If The total cost is <= the upper bound of the user's selected budget, then it is eligible.
+        cost_is_lte_max_budget = (
+            max_budget.upper_limit_cents is None or total_cost_cents <= max_budget.upper_limit_cents
+        )
+
+        if cost_is_lte_max_budget and total_cost_cents > most_expensive_eligible_price.calculate_total_cost_cents():
+            most_expensive_eligible_price = cost_breakdown
+            most_expensive_eligible_ticket_class = ticket_class
+
+    if most_expensive_eligible_ticket_class is None:
+        return None
+
+    return (most_expensive_eligible_ticket_class, most_expensive_eligible_price)
+
+
 class EventbriteUtility:
     client: EventbriteClient
 
-    def __init__(self) -> None:
-        self.client = EventbriteClient(api_key=CORE_API_APP_CONFIG.eventbrite_api_key)
-        self._places = GooglePlacesUtility()
+    def __init__(self, *, request_policy: RequestPolicy | None = None) -> None:
+        self.client = EventbriteClient(
+            api_key=CORE_API_APP_CONFIG.eventbrite_api_key,
+            result_window_seconds=CORE_API_APP_CONFIG.upstream_result_window_seconds,
+            request_policy=request_policy or default_request_policy(),
+        )
+
+    async def get_eventbrite_activity(
+        self,
+        *,
+        event_id: str,
+        survey: SurveyOrm | None,
+        eventbrite_event_orm: EventbriteEventOrm | None = None,
+        use_ticket_classes_snapshot: bool = False,
+    ) -> Activity | None:
+        """
+        With `use_ticket_classes_snapshot`, the ticket price comes from the snapshot taken at import time, if it's fresh.
+        That's fine for planning, but bookings must use live ticket classes (the default).
 
-    async def get_eventbrite_activity(self, *, event_id: str, survey: SurveyOrm | None) -> Activity | None:
+        `eventbrite_event_orm` is the imported event, if the caller already loaded it. Otherwise, it's queried.
+        """
         event = await self.client.get_event_by_id(event_id=event_id, query=GetEventQuery(expand=Expansion.all()))
 
         if not (ticket_availability := event.get("ticket_availability")):
@@ -79,45 +166,30 @@ class EventbriteUtility:
             )
             return
 
-        ticket_classes_paginator = self.client.list_ticket_classes_for_sale_for_event(
-            event_id=event_id,
-            query=ListTicketClassesForSaleQuery(
-                pos=PointOfSale.ONLINE,
-            ),
-        )
-
-        # Start with a price with all 0's
-        most_expensive_eligible_price = CostBreakdown()
-        most_expensive_eligible_ticket_class: TicketClass | None = None
-
-        async for batch in ticket_classes_paginator:
-            for ticket_class in batch:
-                base_cost = ticket_class.get("cost")
-                if base_cost is None:
-                    continue
+        # The directions URI and ticket classes snapshot are stored when the event is imported.
+        if eventbrite_event_orm is None:
+            async with database.async_session.begin() as db_session:
+                eventbrite_event_orm = (
+                    await db_session.scalars(EventbriteEventOrm.select(eventbrite_event_id=event_id).limit(1))
+                ).one_or_none()
 
-                cost_breakdown = CostBreakdown(base_cost_cents=base_cost["value"])
-
-                if (fee := ticket_class.get("fee")) is not None:
-                    cost_breakdown.fee_cents = fee["value"]
-
-                if (tax := ticket_class.get("tax")) is not None:
-                    cost_breakdown.tax_cents = tax["value"]
-
-                total_cost_cents = cost_breakdown.calculate_total_cost_cents()
-                max_budget = survey.budget if survey else OutingBudget.default()
+        ticket_classes = None
+        if use_ticket_classes_snapshot and eventbrite_event_orm:
+            ticket_classes = eventbrite_event_orm.fresh_ticket_classes_snapshot(
+                max_age_seconds=CORE_API_APP_CONFIG.eventbrite_ticket_classes_snapshot_max_age_seconds
+            )
 
-                # If The total cost is <= the upper bound of the user's selected budget, then it is eligible.
-                cost_is_lte_max_budget = (
-                    max_budget.upper_limit_cents is None or total_cost_cents <= max_budget.upper_limit_cents
-                )
+        if ticket_classes is not None:
+            # The snapshot may be out of date, so leave out the ticket classes that definitely can't be bought.
+            ticket_classes = [
+                ticket_class
+                for ticket_class in ticket_classes
+                if ticket_class["on_sale_status"] not in (OnSaleStatus.SOLD_OUT, OnSaleStatus.UNAVAILABLE)
+            ]
+        else:
+            ticket_classes = await self.list_ticket_class_snapshots(event_id=event_id)
 
-                if (
-                    cost_is_lte_max_budget
-                    and total_cost_cents > most_expensive_eligible_price.calculate_total_cost_cents()
-                ):
-                    most_expensive_eligible_price = cost_breakdown
-                    most_expensive_eligible_ticket_class = ticket_class
+        most_expensive_eligible = _most_expensive_eligible_ticket_class(ticket_classes, survey=survey)
 
         if event_description := event.get("description"):
             event_description_text = event_description["text"]
@@ -162,7 +234,9 @@ class EventbriteUtility:
             lon=float(venue_lon),
         )
 
-        directions_uri = await self._places.google_maps_directions_url(format_address(address, singleline=True))
+        directions_uri = (eventbrite_event_orm and eventbrite_event_orm.directions_uri) or google_maps_search_url(
+            format_address(address, singleline=True)
+        )
 
         activity = Activity(
             source_id=event_id,
@@ -172,13 +246,13 @@ class EventbriteUtility:
             description=event_description_text,
             photos=photos,
             ticket_info=TicketInfo(
-                name=most_expensive_eligible_ticket_class.get("display_name"),
-                notes=most_expensive_eligible_ticket_class.get(
+                name=most_expensive_eligible[0]["display_name"],
+                notes=most_expensive_eligible[0][
                     "description"
-                ),  # FIXME: This is probably not the info we want for this field.
-                cost_breakdown=most_expensive_eligible_price,
+                ],  # FIXME: This is probably not the info we want for this field.
+                cost_breakdown=most_expensive_eligible[1],
             )
-            if most_expensive_eligible_ticket_class
+            if most_expensive_eligible
             else None,
             venue=ActivityVenue(
                 name=venue["name"],
@@ -199,3 +273,16 @@ class EventbriteUtility:
         )
 
         return activity
+
+    async def list_ticket_class_snapshots(self, *, event_id: str) -> list[TicketClassSnapshot]:
+        ticket_classes_paginator = self.client.list_ticket_classes_for_sale_for_event(
+            event_id=event_id,
+            query=ListTicketClassesForSaleQuery(
+                pos=PointOfSale.ONLINE,
+            ),
+            prefetch=1,
+        )
+
+        return [
+            ticket_class_snapshot(ticket_class) async for batch in ticket_classes_paginator for ticket_class in batch
+        ]
@@ -1,8 +1,9 @@
+import asyncio
 import enum
 import urllib.parse
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta
-from typing import TypedDict
+from typing import Any, TypedDict, cast
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
@@ -13,6 +14,7 @@ from google.maps.places import (
     Place,
     PlacesAsyncClient,
     SearchNearbyRequest,
+    SearchNearbyResponse,
 )
 from google.maps.places import (
     Photo as PlacePhoto,
@@ -25,11 +27,13 @@ from eave.core.graphql.types.address import GraphQLAddress
 from eave.core.graphql.types.location import Location
 from eave.core.graphql.types.photos import Photo, Photos
 from eave.core.graphql.types.restaurant import Restaurant
+from eave.core.lib import google_places_cache
 from eave.core.orm.activity_category_group import ActivityCategoryGroupOrm
 from eave.core.shared.enums import ActivitySource, RestaurantSource
 from eave.core.shared.geo import GeoArea, GeoPoint
 from eave.stdlib.config import SHARED_CONFIG
 from eave.stdlib.logging import LOGGER
+from eave.stdlib.singleflight import Singleflight
 
 # You must pass a field mask to the Google Places API to specify the list of fields to return in the response.
 # Reference: https://developers.google.com/maps/documentation/places/web-service/nearby-search
@@ -87,17 +91,73 @@ class GooglePlaceAddressComponentType(enum.StrEnum):
     subpremise = "subpremise"
 
 
+def google_maps_search_url(address: str) -> str:
+    """
+    A Google Maps link for the given address. This doesn't make any requests, so it's the fallback when a place's link isn't known.
+    """
+    urlsafe_addr = urllib.parse.quote_plus(address)
+    return f"https://www.google.com/maps/place/{urlsafe_addr}"
+
+
+# Identical concurrent requests (eg from many users planning outings in the same region) share one upstream request.
+_search_nearby_singleflight = Singleflight[SearchNearbyResponse]("google places search_nearby")
+_get_place_singleflight = Singleflight[Place]("google places get_place")
+_geocode_singleflight = Singleflight[list[GeocodeResult]]("google maps geocode")
+
+
 class GoogleMapsUtility:
     _client: googlemaps.Client
 
     def __init__(self) -> None:
         self._client = googlemaps.Client(key=CORE_API_APP_CONFIG.google_maps_api_key)
 
-    def geocode(self, address: str) -> list[GeocodeResult]:
+    async def geocode(self, address: str) -> list[GeocodeResult]:
+        """
+        Results are cached by (normalized) address, and concurrent requests for the same address share one upstream request.
+        """
         if CORE_API_APP_CONFIG.google_maps_apis_disabled:
             return []
 
-        results: list[GeocodeResult] = googlemaps.geocoding.geocode(client=self._client, address=address)
+        if (cached := await google_places_cache.get_cached_geocode(address)) is not None:
+            return cast(list[GeocodeResult], cached)
+
+        return await _geocode_singleflight.do(
+            google_places_cache.normalize_address(address), lambda: self._geocode_and_cache(address)
+        )
+
+    async def geocode_many(
+        self, addresses: Iterable[str], *, max_concurrency: int = 8
+    ) -> dict[str, list[GeocodeResult]]:
+        """
+        Geocodes a batch of addresses (eg a page of Eventbrite venues) concurrently.
+        Duplicate addresses are only geocoded once. Addresses that couldn't be geocoded map to an empty list.
+        """
+        unique_addresses = list(dict.fromkeys(addresses))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _geocode(address: str) -> list[GeocodeResult]:
+            async with semaphore:
+                try:
+                    return await self.geocode(address=address)
+                except Exception as e:
+                    if SHARED_CONFIG.is_local:
+                        raise
+                    else:
+                        LOGGER.exception(e)
+                        return []
+
+        results = await asyncio.gather(*[_geocode(address) for address in unique_addresses])
+        return dict(zip(unique_addresses, results, strict=True))
+
+    async def _geocode_and_cache(self, address: str) -> list[GeocodeResult]:
+        # The googlemaps client is synchronous, so run it in a thread to avoid blocking the event loop.
+        results: list[GeocodeResult] = await asyncio.to_thread(
+            googlemaps.geocoding.geocode, client=self._client, address=address
+        )
+
+        if len(results) > 0:
+            await google_places_cache.set_cached_geocode(address, cast(list[dict[str, Any]], results))
+
         return results
 
 
@@ -192,54 +252,60 @@ class GooglePlacesUtility:
         return activity
 
     async def photos_from_google_place(self, place: Place) -> Photos:
+        # Get the cover photo and up to 2 more photos. This is purely a cost-saving measure. Every call to the Photos API costs money and a Place can return up to 10 photos.
+        # The photos are fetched concurrently.
+        results = await asyncio.gather(
+            *[self.photo_from_google_place_photo(place_photo) for place_photo in place.photos[0:3]],
+            return_exceptions=True,
+        )
+
         photos = Photos(cover_photo=None, supplemental_photos=[])
 
         # We catch these requests because if the photos can't be fetched, we should still show the Place result.
-        if len(place.photos) > 0:
-            try:
-                photos.cover_photo = await self.photo_from_google_place_photo(
-                    place.photos[0],
-                )
-            except Exception as e:
-                if SHARED_CONFIG.is_local:
-                    raise
-                else:
-                    LOGGER.exception(e)
-
-        # Get up to 2 more photos. This is purely a cost-saving measure. Every call to the Photos API costs money and a Place can return up to 10 photos.
-        for place_photo in place.photos[1:3]:
-            try:
-                supplemental_photo = await self.photo_from_google_place_photo(
-                    place_photo,
-                )
-                if supplemental_photo:
-                    photos.supplemental_photos.append(supplemental_photo)
-            except Exception as e:
+        for i, result in enumerate(results):
+            if isinstance(result, BaseException):
                 if SHARED_CONFIG.is_local:
-                    raise
+                    raise result
                 else:
-                    LOGGER.exception(e)
+                    LOGGER.exception(result)
+            elif i == 0:
+                photos.cover_photo = result
+            elif result:
+                photos.supplemental_photos.append(result)
 
         return photos
 
-    # Warning: This function cannot be cached, because the photo media response contains temporary, expiring image URLs
     async def photo_from_google_place_photo(
         self,
         photo: PlacePhoto,
     ) -> Photo | None:
+        """
+        The photo media response contains temporary, expiring image URLs,
+        so they're only cached for a short time (well below their expiry).
+        """
         if CORE_API_APP_CONFIG.google_maps_apis_disabled:
             return None
 
-        photo_res = await self._client.get_photo_media(
-            request=GetPhotoMediaRequest(
-                name=f"{photo.name}/media",
-                max_width_px=1000,  # This value was chosen arbitrarily
+        max_width_px = 1000  # This value was chosen arbitrarily
+
+        if cached := await google_places_cache.get_cached_photo_media(photo_name=photo.name, max_width_px=max_width_px):
+            photo_media_name, photo_uri = cached
+        else:
+            photo_res = await self._client.get_photo_media(
+                request=GetPhotoMediaRequest(
+                    name=f"{photo.name}/media",
+                    max_width_px=max_width_px,
+                )
+            )
+
+            photo_media_name, photo_uri = photo_res.name, photo_res.photo_uri
+            await google_places_cache.set_cached_photo_media(
+                photo_name=photo.name, max_width_px=max_width_px, name=photo_media_name, photo_uri=photo_uri
             )
-        )
 
         return Photo(
-            id=photo_res.name,
-            src=photo_res.photo_uri,
+            id=photo_media_name,
+            src=photo_uri,
             alt=None,
             attributions=[attribution.display_name for attribution in photo.author_attributions]
             if photo.author_attributions
@@ -253,63 +319,132 @@ class GooglePlacesUtility:
         if CORE_API_APP_CONFIG.google_maps_apis_disabled:
             return None
 
+        if place := await google_places_cache.get_cached_place(place_id=place_id, field_mask=_PLACE_FIELD_MASK):
+            return place
+
         try:
-            place = await self._client.get_place(
-                request=GetPlaceRequest(name=f"places/{place_id}"), metadata=[("x-goog-fieldmask", _PLACE_FIELD_MASK)]
+            place = await _get_place_singleflight.do(
+                (place_id, _PLACE_FIELD_MASK),
+                lambda: self._client.get_place(
+                    request=GetPlaceRequest(name=f"places/{place_id}"),
+                    metadata=[("x-goog-fieldmask", _PLACE_FIELD_MASK)],
+                ),
+                result_window_seconds=CORE_API_APP_CONFIG.upstream_result_window_seconds,
             )
-            return place
         except Exception as e:
             LOGGER.error(e)
             return None
 
+        await google_places_cache.set_cached_places([place], field_mask=_PLACE_FIELD_MASK)
+        return place
+
+    async def invalidate_google_place(self, place_id: str) -> None:
+        """
+        Removes the cached details for the given place, so that the next `get_google_place` fetches it again.
+        """
+        await google_places_cache.invalidate_cached_place(place_id=place_id, field_mask=_PLACE_FIELD_MASK)
+
     async def get_places_nearby(
         self,
         *,
         area: GeoArea,
         included_primary_types: Sequence[str],
+        rank_preference: SearchNearbyRequest.RankPreference = SearchNearbyRequest.RankPreference.POPULARITY,
     ) -> list[Place]:
         """
         Given a Google Places API client, use it to search for places nearby the
         given latitude and longitude that meet the given constraints.
 
+        Results are cached by a quantized area, which covers slightly more than the given area,
+        but only places within the given area are returned.
+
         https://developers.google.com/maps/documentation/places/web-service/nearby-search
         """
 
         if CORE_API_APP_CONFIG.google_maps_apis_disabled:
             return []
 
+        included_primary_types = included_primary_types[0:50]
+
+        async def _search(search_area: GeoArea) -> list[Place]:
+            return await self._search_nearby(
+                area=search_area, included_primary_types=included_primary_types, rank_preference=rank_preference
+            )
+
+        return await google_places_cache.cached_places_nearby(
+            area=area,
+            included_primary_types=included_primary_types,
+            rank_preference=rank_preference,
+            search=_search,
+        )
+
+    async def _search_nearby(
+        self,
+        *,
+        area: GeoArea,
+        included_primary_types: Sequence[str],
+        rank_preference: SearchNearbyRequest.RankPreference,
+    ) -> list[Place]:
         location_restriction = SearchNearbyRequest.LocationRestriction()
         location_restriction.circle.radius = area.rad.meters
         location_restriction.circle.center.latitude = area.center.lat
         location_restriction.circle.center.longitude = area.center.lon
         request = SearchNearbyRequest(
             location_restriction=location_restriction,
-            included_primary_types=included_primary_types[0:50],
+            included_primary_types=included_primary_types,
+            rank_preference=rank_preference,
         )
 
-        response = await self._client.search_nearby(
-            request=request, metadata=[("x-goog-fieldmask", _SEARCH_NEARBY_FIELD_MASK)]
+        response = await _search_nearby_singleflight.do(
+            SearchNearbyRequest.serialize(request),
+            lambda: self._client.search_nearby(
+                request=request, metadata=[("x-goog-fieldmask", _SEARCH_NEARBY_FIELD_MASK)]
+            ),
+            result_window_seconds=CORE_API_APP_CONFIG.upstream_result_window_seconds,
         )
-        return list(response.places)
+        places = list(response.places)
+
+        # The nearby search returns the same fields as a details request, so a place seen here doesn't need to be fetched again.
+        await google_places_cache.set_cached_places(places, field_mask=_PLACE_FIELD_MASK)
+        return places
 
     async def google_maps_directions_url(self, address: str) -> str:
-        if not CORE_API_APP_CONFIG.google_maps_apis_disabled:
-            try:
-                geocode_results = self._maps.geocode(address=address)
-
-                for result in geocode_results:
-                    if place_id := result.get("place_id"):
-                        place = await self.get_google_place(place_id)
-                        if place and place.google_maps_uri:
-                            return place.google_maps_uri
-            except Exception as e:
-                if SHARED_CONFIG.is_local:
-                    raise
-                else:
-                    LOGGER.exception(e)
+        if google_maps_uri := await self.google_maps_uri(address=address):
+            return google_maps_uri
+        else:
+            return google_maps_search_url(address)
+
+    async def google_maps_uri(self, *, google_place_id: str | None = None, address: str | None = None) -> str | None:
+        """
+        Returns the Google Maps link for the given place, or for the place at the given address.
+        If the place can't be found, returns None.
+        """
+        if CORE_API_APP_CONFIG.google_maps_apis_disabled:
+            return None
+
+        try:
+            if google_place_id:
+                place_ids = [google_place_id]
+            elif address:
+                place_ids = [
+                    place_id
+                    for result in await self._maps.geocode(address=address)
+                    if (place_id := result.get("place_id"))
+                ]
+            else:
+                place_ids = []
+
+            for place_id in place_ids:
+                place = await self.get_google_place(place_id)
+                if place and place.google_maps_uri:
+                    return place.google_maps_uri
+        except Exception as e:
+            if SHARED_CONFIG.is_local:
+                raise
+            else:
+                LOGGER.exception(e)
 
-        urlsafe_addr = urllib.parse.quote_plus(address)
-        return f"https://www.google.com/maps/place/{urlsafe_addr}"
+        return None
 
     def location_from_google_place(self, place: Place) -> Location:
         address = GraphQLAddress(
@@ -0,0 +1,411 @@
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from google.maps.places import Place, SearchNearbyRequest
+
+from eave.core.config import CORE_API_APP_CONFIG
+from eave.core.shared.geo import Distance, GeoArea, GeoPoint
+from eave.stdlib import cache
+from eave.stdlib.logging import LOGGER
+
+# Search centers are snapped to a grid of this many degrees (roughly 1km), so that searches around nearby points share a cache entry.
+_NEARBY_SEARCH_GRID_DEGREES = 0.01
+
+# Search radii are rounded up to a multiple of this many meters.
+_NEARBY_SEARCH_RADIUS_STEP_METERS = 500
+
+# The Places API doesn't accept a nearby search radius larger than this.
+_NEARBY_SEARCH_MAX_RADIUS_METERS = 50000
+
+# Bump this when the cached value format (or the Places field mask) changes, so that old entries are ignored.
+_NEARBY_SEARCH_CACHE_VERSION = 1
+
+# Bump this when the cached value format changes, so that old entries are ignored.
+_PLACE_DETAILS_CACHE_VERSION = 1
+
+# Bump this when the cached value format changes, so that old entries are ignored.
+_PHOTO_MEDIA_CACHE_VERSION = 1
+
+# Bump this when the cached value format changes, so that old entries are ignored.
+_GEOCODE_CACHE_VERSION = 1
+
+# Bump this when the cached value format changes, so that old entries are ignored.
+_VENUE_PLACE_ID_CACHE_VERSION = 1
+
+# Hit/miss counts for the caches in this module, eg `nearby_search.hit`. These are per-process.
+# They're logged after each planned outing, and included in the Eventbrite importer's run summary.
+CACHE_STATS: Counter[str] = Counter()
+
+# Keeps a reference to the background refresh tasks, so that they aren't garbage collected while running,
+# and so that an entry is only refreshed once at a time.
+_nearby_search_refreshes: dict[str, asyncio.Task[None]] = {}
+
+
+def quantize_nearby_search_area(area: GeoArea) -> GeoArea:
+    """
+    Snaps the search center to the cache grid, and grows the radius so that the quantized area still covers the given area.
+    """
+    center = GeoPoint(
+        lat=round(round(area.center.lat / _NEARBY_SEARCH_GRID_DEGREES) * _NEARBY_SEARCH_GRID_DEGREES, 6),
+        lon=round(round(area.center.lon / _NEARBY_SEARCH_GRID_DEGREES) * _NEARBY_SEARCH_GRID_DEGREES, 6),
+    )
+
+    offset_meters = Distance(miles=area.center.haversine_distance(to_point=center)).meters
+    radius_meters = (
+        math.ceil((area.rad.meters + offset_meters) / _NEARBY_SEARCH_RADIUS_STEP_METERS)
+        * _NEARBY_SEARCH_RADIUS_STEP_METERS
+    )
+    radius_meters = min(radius_meters, _NEARBY_SEARCH_MAX_RADIUS_METERS)
+
+    return GeoArea(center=center, rad=Distance(miles=radius_meters / Distance(miles=1).meters))
+
+
+def nearby_search_cache_key(
+    *, area: GeoArea, included_primary_types: Sequence[str], rank_preference: SearchNearbyRequest.RankPreference
+) -> str:
+    types = ",".join(sorted(set(included_primary_types)))
+    return ":".join(
+        [
+            "google-places",
+            "nearby-search",
+            f"v{_NEARBY_SEARCH_CACHE_VERSION}",
+            f"{area.center.lat:.6f}",
+            f"{area.center.lon:.6f}",
+            str(round(area.rad.meters)),
+            rank_preference.name,
+            types,
+        ]
+    )
+
+
+def _places_within_area(places: list[Place], area: GeoArea) -> list[Place]:
+    """
+    The quantized search area is larger than the requested one, so places outside of the requested circle are removed.
+    Places without a location can't be checked, so they're kept.
+    """
+    return [
+        place
+        for place in places
+        if "location" not in place
+        or area.center.haversine_distance(to_point=GeoPoint(lat=place.location.latitude, lon=place.location.longitude))
+        <= area.rad.miles
+    ]
+
+
+async def cached_places_nearby(
+    *,
+    area: GeoArea,
+    included_primary_types: Sequence[str],
+    rank_preference: SearchNearbyRequest.RankPreference,
+    search: Callable[[GeoArea], Awaitable[list[Place]]],
+) -> list[Place]:
+    """
+    Returns the nearby search results for the given area from the cache, calling `search` on a miss.
+    `search` is called with the quantized area, which covers the given area, and its results are filtered back down
+    to the given area.
+
+    Entries are fresh for `google_places_nearby_cache_ttl_seconds`. For `google_places_nearby_cache_stale_seconds` after that,
+    the stale entry is returned and refreshed in the background.
+    """
+    ttl = CORE_API_APP_CONFIG.google_places_nearby_cache_ttl_seconds
+    if ttl <= 0:
+        return await search(area)
+
+    quantized_area = quantize_nearby_search_area(area)
+    key = nearby_search_cache_key(
+        area=quantized_area, included_primary_types=included_primary_types, rank_preference=rank_preference
+    )
+
+    entry = await _get_nearby_search_entry(key)
+
+    if entry is not None:
+        fetched_at, places = entry
+
+        if time.time() - fetched_at < ttl:
+            CACHE_STATS["nearby_search.hit"] += 1
+            return _places_within_area(places, area)
+
+        CACHE_STATS["nearby_search.stale_hit"] += 1
+
+        if key not in _nearby_search_refreshes:
+            task = asyncio.create_task(_refresh_nearby_search_entry(key=key, area=quantized_area, search=search))
+            _nearby_search_refreshes[key] = task
+            task.add_done_callback(lambda _: _nearby_search_refreshes.pop(key, None))
+
+        return _places_within_area(places, area)
+
+    CACHE_STATS["nearby_search.miss"] += 1
+    places = await search(quantized_area)
+    await _set_nearby_search_entry(key, places)
+    return _places_within_area(places, area)
+
+
+async def _refresh_nearby_search_entry(
+    *, key: str, area: GeoArea, search: Callable[[GeoArea], Awaitable[list[Place]]]
+) -> None:
+    try:
+        places = await search(area)
+    except Exception as e:
+        LOGGER.exception(e)
+        return
+
+    CACHE_STATS["nearby_search.refresh"] += 1
+    await _set_nearby_search_entry(key, places)
+
+
+async def _get_nearby_search_entry(key: str) -> tuple[float, list[Place]] | None:
+    try:
+        value = await cache.client_or_exception().get(key)
+        if value is None:
+            return None
+
+        entry = json.loads(value)
+        places = [Place.deserialize(base64.b64decode(serialized)) for serialized in entry["places"]]
+        return (entry["fetched_at"], places)
+    except Exception as e:
+        # A broken cache shouldn't break the search.
+        CACHE_STATS["nearby_search.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+
+async def _set_nearby_search_entry(key: str, places: list[Place]) -> None:
+    value = json.dumps(
+        {
+            "fetched_at": time.time(),
+            "places": [base64.b64encode(Place.serialize(place)).decode() for place in places],
+        }
+    )
+
+    try:
+        await cache.client_or_exception().set(
+            key,
+            value,
+            ex=CORE_API_APP_CONFIG.google_places_nearby_cache_ttl_seconds
+            + CORE_API_APP_CONFIG.google_places_nearby_cache_stale_seconds,
+        )
+    except Exception as e:
+        CACHE_STATS["nearby_search.error"] += 1
+        LOGGER.exception(e)
+
+
+def place_details_cache_key(*, place_id: str, field_mask: str) -> str:
+    """
+    The field mask is part of the key, so that a Place fetched with fewer fields is never served for a request that needs more.
+    """
+    field_mask_digest = hashlib.sha256(field_mask.encode()).hexdigest()[0:16]
+    return ":".join(["google-places", "place", f"v{_PLACE_DETAILS_CACHE_VERSION}", field_mask_digest, place_id])
+
+
+async def get_cached_place(*, place_id: str, field_mask: str) -> Place | None:
+    if CORE_API_APP_CONFIG.google_places_details_cache_ttl_seconds <= 0:
+        return None
+
+    try:
+        value = await cache.client_or_exception().get(place_details_cache_key(place_id=place_id, field_mask=field_mask))
+    except Exception as e:
+        CACHE_STATS["place_details.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    if value is None:
+        CACHE_STATS["place_details.miss"] += 1
+        return None
+
+    try:
+        place = Place.deserialize(base64.b64decode(value))
+    except Exception as e:
+        # A corrupt or old-format entry is treated as a miss, and is overwritten when the place is fetched.
+        CACHE_STATS["place_details.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    CACHE_STATS["place_details.hit"] += 1
+    return place
+
+
+async def set_cached_places(places: Sequence[Place], *, field_mask: str) -> None:
+    """
+    `field_mask` must be the field mask that `places` were fetched with.
+    For a nearby search, that's the search field mask without the `places.` prefix.
+    """
+    ttl = CORE_API_APP_CONFIG.google_places_details_cache_ttl_seconds
+    if ttl <= 0:
+        return
+
+    try:
+        cache_client = cache.client_or_exception()
+        await asyncio.gather(
+            *[
+                cache_client.set(
+                    place_details_cache_key(place_id=place.id, field_mask=field_mask),
+                    base64.b64encode(Place.serialize(place)).decode(),
+                    ex=ttl,
+                )
+                for place in places
+                if place.id
+            ]
+        )
+    except Exception as e:
+        CACHE_STATS["place_details.error"] += 1
+        LOGGER.exception(e)
+
+
+async def invalidate_cached_place(*, place_id: str, field_mask: str) -> None:
+    try:
+        await cache.client_or_exception().delete(place_details_cache_key(place_id=place_id, field_mask=field_mask))
+    except Exception as e:
+        CACHE_STATS["place_details.error"] += 1
+        LOGGER.exception(e)
+
+
+def photo_media_cache_key(*, photo_name: str, max_width_px: int) -> str:
+    return ":".join(["google-places", "photo-media", f"v{_PHOTO_MEDIA_CACHE_VERSION}", str(max_width_px), photo_name])
+
+
+async def get_cached_photo_media(*, photo_name: str, max_width_px: int) -> tuple[str, str] | None:
+    """
+    Returns the (name, photo_uri) of the photo media, if cached.
+    """
+    if CORE_API_APP_CONFIG.google_places_photo_cache_ttl_seconds <= 0:
+        return None
+
+    try:
+        value = await cache.client_or_exception().get(
+            photo_media_cache_key(photo_name=photo_name, max_width_px=max_width_px)
+        )
+    except Exception as e:
+        CACHE_STATS["photo_media.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    if value is None:
+        CACHE_STATS["photo_media.miss"] += 1
+        return None
+
+    try:
+        entry = json.loads(value)
+        photo_media = (entry["name"], entry["photo_uri"])
+    except Exception as e:
+        # A corrupt or old-format entry is treated as a miss, and is overwritten when the photo is fetched.
+        CACHE_STATS["photo_media.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    CACHE_STATS["photo_media.hit"] += 1
+    return photo_media
+
+
+async def set_cached_photo_media(*, photo_name: str, max_width_px: int, name: str, photo_uri: str) -> None:
+    ttl = CORE_API_APP_CONFIG.google_places_photo_cache_ttl_seconds
+    if ttl <= 0:
+        return
+
+    try:
+        await cache.client_or_exception().set(
+            photo_media_cache_key(photo_name=photo_name, max_width_px=max_width_px),
+            json.dumps({"name": name, "photo_uri": photo_uri}),
+            ex=ttl,
+        )
+    except Exception as e:
+        CACHE_STATS["photo_media.error"] += 1
+        LOGGER.exception(e)
+
+
+def normalize_address(address: str) -> str:
+    """
+    Addresses that only differ by case or whitespace share a geocode cache entry.
+    """
+    return " ".join(address.split()).casefold()
+
+
+def geocode_cache_key(address: str) -> str:
+    address_digest = hashlib.sha256(normalize_address(address).encode()).hexdigest()
+    return ":".join(["google-maps", "geocode", f"v{_GEOCODE_CACHE_VERSION}", address_digest])
+
+
+async def get_cached_geocode(address: str) -> list[dict[str, Any]] | None:
+    if CORE_API_APP_CONFIG.google_maps_geocode_cache_ttl_seconds <= 0:
+        return None
+
+    try:
+        value = await cache.client_or_exception().get(geocode_cache_key(address))
+    except Exception as e:
+        CACHE_STATS["geocode.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    if value is None:
+        CACHE_STATS["geocode.miss"] += 1
+        return None
+
+    try:
+        results = json.loads(value)
+        if not isinstance(results, list):
+            raise TypeError(f"cached geocode results are a {type(results).__name__}, not a list")
+    except Exception as e:
+        # A corrupt or old-format entry is treated as a miss, and is overwritten when the address is geocoded.
+        CACHE_STATS["geocode.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    CACHE_STATS["geocode.hit"] += 1
+    return results
+
+
+async def set_cached_geocode(address: str, results: list[dict[str, Any]]) -> None:
+    ttl = CORE_API_APP_CONFIG.google_maps_geocode_cache_ttl_seconds
+    if ttl <= 0:
+        return
+
+    try:
+        await cache.client_or_exception().set(geocode_cache_key(address), json.dumps(results), ex=ttl)
+    except Exception as e:
+        CACHE_STATS["geocode.error"] += 1
+        LOGGER.exception(e)
+
+
+def venue_place_id_cache_key(venue_key: str) -> str:
+    return ":".join(["google-maps", "venue-place-id", f"v{_VENUE_PLACE_ID_CACHE_VERSION}", venue_key])
+
+
+async def get_cached_venue_place_id(venue_key: str) -> str | None:
+    """
+    Returns the Google Place ID that a venue (eg an Eventbrite venue ID) was geocoded to, if cached.
+    Entries share the geocode cache TTL.
+    """
+    if CORE_API_APP_CONFIG.google_maps_geocode_cache_ttl_seconds <= 0:
+        return None
+
+    try:
+        value = await cache.client_or_exception().get(venue_place_id_cache_key(venue_key))
+    except Exception as e:
+        CACHE_STATS["venue_place_id.error"] += 1
+        LOGGER.exception(e)
+        return None
+
+    if value is None:
+        CACHE_STATS["venue_place_id.miss"] += 1
+        return None
+
+    CACHE_STATS["venue_place_id.hit"] += 1
+    return value
+
+
+async def set_cached_venue_place_id(venue_key: str, google_place_id: str) -> None:
+    ttl = CORE_API_APP_CONFIG.google_maps_geocode_cache_ttl_seconds
+    if ttl <= 0:
+        return
+
+    try:
+        await cache.client_or_exception().set(venue_place_id_cache_key(venue_key), google_place_id, ex=ttl)
+    except Exception as e:
+        CACHE_STATS["venue_place_id.error"] += 1
+        LOGGER.exception(e)
@@ -10,6 +10,12 @@ from . import (
 from . import (
     eventbrite_event as eventbrite_event,
 )
+from . import (
+    eventbrite_import_progress as eventbrite_import_progress,
+)
+from . import (
+    eventbrite_organizer_checkpoint as eventbrite_organizer_checkpoint,
+)
 from . import (
     evergreen_activity as evergreen_activity,
 )
@@ -3,7 +3,7 @@ import hmac
 import os
 import re
 from datetime import datetime
-from typing import TYPE_CHECKING, Literal, Self, override
+from typing import TYPE_CHECKING, ClassVar, Literal, Self, override
 from uuid import UUID
 
 from sqlalchemy import PrimaryKeyConstraint, Select, func, select
@@ -79,11 +79,31 @@ class AccountOrm(Base, GetOneByIdMixin):
     stripe_customer_id: Mapped[str | None] = mapped_column()
 
     bookings: Mapped[list["BookingOrm"]] = relationship(
-        secondary=ACCOUNT_BOOKINGS_JOIN_TABLE, lazy="selectin", back_populates="accounts"
+        secondary=ACCOUNT_BOOKINGS_JOIN_TABLE, lazy="raise_on_sql", back_populates="accounts"
     )
 
-    outing_preferences: Mapped["OutingPreferencesOrm | None"] = relationship(back_populates="account", lazy="selectin")
-    reserver_details: Mapped[list["ReserverDetailsOrm"]] = relationship(back_populates="account", lazy="selectin")
+    outing_preferences: Mapped["OutingPreferencesOrm | None"] = relationship(
+        back_populates="account", lazy="raise_on_sql"
+    )
+    reserver_details: Mapped[list["ReserverDetailsOrm"]] = relationship(back_populates="account", lazy="raise_on_sql")
+
+    load_profiles: ClassVar[dict[str, tuple[str, ...]]] = {
+        "bookings_peek": ("bookings.activities", "bookings.reservations"),
+        "bookings": (
+            "bookings.activities",
+            "bookings.reservations",
+            "bookings.outing.survey",
+            "bookings.reserver_details",
+            "bookings.stripe_payment_intent_reference",
+            "reserver_details",
+        ),
+        "outing_preferences": ("outing_preferences",),
+    }
+    """
+    - bookings_peek: enough of the bookings to list them
+    - bookings: enough of the bookings to show, confirm or update one, and the account's default reserver details
+    - outing_preferences: the account's outing preferences
+    """
 
     def __init__(
         self,
@@ -109,7 +129,7 @@ class AccountOrm(Base, GetOneByIdMixin):
         return query
 
     def get_booking(self, *, booking_id: UUID) -> "BookingOrm | None":
-        # This is more efficient than querying the database directly, because we're already eager-loading account.bookings
+        # The account has to be loaded with the "bookings" profile.
         return next((b for b in self.bookings if b.id == booking_id), None)
 
     @override
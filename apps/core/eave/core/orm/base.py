@@ -1,13 +1,28 @@
+import random
+import uuid
 from datetime import datetime
-from typing import Any, Self
+from typing import Any, ClassVar, Self
 
-from sqlalchemy import Select, event, func, select
+from sqlalchemy import Select, event, func, inspect, or_, select
 from sqlalchemy.dialects.postgresql import TIMESTAMP
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, UOWTransaction, mapped_column
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, UOWTransaction, mapped_column, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 
 from eave.core.shared.errors import ValidationError
 from eave.stdlib.logging import LOGGER
 
+_UUID_KEY_SPACE = 2**128
+
+# See `Base.sample()`. With about half of the slots filled, an attempt samples about half as many rows as slots it picks.
+_SAMPLE_MIN_SLOTS = 16
+_SAMPLE_SLOTS_PER_ROW = 4
+
+# The first attempt reads up to this many times as many keys as there are slots, to size the window.
+_SAMPLE_PROBE_SLOTS = 8
+
+_SAMPLE_MAX_ATTEMPTS = 10
+
 
 class InvalidRecordError(Exception):
     validation_errors: list[ValidationError]
@@ -24,10 +39,137 @@ class Base(DeclarativeBase):
         type_=TIMESTAMP(timezone=True), server_default=None, onupdate=func.current_timestamp()
     )
 
+    load_profiles: ClassVar[dict[str, tuple[str, ...]]] = {}
+    """
+    Named sets of relationships to load with a query, as dotted paths from this class (eg "bookings.activities").
+    Relationships are declared with `lazy="raise_on_sql"`, so a query has to name the profile for the relationships
+    that its caller reads. Otherwise, reading them raises instead of silently emitting more queries.
+    """
+
     @classmethod
     def select(cls) -> Select[tuple[Self]]:
         return select(cls)
 
+    @classmethod
+    def load_options(cls, profile: str) -> list[ExecutableOption]:
+        """
+        Loader options for one of the class's `load_profiles`, for `query.options(...)`.
+        Every relationship in the profile is loaded with `selectinload`, ie one query per relationship in the path.
+        """
+        options: list[ExecutableOption] = []
+
+        for path in cls.load_profiles[profile]:
+            entity: type[Base] = cls
+            loader = None
+
+            for key in path.split("."):
+                attribute = getattr(entity, key)
+                loader = selectinload(attribute) if loader is None else loader.selectinload(attribute)
+                entity = attribute.property.mapper.class_
+
+            assert loader is not None
+            options.append(loader)
+
+        return options
+
+    @classmethod
+    async def sample(cls, session: AsyncSession, query: Select[tuple[Self]], k: int) -> list[Self]:
+        """
+        Returns up to `k` random rows of the query's results, without sorting all of them by `random()`.
+        Only for tables whose primary key is a random UUID (ie `PG_UUID_EXPR`).
+
+        Taking the rows that follow a random key isn't a uniform sample: a row is chosen as often as the gap in front
+        of its key is wide, and the gaps don't change, so the same rows keep winning. Instead, each attempt reads the
+        keys in a random window of the key space (see `sample_query()`), which every row falls into with the same
+        probability, and numbers them into a fixed number of slots. A few random slots are chosen, and the rows in
+        them (if any) are sampled, so every row in a window is sampled with the same probability whether the window
+        is crowded or not. Windows with more rows than slots are skipped, which slightly favors rows in sparse
+        stretches of the key space, but far less than the gaps do.
+
+        The window starts as the whole key space, and is resized between attempts to hold about half as many rows
+        as there are slots, so the cost depends on `k` rather than on the number of matching rows. When every
+        matching row fits in the slots, they're sampled directly.
+        """
+        (key,) = inspect(cls).primary_key
+        slots = max(_SAMPLE_MIN_SLOTS, _SAMPLE_SLOTS_PER_ROW * k)
+        probe_limit = _SAMPLE_PROBE_SLOTS * slots
+        window = 1.0
+
+        # Insertion-ordered, with no values.
+        sampled_keys: dict[uuid.UUID, None] = {}
+
+        # The keys from the last attempt that found any, in case the attempts run out.
+        fallback_keys: list[uuid.UUID] = []
+
+        for _ in range(_SAMPLE_MAX_ATTEMPTS):
+            if len(sampled_keys) >= k:
+                break
+
+            keys = list(
+                await session.scalars(cls.sample_query(query, pivot=uuid.uuid4(), window=window, limit=probe_limit + 1))
+            )
+
+            if len(keys) > 0:
+                fallback_keys = keys
+
+            if window >= 1 and len(keys) <= probe_limit:
+                # These are all of the matching rows.
+                unsampled_keys = [row_key for row_key in keys if row_key not in sampled_keys]
+                sampled_keys.update(
+                    dict.fromkeys(random.sample(unsampled_keys, min(k - len(sampled_keys), len(unsampled_keys))))
+                )
+                break
+
+            if len(keys) > slots:
+                # Picking from more rows than there are slots would favor the rows in sparse windows.
+                window *= (slots / 2) / len(keys)
+                continue
+
+            # Twice as many slots as rows are still needed, because about half of the slots are empty.
+            for slot in random.sample(range(slots), min(slots, 2 * (k - len(sampled_keys)))):
+                if slot < len(keys):
+                    sampled_keys.setdefault(keys[slot])
+
+                if len(sampled_keys) >= k:
+                    break
+
+            if len(keys) < slots / 4:
+                window = min(1.0, window * 2)
+
+        if len(sampled_keys) < k:
+            # Rarely, the attempts run out. The rest of the sample is less uniform, but still random.
+            unsampled_keys = [row_key for row_key in fallback_keys if row_key not in sampled_keys]
+            random.shuffle(unsampled_keys)
+            sampled_keys.update(dict.fromkeys(unsampled_keys[0 : k - len(sampled_keys)]))
+
+        if len(sampled_keys) == 0:
+            return []
+
+        rows = list(await session.scalars(query.where(key.in_(list(sampled_keys)))))
+        random.shuffle(rows)
+        return rows
+
+    @classmethod
+    def sample_query(
+        cls, query: Select[tuple[Self]], *, pivot: uuid.UUID, window: float, limit: int
+    ) -> Select[tuple[uuid.UUID]]:
+        """
+        One of the queries that `sample()` runs: the keys of up to `limit` of the query's rows whose keys are in the
+        `window` fraction of the key space that starts at `pivot`, wrapping around to the lowest keys.
+        The keys aren't sorted, so that the database doesn't have to read them in key order.
+        """
+        (key,) = inspect(cls).primary_key
+        probe = query.with_only_columns(key).limit(limit)
+
+        if window >= 1:
+            return probe
+
+        end = pivot.int + int(window * _UUID_KEY_SPACE)
+        if end < _UUID_KEY_SPACE:
+            return probe.where(key >= pivot, key < uuid.UUID(int=end))
+        else:
+            return probe.where(or_(key >= pivot, key < uuid.UUID(int=end - _UUID_KEY_SPACE)))
+
     def validate(self) -> list[ValidationError]:
         return []
 
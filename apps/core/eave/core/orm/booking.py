@@ -1,5 +1,5 @@
 from datetime import UTC, datetime
-from typing import Self, override
+from typing import ClassVar, Self, override
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
@@ -50,30 +50,52 @@ class BookingOrm(Base, GetOneByIdMixin):
         ForeignKey(f"{StripePaymentIntentReferenceOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value),
         index=True,
     )
-    stripe_payment_intent_reference: Mapped[StripePaymentIntentReferenceOrm | None] = relationship(lazy="selectin")
+    stripe_payment_intent_reference: Mapped[StripePaymentIntentReferenceOrm | None] = relationship(lazy="raise_on_sql")
 
     # This is nullable because if the Reserver Details is deleted, we still want to keep this Booking, so we set this field to Null.
     reserver_details_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(f"{ReserverDetailsOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value), index=True
     )
-    reserver_details: Mapped[ReserverDetailsOrm | None] = relationship(lazy="selectin")
+    reserver_details: Mapped[ReserverDetailsOrm | None] = relationship(lazy="raise_on_sql")
 
     outing_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(f"{OutingOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value), index=True
     )
-    outing: Mapped[OutingOrm | None] = relationship(lazy="selectin")
+    outing: Mapped[OutingOrm | None] = relationship(lazy="raise_on_sql")
 
     accounts: Mapped[list[AccountOrm]] = relationship(
-        secondary=ACCOUNT_BOOKINGS_JOIN_TABLE, lazy="selectin", back_populates="bookings"
+        secondary=ACCOUNT_BOOKINGS_JOIN_TABLE, lazy="raise_on_sql", back_populates="bookings"
     )
 
     activities: Mapped[list["BookingActivityTemplateOrm"]] = relationship(
-        lazy="selectin", back_populates="booking", cascade=CASCADE_ALL_DELETE_ORPHAN
+        lazy="raise_on_sql", back_populates="booking", cascade=CASCADE_ALL_DELETE_ORPHAN
     )
     reservations: Mapped[list["BookingReservationTemplateOrm"]] = relationship(
-        lazy="selectin", back_populates="booking", cascade=CASCADE_ALL_DELETE_ORPHAN
+        lazy="raise_on_sql", back_populates="booking", cascade=CASCADE_ALL_DELETE_ORPHAN
     )
 
+    load_profiles: ClassVar[dict[str, tuple[str, ...]]] = {
+        "details": (
+            "activities",
+            "reservations",
+            "outing.survey",
+            "reserver_details",
+            "stripe_payment_intent_reference",
+        ),
+        "admin": (
+            "activities",
+            "reservations",
+            "outing.survey",
+            "reserver_details",
+            "stripe_payment_intent_reference",
+            "accounts",
+        ),
+    }
+    """
+    - details: everything needed to show, confirm or update the booking
+    - admin: the details, and the accounts that the booking belongs to
+    """
+
     def __init__(
         self,
         session: AsyncSession | None,
@@ -176,7 +198,7 @@ class BookingActivityTemplateOrm(Base, TimedEventMixin, CoordinatesMixin):
         ForeignKey(f"{BookingOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value), index=True
     )
     booking: Mapped[BookingOrm] = relationship(
-        lazy="selectin",
+        lazy="raise_on_sql",
         back_populates="activities",
     )
 
@@ -234,7 +256,7 @@ class BookingReservationTemplateOrm(Base, TimedEventMixin, CoordinatesMixin):
     booking_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{BookingOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value), index=True
     )
-    booking: Mapped[BookingOrm] = relationship(lazy="selectin", back_populates="reservations")
+    booking: Mapped[BookingOrm] = relationship(lazy="raise_on_sql", back_populates="reservations")
 
     def __init__(
         self,
@@ -1,10 +1,27 @@
-from datetime import UTC, datetime
-from typing import Self, override
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Self, TypedDict, override
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
 from geoalchemy2.functions import ST_DWithin
-from sqlalchemy import TIMESTAMP, PrimaryKeyConstraint, Select, or_, select
+from sqlalchemy import (
+    TIMESTAMP,
+    ColumnElement,
+    Index,
+    PrimaryKeyConstraint,
+    Select,
+    bindparam,
+    false,
+    func,
+    literal_column,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -18,20 +35,68 @@ from .base import Base
 from .util.constants import PG_UUID_EXPR
 
 
+class TicketClassSnapshot(TypedDict):
+    """
+    A compact copy of an Eventbrite ticket class, taken when the event is imported.
+    """
+
+    id: str
+    display_name: str | None
+    description: str | None
+    cost_cents: int | None
+    fee_cents: int | None
+    tax_cents: int | None
+    on_sale_status: str | None
+
+
+@dataclass(kw_only=True)
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+
+
+# The columns written by `EventbriteEventOrm.upsert_many()` when a row already exists. These match `EventbriteEventOrm.update()`.
+_UPSERT_UPDATED_COLUMNS = (
+    "title",
+    "google_place_id",
+    "directions_uri",
+    "start_time_utc",
+    "end_time_utc",
+    "timezone",
+    "min_cost_cents",
+    "max_cost_cents",
+    "coordinates",
+    "vivial_activity_category_id",
+    "vivial_activity_format_id",
+    "ticket_classes_snapshot",
+    "ticket_classes_snapshot_at",
+)
+
+
 class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixin):
     __tablename__ = "eventbrite_events"
-    __table_args__ = (PrimaryKeyConstraint("id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("id"),
+        # For the planner's search, which always filters on a start time window and usually on categories.
+        # The GiST index on `coordinates` is created by GeoAlchemy (idx_eventbrite_events_coordinates).
+        Index("ix_eventbrite_events_start_time_utc_category", "start_time_utc", "vivial_activity_category_id"),
+    )
 
     id: Mapped[UUID] = mapped_column(server_default=PG_UUID_EXPR)
     eventbrite_event_id: Mapped[str] = mapped_column(unique=True)
     eventbrite_organizer_id: Mapped[str] = mapped_column(index=True)
     google_place_id: Mapped[str | None] = mapped_column()
+    directions_uri: Mapped[str | None] = mapped_column()
+    """Google Maps link for the venue, computed at import time"""
     title: Mapped[str] = mapped_column()
     end_time_utc: Mapped[datetime | None] = mapped_column(type_=TIMESTAMP(timezone=True))
     min_cost_cents: Mapped[int | None] = mapped_column()
     max_cost_cents: Mapped[int | None] = mapped_column()
     vivial_activity_category_id: Mapped[UUID] = mapped_column()
     vivial_activity_format_id: Mapped[UUID] = mapped_column()
+    ticket_classes_snapshot: Mapped[list[TicketClassSnapshot] | None] = mapped_column(type_=JSONB(none_as_null=True))
+    """The ticket classes for sale, as of `ticket_classes_snapshot_at`"""
+    ticket_classes_snapshot_at: Mapped[datetime | None] = mapped_column(type_=TIMESTAMP(timezone=True))
 
     def __init__(
         self,
@@ -50,6 +115,8 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
         lon: float,
         vivial_activity_category_id: UUID,
         vivial_activity_format_id: UUID,
+        directions_uri: str | None = None,
+        ticket_classes_snapshot: list[TicketClassSnapshot] | None = None,
     ) -> None:
         self.eventbrite_event_id = eventbrite_event_id
         self.eventbrite_organizer_id = eventbrite_organizer_id
@@ -57,6 +124,7 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
         self.update(
             title=title,
             google_place_id=google_place_id,
+            directions_uri=directions_uri,
             start_time=start_time,
             end_time=end_time,
             timezone=timezone,
@@ -66,6 +134,7 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
             lon=lon,
             vivial_activity_category_id=vivial_activity_category_id,
             vivial_activity_format_id=vivial_activity_format_id,
+            ticket_classes_snapshot=ticket_classes_snapshot,
         )
 
         if session:
@@ -85,10 +154,16 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
         lon: float,
         vivial_activity_category_id: UUID,
         vivial_activity_format_id: UUID,
+        directions_uri: str | None = NOT_SET,
+        ticket_classes_snapshot: list[TicketClassSnapshot] | None = NOT_SET,
     ) -> Self:
         self.title = title
         self.google_place_id = google_place_id
 
+        if directions_uri is not NOT_SET:
+            # Not set means that the directions URI wasn't computed, so the existing one is kept.
+            self.directions_uri = directions_uri
+
         self.start_time_utc = start_time.astimezone(UTC)
 
         if end_time:
@@ -104,8 +179,122 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
         self.coordinates = GeoPoint(lat=lat, lon=lon).geoalchemy_shape()
         self.vivial_activity_category_id = vivial_activity_category_id
         self.vivial_activity_format_id = vivial_activity_format_id
+
+        if ticket_classes_snapshot is not NOT_SET:
+            # Not set means that the snapshot wasn't taken, so the existing one is kept.
+            self.ticket_classes_snapshot = ticket_classes_snapshot
+            self.ticket_classes_snapshot_at = datetime.now(UTC) if ticket_classes_snapshot is not None else None
+
         return self
 
+    def fresh_ticket_classes_snapshot(self, *, max_age_seconds: float) -> list[TicketClassSnapshot] | None:
+        """
+        Returns the ticket classes snapshot, or None if there isn't one or it's older than `max_age_seconds`.
+        """
+        if self.ticket_classes_snapshot is None or self.ticket_classes_snapshot_at is None:
+            return None
+
+        if (datetime.now(UTC) - self.ticket_classes_snapshot_at).total_seconds() > max_age_seconds:
+            return None
+
+        return self.ticket_classes_snapshot
+
+    @classmethod
+    async def upsert_many(cls, session: AsyncSession, events: Sequence[Self]) -> UpsertResult:
+        """
+        Inserts the given events, or updates the existing rows with the same eventbrite_event_id, in a single statement.
+        `events` are transient objects (ie constructed with `session=None`); they aren't added to the session.
+        If an event has no directions URI or ticket classes snapshot (eg because they couldn't be fetched), the existing ones are kept.
+        """
+        # A statement can't update the same row twice, so only the last of any duplicates is kept.
+        events_by_eventbrite_event_id = {event.eventbrite_event_id: event for event in events}
+        if len(events_by_eventbrite_event_id) == 0:
+            return UpsertResult()
+
+        values = [
+            {
+                "eventbrite_event_id": event.eventbrite_event_id,
+                "eventbrite_organizer_id": event.eventbrite_organizer_id,
+                **{column: getattr(event, column) for column in _UPSERT_UPDATED_COLUMNS},
+            }
+            for event in events_by_eventbrite_event_id.values()
+        ]
+
+        stmt = insert(cls).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.eventbrite_event_id],
+            set_={
+                **{column: stmt.excluded[column] for column in _UPSERT_UPDATED_COLUMNS},
+                "directions_uri": func.coalesce(stmt.excluded.directions_uri, cls.directions_uri),
+                "ticket_classes_snapshot": func.coalesce(
+                    stmt.excluded.ticket_classes_snapshot, cls.ticket_classes_snapshot
+                ),
+                "ticket_classes_snapshot_at": func.coalesce(
+                    stmt.excluded.ticket_classes_snapshot_at, cls.ticket_classes_snapshot_at
+                ),
+                "updated": func.current_timestamp(),
+            },
+        )
+        # xmax is 0 for rows that were inserted by this statement, and non-zero for rows that were updated.
+        stmt = stmt.returning(literal_column("xmax = 0"))
+
+        result = UpsertResult()
+        for (inserted,) in await session.execute(stmt):
+            if inserted:
+                result.inserted += 1
+            else:
+                result.updated += 1
+
+        return result
+
+    @classmethod
+    async def stale_ticket_classes_snapshot_event_ids(
+        cls, session: AsyncSession, *, eventbrite_event_ids: Sequence[str], max_age_seconds: float
+    ) -> list[str]:
+        """
+        Returns the IDs of the given events whose ticket classes snapshot is missing or older than `max_age_seconds`.
+        """
+        if len(eventbrite_event_ids) == 0:
+            return []
+
+        snapshot_before = datetime.now(UTC) - timedelta(seconds=max_age_seconds)
+        results = await session.scalars(
+            select(cls.eventbrite_event_id).where(
+                cls.eventbrite_event_id.in_(eventbrite_event_ids),
+                or_(cls.ticket_classes_snapshot_at.is_(None), cls.ticket_classes_snapshot_at < snapshot_before),
+            )
+        )
+        return list(results)
+
+    @classmethod
+    async def update_ticket_classes_snapshots(
+        cls, session: AsyncSession, ticket_classes_snapshots: Mapping[str, list[TicketClassSnapshot]]
+    ) -> None:
+        """
+        Replaces the ticket classes snapshots of the given events (by Eventbrite event ID), without touching the rest of the rows.
+        """
+        if len(ticket_classes_snapshots) == 0:
+            return
+
+        table = cls.__table__
+        stmt = (
+            update(table)
+            .where(table.c.eventbrite_event_id == bindparam("b_eventbrite_event_id"))
+            .values(
+                ticket_classes_snapshot=bindparam("b_ticket_classes_snapshot", type_=JSONB(none_as_null=True)),
+                ticket_classes_snapshot_at=func.current_timestamp(),
+                updated=func.current_timestamp(),
+            )
+        )
+
+        await session.execute(
+            stmt,
+            [
+                {"b_eventbrite_event_id": eventbrite_event_id, "b_ticket_classes_snapshot": ticket_classes_snapshot}
+                for eventbrite_event_id, ticket_classes_snapshot in ticket_classes_snapshots.items()
+            ],
+        )
+
     @override
     @classmethod
     def select(
@@ -118,35 +307,44 @@ class EventbriteEventOrm(Base, TimedEventMixin, CoordinatesMixin, GetOneByIdMixi
         within_areas: list[GeoArea] = NOT_SET,
         vivial_activity_category_ids: list[UUID] = NOT_SET,
     ) -> Select[tuple[Self]]:
-        lookup = select(cls)
+        conditions: list[ColumnElement[bool]] = []
 
         if eventbrite_event_id is not NOT_SET:
-            lookup = lookup.where(cls.eventbrite_event_id == eventbrite_event_id)
+            conditions.append(cls.eventbrite_event_id == eventbrite_event_id)
 
         if excluded_eventbrite_event_ids is not NOT_SET and len(excluded_eventbrite_event_ids) > 0:
-            lookup = lookup.where(cls.eventbrite_event_id.not_in(excluded_eventbrite_event_ids))
+            conditions.append(cls.eventbrite_event_id.not_in(excluded_eventbrite_event_ids))
 
         if vivial_activity_category_ids is not NOT_SET:
-            lookup = lookup.where(cls.vivial_activity_category_id.in_(vivial_activity_category_ids))
+            conditions.append(cls.vivial_activity_category_id.in_(vivial_activity_category_ids))
 
         if budget is not NOT_SET and budget.upper_limit_cents is not None:
             # None means no upper limit, in which case there's no need to add this condition
-            lookup = lookup.where(cls.min_cost_cents <= budget.upper_limit_cents)
+            conditions.append(cls.min_cost_cents <= budget.upper_limit_cents)
 
         if start_time is not NOT_SET:
             start_time = start_time.astimezone(UTC)
             # FIXME: This hardcoded minutes window should be passed in
             lower, upper = datetime_window(start_time, minutes=15)
-            lookup = lookup.where(cls.start_time_utc.between(lower, upper))
-
-        if within_areas is not NOT_SET:
-            lookup = lookup.where(
-                or_(
-                    *[
-                        ST_DWithin(cls.coordinates, area.center.geoalchemy_shape(), area.rad.meters)
-                        for area in within_areas
-                    ]
-                )
-            )
+            conditions.append(cls.start_time_utc.between(lower, upper))
+
+        if within_areas is NOT_SET:
+            return select(cls).where(*conditions)
 
-        return lookup
+        if len(within_areas) == 0:
+            return select(cls).where(false())
+
+        area_conditions = [
+            ST_DWithin(cls.coordinates, area.center.geoalchemy_shape(), area.rad.meters) for area in within_areas
+        ]
+
+        if len(area_conditions) == 1:
+            return select(cls).where(*conditions, area_conditions[0])
+
+        # An OR of the areas can't use the GiST index on `coordinates` for each area, so each area is its own branch
+        # (with all of the other conditions too). The areas can overlap, so the branches are matched by ID, which also
+        # removes the duplicates.
+        matching_ids = union_all(
+            *[select(cls.id).where(*conditions, area_condition) for area_condition in area_conditions]
+        )
+        return select(cls).where(cls.id.in_(matching_ids))
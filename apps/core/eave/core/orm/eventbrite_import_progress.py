@@ -0,0 +1,49 @@
+from typing import Self
+
+from sqlalchemy import PrimaryKeyConstraint, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class EventbriteImportProgressOrm(Base):
+    """
+    How far an Eventbrite importer job got with an organizer, so that a restarted job can resume where it stopped.
+    A job is one shard of the organizers (eg "2/4"), and its progress is cleared when a job starts after a completed run.
+    """
+
+    __tablename__ = "eventbrite_import_progress"
+    __table_args__ = (PrimaryKeyConstraint("job_key", "eventbrite_organizer_id"),)
+
+    job_key: Mapped[str] = mapped_column()
+    eventbrite_organizer_id: Mapped[str] = mapped_column()
+    pages_imported: Mapped[int] = mapped_column()
+    """The number of the organizer's pages whose events were written"""
+    completed: Mapped[bool] = mapped_column()
+    """True when all of the organizer's pages were imported"""
+
+    def __init__(self, session: AsyncSession | None, *, job_key: str, eventbrite_organizer_id: str) -> None:
+        self.job_key = job_key
+        self.eventbrite_organizer_id = eventbrite_organizer_id
+        self.pages_imported = 0
+        self.completed = False
+
+        if session:
+            session.add(self)
+
+    @classmethod
+    async def get_one_or_none(cls, session: AsyncSession, *, job_key: str, eventbrite_organizer_id: str) -> Self | None:
+        return await session.get(cls, (job_key, eventbrite_organizer_id))
+
+    @classmethod
+    async def get_all_for_job(cls, session: AsyncSession, *, job_key: str) -> dict[str, Self]:
+        """
+        Returns the job's progress, keyed by Eventbrite organizer ID.
+        """
+        results = await session.scalars(cls.select().where(cls.job_key == job_key))
+        return {progress.eventbrite_organizer_id: progress for progress in results}
+
+    @classmethod
+    async def delete_all_for_job(cls, session: AsyncSession, *, job_key: str) -> None:
+        await session.execute(delete(cls).where(cls.job_key == job_key))
@@ -1,19 +1,26 @@
 import math
-from datetime import date, datetime
-from typing import Self, override
+from datetime import date, datetime, timedelta
+from typing import ClassVar, Self, override
 from uuid import UUID
 
 from geoalchemy2.functions import ST_DWithin
 from sqlalchemy import (
     DATE,
+    DDL,
     Column,
     ForeignKey,
+    Index,
     Select,
     Table,
+    and_,
+    any_,
+    event,
     exists,
+    not_,
     or_,
+    select,
 )
-from sqlalchemy.dialects.postgresql import INT4MULTIRANGE, Range
+from sqlalchemy.dialects.postgresql import ARRAY, INT4MULTIRANGE, Range
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -46,13 +53,22 @@ class EvergreenActivityOrm(Base, CoordinatesMixin, GetOneByIdMixin):
     duration_minutes: Mapped[int] = mapped_column()
     address: Mapped[Address] = mapped_column(type_=AddressColumnType())
     google_place_id: Mapped[str | None] = mapped_column()
+    directions_uri: Mapped[str | None] = mapped_column()
+    """Google Maps link for the venue, filled in by the directions URI refresher (`directions_uri_refresher.py`)"""
     is_bookable: Mapped[bool] = mapped_column()
     booking_url: Mapped[str | None] = mapped_column()
-    images: Mapped[list[ImageOrm]] = relationship(secondary=_activity_images_join_table, lazy="selectin")
+    images: Mapped[list[ImageOrm]] = relationship(secondary=_activity_images_join_table, lazy="raise_on_sql")
     ticket_types: Mapped[list["EvergreenActivityTicketTypeOrm"]] = relationship(
-        lazy="selectin", back_populates="evergreen_activity", cascade=CASCADE_ALL_DELETE_ORPHAN
+        lazy="raise_on_sql", back_populates="evergreen_activity", cascade=CASCADE_ALL_DELETE_ORPHAN
     )
 
+    load_profiles: ClassVar[dict[str, tuple[str, ...]]] = {
+        "details": ("images", "ticket_types"),
+    }
+    """
+    - details: everything needed to build the GraphQL Activity
+    """
+
     def __init__(
         self,
         session: AsyncSession | None,
@@ -66,6 +82,7 @@ class EvergreenActivityOrm(Base, CoordinatesMixin, GetOneByIdMixin):
         google_place_id: str | None,
         is_bookable: bool,
         booking_url: str | None,
+        directions_uri: str | None = None,
     ) -> None:
         self.title = title
         self.description = description
@@ -76,6 +93,7 @@ class EvergreenActivityOrm(Base, CoordinatesMixin, GetOneByIdMixin):
         self.google_place_id = google_place_id
         self.is_bookable = is_bookable
         self.booking_url = booking_url
+        self.directions_uri = directions_uri
 
         if session:
             session.add(self)
@@ -108,9 +126,22 @@ class EvergreenActivityOrm(Base, CoordinatesMixin, GetOneByIdMixin):
 
         if open_at_local is not NOT_SET:
             min_of_week = (((open_at_local.weekday() * 24) + open_at_local.hour) * 60) + open_at_local.minute
+            week_of = (open_at_local - timedelta(days=open_at_local.weekday())).date()
 
-            query = query.join(WeeklyScheduleOrm, WeeklyScheduleOrm.evergreen_activity_id == cls.id).where(
-                WeeklyScheduleOrm.minute_spans_local.op("@>")(min_of_week)
+            query = query.where(
+                exists(
+                    select(EvergreenActivityAvailabilityOrm.id).where(
+                        EvergreenActivityAvailabilityOrm.evergreen_activity_id == cls.id,
+                        EvergreenActivityAvailabilityOrm.minute_spans_local.op("@>")(min_of_week),
+                        or_(
+                            EvergreenActivityAvailabilityOrm.week_of == week_of,
+                            and_(
+                                EvergreenActivityAvailabilityOrm.week_of.is_(None),
+                                not_(week_of == any_(EvergreenActivityAvailabilityOrm.overridden_weeks)),
+                            ),
+                        ),
+                    )
+                )
             )
 
         if budget is not NOT_SET and budget.upper_limit_cents is not None:
@@ -141,7 +172,7 @@ class EvergreenActivityTicketTypeOrm(Base, GetOneByIdMixin):
     evergreen_activity_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{EvergreenActivityOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
     )
-    evergreen_activity: Mapped[EvergreenActivityOrm] = relationship(lazy="selectin", back_populates="ticket_types")
+    evergreen_activity: Mapped[EvergreenActivityOrm] = relationship(lazy="raise_on_sql", back_populates="ticket_types")
 
     def __init__(
         self,
@@ -207,7 +238,7 @@ class WeeklyScheduleOrm(Base, GetOneByIdMixin):
     evergreen_activity_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{EvergreenActivityOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
     )
-    evergreen_activity: Mapped[EvergreenActivityOrm] = relationship(lazy="selectin")
+    evergreen_activity: Mapped[EvergreenActivityOrm] = relationship(lazy="raise_on_sql")
 
     def __init__(
         self,
@@ -223,3 +254,91 @@ class WeeklyScheduleOrm(Base, GetOneByIdMixin):
 
         if session:
             session.add(self)
+
+
+class EvergreenActivityAvailabilityOrm(Base):
+    """
+    The effective weekly schedules of each evergreen activity, with the `week_of` overrides resolved.
+    An activity has at most one row per `week_of`, whose spans are the union of its schedules for that week.
+    A default row (`week_of` null) applies to every week except `overridden_weeks`.
+
+    The rows are maintained by a trigger on `weekly_schedules` (see below), so they're refreshed whenever an
+    activity's schedules change, however they're changed. They shouldn't be written directly.
+    """
+
+    __tablename__ = "evergreen_activity_availability"
+    __table_args__ = (
+        Index("ix_evergreen_activity_availability_evergreen_activity_id", "evergreen_activity_id"),
+        # For "open at" searches: minute_spans_local @> minute of the week
+        Index(
+            "ix_evergreen_activity_availability_minute_spans_local",
+            "minute_spans_local",
+            postgresql_using="gist",
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(server_default=PG_UUID_EXPR, primary_key=True)
+    evergreen_activity_id: Mapped[UUID] = mapped_column(
+        ForeignKey(f"{EvergreenActivityOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
+    )
+    week_of: Mapped[date | None] = mapped_column(type_=DATE)
+    """The Monday of the week that this row applies to, or null for the default schedule"""
+    minute_spans_local: Mapped[list[Range[int]]] = mapped_column(type_=INT4MULTIRANGE)
+    overridden_weeks: Mapped[list[date]] = mapped_column(type_=ARRAY(DATE))
+    """For the default row, the weeks that have their own schedules. Empty for the other rows."""
+
+
+# Recomputes an activity's availability rows from its weekly schedules.
+# A week whose override has no spans (eg closed for a holiday) gets no row, but is still in the default row's overridden_weeks.
+REFRESH_EVERGREEN_ACTIVITY_AVAILABILITY_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION refresh_evergreen_activity_availability(p_evergreen_activity_id uuid) RETURNS void AS $$
+BEGIN
+    DELETE FROM evergreen_activity_availability WHERE evergreen_activity_id = p_evergreen_activity_id;
+
+    INSERT INTO evergreen_activity_availability (evergreen_activity_id, week_of, minute_spans_local, overridden_weeks)
+    SELECT
+        p_evergreen_activity_id,
+        ws.week_of,
+        range_agg(span),
+        CASE WHEN ws.week_of IS NULL THEN ARRAY(
+            SELECT DISTINCT o.week_of
+            FROM weekly_schedules o
+            WHERE o.evergreen_activity_id = p_evergreen_activity_id AND o.week_of IS NOT NULL
+        ) ELSE '{}'::date[] END
+    FROM weekly_schedules ws, unnest(ws.minute_spans_local) AS span
+    WHERE ws.evergreen_activity_id = p_evergreen_activity_id
+    GROUP BY ws.week_of;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION weekly_schedules_refresh_availability() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_evergreen_activity_availability(OLD.evergreen_activity_id);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_evergreen_activity_availability(NEW.evergreen_activity_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_TRIGGER_DDL = """
+CREATE TRIGGER weekly_schedules_refresh_availability
+AFTER INSERT OR UPDATE OR DELETE ON weekly_schedules
+FOR EACH ROW EXECUTE FUNCTION weekly_schedules_refresh_availability()
+"""
+
+# The migration that added the availability table has its own copy of this DDL. This is for databases created from the models (eg for tests).
+# Changes to the functions or trigger need a new migration too.
+for _ddl in (
+    REFRESH_EVERGREEN_ACTIVITY_AVAILABILITY_FUNCTION_DDL,
+    WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_FUNCTION_DDL,
+    WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_TRIGGER_DDL,
+):
+    event.listen(WeeklyScheduleOrm.__table__, "after_create", DDL(_ddl))
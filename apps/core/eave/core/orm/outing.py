@@ -1,4 +1,5 @@
 from datetime import UTC, datetime
+from typing import ClassVar
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
@@ -26,20 +27,27 @@ class OutingOrm(Base, GetOneByIdMixin):
     survey_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(f"{SurveyOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value)
     )
-    survey: Mapped[SurveyOrm | None] = relationship(lazy="selectin")
+    survey: Mapped[SurveyOrm | None] = relationship(lazy="raise_on_sql")
 
     account_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(f"{AccountOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value)
     )
-    account: Mapped[AccountOrm | None] = relationship(lazy="selectin")
+    account: Mapped[AccountOrm | None] = relationship(lazy="raise_on_sql")
 
     activities: Mapped[list["OutingActivityOrm"]] = relationship(
-        lazy="selectin", back_populates="outing", cascade=CASCADE_ALL_DELETE_ORPHAN
+        lazy="raise_on_sql", back_populates="outing", cascade=CASCADE_ALL_DELETE_ORPHAN
     )
     reservations: Mapped[list["OutingReservationOrm"]] = relationship(
-        lazy="selectin", back_populates="outing", cascade=CASCADE_ALL_DELETE_ORPHAN
+        lazy="raise_on_sql", back_populates="outing", cascade=CASCADE_ALL_DELETE_ORPHAN
     )
 
+    load_profiles: ClassVar[dict[str, tuple[str, ...]]] = {
+        "details": ("activities", "reservations", "survey"),
+    }
+    """
+    - details: everything needed to show or book the outing
+    """
+
     def __init__(
         self,
         session: AsyncSession | None,
@@ -107,7 +115,7 @@ class OutingActivityOrm(Base, TimedEventMixin, GetOneByIdMixin):
     outing_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{OutingOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
     )
-    outing: Mapped[OutingOrm] = relationship(lazy="selectin", back_populates="activities")
+    outing: Mapped[OutingOrm] = relationship(lazy="raise_on_sql", back_populates="activities")
 
     source_id: Mapped[str] = mapped_column()
     """ID of activity in remote table"""
@@ -146,7 +154,7 @@ class OutingReservationOrm(Base, TimedEventMixin, GetOneByIdMixin):
     outing_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{OutingOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
     )
-    outing: Mapped[OutingOrm] = relationship(lazy="selectin", back_populates="reservations")
+    outing: Mapped[OutingOrm] = relationship(lazy="raise_on_sql", back_populates="reservations")
 
     source_id: Mapped[str] = mapped_column()
     """ID of reservation in remote table"""
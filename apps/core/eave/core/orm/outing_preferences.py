@@ -22,7 +22,7 @@ class OutingPreferencesOrm(Base):
         ForeignKey(f"{AccountOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value),
         unique=True,  # Unique constraint is needed to enforce a one-to-one mapping with Account
     )
-    account: Mapped[AccountOrm] = relationship(back_populates="outing_preferences", lazy="selectin")
+    account: Mapped[AccountOrm] = relationship(back_populates="outing_preferences", lazy="raise_on_sql")
 
     activity_category_ids: Mapped[list[UUID] | None] = mapped_column(
         type_=sqlalchemy.dialects.postgresql.ARRAY(
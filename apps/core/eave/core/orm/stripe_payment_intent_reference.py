@@ -21,7 +21,7 @@ class StripePaymentIntentReferenceOrm(Base):
     account_id: Mapped[UUID] = mapped_column(
         ForeignKey(f"{AccountOrm.__tablename__}.id", ondelete=OnDeleteOption.CASCADE.value)
     )
-    account: Mapped[AccountOrm] = relationship(lazy="selectin")
+    account: Mapped[AccountOrm] = relationship(lazy="raise_on_sql")
 
     def __init__(
         self,
@@ -36,7 +36,7 @@ class SurveyOrm(Base, TimedEventMixin, GetOneByIdMixin):
     account_id: Mapped[UUID | None] = mapped_column(
         ForeignKey(f"{AccountOrm.__tablename__}.id", ondelete=OnDeleteOption.SET_NULL.value)
     )
-    account: Mapped[AccountOrm | None] = relationship(lazy="selectin")
+    account: Mapped[AccountOrm | None] = relationship(lazy="raise_on_sql")
 
     def __init__(
         self,
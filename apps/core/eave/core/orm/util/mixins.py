@@ -7,11 +7,13 @@ import geoalchemy2
 from geoalchemy2 import WKBElement
 from geoalchemy2.types import Geography
 from shapely.geometry import Point
+from sqlalchemy import inspect, select
 from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from eave.core.lib.geo import SpatialReferenceSystemId
+from eave.core.orm.base import Base
 from eave.core.orm.util.user_defined_column_types import ZoneInfoColumnType
 from eave.core.shared.geo import GeoPoint
 
@@ -39,5 +41,15 @@ class CoordinatesMixin:
 
 class GetOneByIdMixin:
     @classmethod
-    async def get_one(cls, session: AsyncSession, uid: UUID) -> Self:
-        return await session.get_one(cls, uid)
+    async def get_one(cls, session: AsyncSession, uid: UUID, *, profile: str | None = None) -> Self:
+        """
+        `profile` is one of the class's `load_profiles`, for the relationships that the caller reads.
+        With a profile, the row is always selected, because an instance that's already in the session would otherwise
+        be returned without loading the profile's relationships.
+        """
+        if profile is None:
+            return await session.get_one(cls, uid)
+
+        assert issubclass(cls, Base)
+        (key,) = inspect(cls).primary_key
+        return (await session.scalars(select(cls).where(key == uid).options(*cls.load_options(profile)))).one()
@@ -0,0 +1,33 @@
+"""eventbrite events search indexes
+
+Revision ID: a61d4f08c3b2
+Revises: 3e9c7a51f2d8
+Create Date: 2026-10-18 19:15:42.873301
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a61d4f08c3b2"
+down_revision = "3e9c7a51f2d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_eventbrite_events_start_time_utc_category",
+        "eventbrite_events",
+        ["start_time_utc", "vivial_activity_category_id"],
+        unique=False,
+    )
+    # GeoAlchemy creates this index along with the table, but the table predates the migrations,
+    # so it may not exist in every environment.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_eventbrite_events_coordinates ON eventbrite_events USING gist (coordinates)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_eventbrite_events_start_time_utc_category", table_name="eventbrite_events")
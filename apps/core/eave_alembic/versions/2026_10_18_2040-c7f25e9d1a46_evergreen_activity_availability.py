@@ -0,0 +1,128 @@
+"""evergreen activity availability
+
+Revision ID: c7f25e9d1a46
+Revises: a61d4f08c3b2
+Create Date: 2026-10-18 20:40:17.530882
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c7f25e9d1a46"
+down_revision = "a61d4f08c3b2"
+branch_labels = None
+depends_on = None
+
+# These are copies of the DDL in eave.core.orm.evergreen_activity as of this revision,
+# so that this migration doesn't change when the models do.
+
+# Recomputes an activity's availability rows from its weekly schedules.
+# A week whose override has no spans (eg closed for a holiday) gets no row, but is still in the default row's overridden_weeks.
+_REFRESH_EVERGREEN_ACTIVITY_AVAILABILITY_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION refresh_evergreen_activity_availability(p_evergreen_activity_id uuid) RETURNS void AS $$
+BEGIN
+    DELETE FROM evergreen_activity_availability WHERE evergreen_activity_id = p_evergreen_activity_id;
+
+    INSERT INTO evergreen_activity_availability (evergreen_activity_id, week_of, minute_spans_local, overridden_weeks)
+    SELECT
+        p_evergreen_activity_id,
+        ws.week_of,
+        range_agg(span),
+        CASE WHEN ws.week_of IS NULL THEN ARRAY(
+            SELECT DISTINCT o.week_of
+            FROM weekly_schedules o
+            WHERE o.evergreen_activity_id = p_evergreen_activity_id AND o.week_of IS NOT NULL
+        ) ELSE '{}'::date[] END
+    FROM weekly_schedules ws, unnest(ws.minute_spans_local) AS span
+    WHERE ws.evergreen_activity_id = p_evergreen_activity_id
+    GROUP BY ws.week_of;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION weekly_schedules_refresh_availability() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_evergreen_activity_availability(OLD.evergreen_activity_id);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_evergreen_activity_availability(NEW.evergreen_activity_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+_WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_TRIGGER_DDL = """
+CREATE TRIGGER weekly_schedules_refresh_availability
+AFTER INSERT OR UPDATE OR DELETE ON weekly_schedules
+FOR EACH ROW EXECUTE FUNCTION weekly_schedules_refresh_availability()
+"""
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "evergreen_activity_availability",
+        sa.Column("id", sa.Uuid(), server_default=sa.text("(gen_random_uuid())"), nullable=False),
+        sa.Column("evergreen_activity_id", sa.Uuid(), nullable=False),
+        sa.Column("week_of", sa.DATE(), nullable=True),
+        sa.Column("minute_spans_local", postgresql.INT4MULTIRANGE(), nullable=False),
+        sa.Column("overridden_weeks", postgresql.ARRAY(sa.DATE()), nullable=False),
+        sa.Column(
+            "created", postgresql.TIMESTAMP(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.Column("updated", postgresql.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["evergreen_activity_id"], ["evergreen_activities.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_evergreen_activity_availability_evergreen_activity_id",
+        "evergreen_activity_availability",
+        ["evergreen_activity_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_evergreen_activity_availability_minute_spans_local",
+        "evergreen_activity_availability",
+        ["minute_spans_local"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    # ### end Alembic commands ###
+
+    op.execute(sa.DDL(_REFRESH_EVERGREEN_ACTIVITY_AVAILABILITY_FUNCTION_DDL))
+    op.execute(sa.DDL(_WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_FUNCTION_DDL))
+    op.execute(sa.DDL(_WEEKLY_SCHEDULES_REFRESH_AVAILABILITY_TRIGGER_DDL))
+
+    # Backfill the existing activities.
+    op.execute(
+        sa.text(
+            "SELECT refresh_evergreen_activity_availability(evergreen_activity_id)"
+            " FROM (SELECT DISTINCT evergreen_activity_id FROM weekly_schedules) AS activities"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS weekly_schedules_refresh_availability ON weekly_schedules"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS weekly_schedules_refresh_availability()"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS refresh_evergreen_activity_availability(uuid)"))
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(
+        "ix_evergreen_activity_availability_minute_spans_local",
+        table_name="evergreen_activity_availability",
+        postgresql_using="gist",
+    )
+    op.drop_index(
+        "ix_evergreen_activity_availability_evergreen_activity_id", table_name="evergreen_activity_availability"
+    )
+    op.drop_table("evergreen_activity_availability")
+    # ### end Alembic commands ###
@@ -1,7 +1,10 @@
 import os
-from typing import override
+import unittest.mock
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, override
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 import eave.core.app
@@ -10,6 +13,7 @@ import eave.core.orm
 import eave.stdlib.typing
 from eave.core._database_setup import get_base_metadata, reset_database
 from eave.core.config import CORE_API_APP_CONFIG
+from eave.stdlib.cache import EphemeralCache
 from eave.stdlib.testing_util import UtilityBaseTestCase
 
 from ._helpers.google_places_mocks_mixin import GooglePlacesMocksMixin
@@ -54,9 +58,34 @@ class BaseTestCase(
 
         await super().asyncSetUp()
 
+        # Cached upstream responses (eg Google Places) shouldn't leak between tests.
+        self.patch(
+            name="cache client",
+            patch=unittest.mock.patch("eave.stdlib.cache._process_cache_client", new=EphemeralCache()),
+        )
+
         engine = eave.core.database.async_engine.execution_options(isolation_level="READ COMMITTED")
         self.db_session = eave.core.database.async_sessionmaker(engine, expire_on_commit=False)
 
+    @contextmanager
+    def count_sql_statements(self) -> Iterator[list[str]]:
+        """
+        Collects the SQL statements that are executed in the block, so that tests can catch N+1 queries
+        or relationships that are loaded when they aren't needed.
+        """
+        statements: list[str] = []
+
+        def _before_cursor_execute(*args: Any) -> None:
+            # (conn, cursor, statement, parameters, context, executemany)
+            statements.append(args[2])
+
+        sync_engine = eave.core.database.async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _before_cursor_execute)
+
     @override
     async def cleanup(self) -> None:
         await super().cleanup()
@@ -0,0 +1,91 @@
+from eave.core.lib.address import format_address
+from eave.core.lib.event_helpers import get_internal_activity, internal_activity_from_orm
+from eave.core.lib.google_places import google_maps_search_url
+from eave.core.orm.activity_category import ActivityCategoryOrm
+from eave.core.orm.evergreen_activity import EvergreenActivityOrm, EvergreenActivityTicketTypeOrm
+
+from ..base import BaseTestCase
+
+
+class TestGetInternalActivity(BaseTestCase):
+    async def _make_evergreen_activity(self, *, directions_uri: str | None) -> EvergreenActivityOrm:
+        async with self.db_session.begin() as session:
+            activity = EvergreenActivityOrm(
+                session,
+                title=self.anystr(),
+                description=self.anystr(),
+                coordinates=self.anycoordinates(),
+                is_bookable=self.anybool(),
+                booking_url=self.anyurl(),
+                activity_category_id=ActivityCategoryOrm.all()[0].id,
+                duration_minutes=self.anyint(),
+                address=self.anyaddress("address"),
+                google_place_id=self.anystr(),
+                directions_uri=directions_uri,
+            )
+
+        return activity
+
+    async def test_uses_stored_directions_uri(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        activity_orm = await self._make_evergreen_activity(directions_uri=self.anyurl("directions_uri"))
+        activity = await get_internal_activity(event_id=str(activity_orm.id), survey=None)
+
+        assert activity
+        assert activity.venue.location.directions_uri == self.geturl("directions_uri")
+        assert self.get_mock("google maps geocode").call_count == 0
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 0
+
+    async def test_falls_back_to_search_url_without_maps_requests(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        activity_orm = await self._make_evergreen_activity(directions_uri=None)
+        activity = await get_internal_activity(event_id=str(activity_orm.id), survey=None)
+
+        assert activity
+        assert activity.venue.location.directions_uri == google_maps_search_url(
+            format_address(self.getaddress("address"), singleline=True)
+        )
+        assert self.get_mock("google maps geocode").call_count == 0
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 0
+
+
+class TestInternalActivityFromOrm(BaseTestCase):
+    async def test_builds_activity_from_loaded_orm(self) -> None:
+        async with self.db_session.begin() as session:
+            activity_orm = EvergreenActivityOrm(
+                session,
+                title=self.anystr("title"),
+                description=self.anystr(),
+                coordinates=self.anycoordinates(),
+                is_bookable=self.anybool(),
+                booking_url=self.anyurl(),
+                activity_category_id=ActivityCategoryOrm.all()[0].id,
+                duration_minutes=self.anyint(),
+                address=self.anyaddress(),
+                google_place_id=self.anystr(),
+                directions_uri=self.anyurl("directions_uri"),
+            )
+
+            EvergreenActivityTicketTypeOrm(
+                session,
+                evergreen_activity=activity_orm,
+                title=self.anystr("ticket type title"),
+                base_cost_cents=100,
+                service_fee_cents=10,
+                tax_percentage=0,
+            )
+
+        async with self.db_session.begin() as session:
+            activity_orm = await EvergreenActivityOrm.get_one(session, uid=activity_orm.id, profile="details")
+
+        # The session is closed, so this would fail if it needed to load anything.
+        activity = internal_activity_from_orm(activity_orm, survey=None)
+
+        assert activity.source_id == str(activity_orm.id)
+        assert activity.name == self.getstr("title")
+        assert activity.venue.location.directions_uri == self.geturl("directions_uri")
+        assert activity.ticket_info
+        assert activity.ticket_info.name == self.getstr("ticket type title")
+        assert activity.ticket_info.cost_breakdown.calculate_total_cost_cents() == 110
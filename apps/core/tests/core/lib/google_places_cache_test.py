@@ -0,0 +1,284 @@
+import asyncio
+import base64
+import time
+import unittest.mock
+
+from google.maps.places import Photo as PlacePhoto
+from google.maps.places import SearchNearbyRequest
+
+from eave.core.lib import google_places, google_places_cache
+from eave.core.lib.google_places import GoogleMapsUtility, GooglePlacesUtility
+from eave.core.shared.geo import Distance, GeoArea, GeoPoint
+from eave.stdlib import cache
+
+from ..base import BaseTestCase
+
+
+class TestGooglePlacesNearbySearchCache(BaseTestCase):
+    def _area(self) -> GeoArea:
+        return GeoArea(
+            center=GeoPoint(lat=self.anylatitude("lat"), lon=self.anylongitude("lon")),
+            rad=Distance(miles=self.anyint("miles", min=1, max=20)),
+        )
+
+    async def test_quantized_area_covers_area(self) -> None:
+        area = self._area()
+        quantized_area = google_places_cache.quantize_nearby_search_area(area)
+
+        offset_miles = area.center.haversine_distance(to_point=quantized_area.center)
+        assert quantized_area.rad.miles >= area.rad.miles + offset_miles
+
+    async def test_nearby_search_cache_key_ignores_type_order(self) -> None:
+        area = google_places_cache.quantize_nearby_search_area(self._area())
+
+        key1 = google_places_cache.nearby_search_cache_key(
+            area=area,
+            included_primary_types=["bar", "cafe"],
+            rank_preference=SearchNearbyRequest.RankPreference.POPULARITY,
+        )
+        key2 = google_places_cache.nearby_search_cache_key(
+            area=area,
+            included_primary_types=["cafe", "bar"],
+            rank_preference=SearchNearbyRequest.RankPreference.POPULARITY,
+        )
+
+        assert key1 == key2
+
+    async def test_get_places_nearby_cached(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+        self.mock_google_place.display_name.text = self.anystr("display name")
+
+        places = GooglePlacesUtility()
+        area = self._area()
+
+        places1 = await places.get_places_nearby(area=area, included_primary_types=["bar", "cafe"])
+        places2 = await places.get_places_nearby(area=area, included_primary_types=["cafe", "bar"])
+
+        assert self.get_mock("google places searchNearby").call_count == 1
+        assert [p.id for p in places1] == [p.id for p in places2] == [self.mock_google_place.id]
+        assert places2[0].display_name.text == self.getstr("display name")
+
+    async def test_get_places_nearby_filtered_to_area(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        area = GeoArea(center=GeoPoint(lat=self.anylatitude(), lon=self.anylongitude()), rad=Distance(miles=1))
+
+        # Outside of the requested area, but inside of the quantized area that's searched.
+        self.mock_google_place.location.latitude = area.center.lat + 0.02
+        self.mock_google_place.location.longitude = area.center.lon
+
+        nearby_places = await GooglePlacesUtility().get_places_nearby(area=area, included_primary_types=["bar"])
+        assert nearby_places == []
+
+        self.mock_google_place.location.latitude = area.center.lat
+        wider_area = GeoArea(center=area.center, rad=Distance(miles=3))
+
+        nearby_places = await GooglePlacesUtility().get_places_nearby(area=wider_area, included_primary_types=["bar"])
+        assert [p.id for p in nearby_places] == [self.mock_google_place.id]
+
+    async def test_get_places_nearby_cache_disabled(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "GOOGLE_PLACES_NEARBY_CACHE_TTL_SECONDS": "0"})
+
+        places = GooglePlacesUtility()
+        area = self._area()
+
+        await places.get_places_nearby(area=area, included_primary_types=["bar"])
+        await places.get_places_nearby(area=area, included_primary_types=["bar"])
+
+        assert self.get_mock("google places searchNearby").call_count == 2
+
+    async def test_get_places_nearby_stale_while_revalidate(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        places = GooglePlacesUtility()
+        area = self._area()
+
+        await places.get_places_nearby(area=area, included_primary_types=["bar"])
+        assert self.get_mock("google places searchNearby").call_count == 1
+
+        # Past the TTL, but within the stale window
+        with unittest.mock.patch("time.time", return_value=time.time() + 60 * 60 * 7):
+            stale_places = await places.get_places_nearby(area=area, included_primary_types=["bar"])
+
+        assert [p.id for p in stale_places] == [self.mock_google_place.id]
+
+        # The stale entry is refreshed in the background.
+        await asyncio.gather(*google_places_cache._nearby_search_refreshes.values())  # noqa: SLF001
+        assert self.get_mock("google places searchNearby").call_count == 2
+
+
+class TestGooglePlacesDetailsCache(BaseTestCase):
+    async def test_get_google_place_cached(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        places = GooglePlacesUtility()
+
+        place1 = await places.get_google_place(self.mock_google_place.id)
+        place2 = await places.get_google_place(self.mock_google_place.id)
+
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 1
+        assert place1 and place2
+        assert place1.id == place2.id == self.mock_google_place.id
+
+    async def test_get_google_place_corrupt_cache_entry(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        await cache.client_or_exception().set(
+            google_places_cache.place_details_cache_key(
+                place_id=self.mock_google_place.id,
+                field_mask=google_places._PLACE_FIELD_MASK,  # noqa: SLF001
+            ),
+            # Not a valid serialized Place
+            base64.b64encode(b"\xff" * 8).decode(),
+        )
+
+        place = await GooglePlacesUtility().get_google_place(self.mock_google_place.id)
+
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 1
+        assert place and place.id == self.mock_google_place.id
+
+    async def test_get_google_place_filled_from_nearby_search(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        places = GooglePlacesUtility()
+        area = GeoArea(
+            center=GeoPoint(lat=self.anylatitude(), lon=self.anylongitude()),
+            rad=Distance(miles=5),
+        )
+
+        await places.get_places_nearby(area=area, included_primary_types=["bar"])
+        place = await places.get_google_place(self.mock_google_place.id)
+
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 0
+        assert place and place.id == self.mock_google_place.id
+
+    async def test_get_google_place_coalesces_concurrent_requests(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "GOOGLE_PLACES_DETAILS_CACHE_TTL_SECONDS": "0"})
+
+        places = GooglePlacesUtility()
+
+        results = await asyncio.gather(*[places.get_google_place(self.mock_google_place.id) for _ in range(3)])
+
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 1
+        assert all(place and place.id == self.mock_google_place.id for place in results)
+
+    async def test_invalidate_google_place(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        places = GooglePlacesUtility()
+
+        await places.get_google_place(self.mock_google_place.id)
+        await places.invalidate_google_place(self.mock_google_place.id)
+        await places.get_google_place(self.mock_google_place.id)
+
+        assert self.get_mock("PlacesAsyncClient.get_place").call_count == 2
+
+
+class TestGooglePlacesPhotoMediaCache(BaseTestCase):
+    async def test_photos_from_google_place_cached(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+        self.mock_google_place.photos = [PlacePhoto(name=self.anystr(f"photo {i}")) for i in range(5)]
+
+        places = GooglePlacesUtility()
+
+        photos1 = await places.photos_from_google_place(self.mock_google_place)
+        photos2 = await places.photos_from_google_place(self.mock_google_place)
+
+        # The cover photo and 2 supplemental photos, fetched once each
+        assert self.get_mock("PlacesAsyncClient.get_photo_media").call_count == 3
+        assert photos1.cover_photo and photos2.cover_photo
+        assert photos1.cover_photo.src == photos2.cover_photo.src == self.mock_google_places_photo_media.photo_uri
+        assert len(photos1.supplemental_photos) == len(photos2.supplemental_photos) == 2
+
+    async def test_photos_from_google_place_cache_disabled(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "GOOGLE_PLACES_PHOTO_CACHE_TTL_SECONDS": "0"})
+        self.mock_google_place.photos = [PlacePhoto(name=self.anystr("photo"))]
+
+        places = GooglePlacesUtility()
+
+        await places.photos_from_google_place(self.mock_google_place)
+        await places.photos_from_google_place(self.mock_google_place)
+
+        assert self.get_mock("PlacesAsyncClient.get_photo_media").call_count == 2
+
+    async def test_photos_from_google_place_corrupt_cache_entry(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+        self.mock_google_place.photos = [PlacePhoto(name=self.anystr("photo"))]
+
+        await cache.client_or_exception().set(
+            google_places_cache.photo_media_cache_key(photo_name=self.getstr("photo"), max_width_px=1000),
+            # Valid JSON, but missing the photo media fields
+            "{}",
+        )
+
+        photos = await GooglePlacesUtility().photos_from_google_place(self.mock_google_place)
+
+        assert self.get_mock("PlacesAsyncClient.get_photo_media").call_count == 1
+        assert photos.cover_photo
+        assert photos.cover_photo.src == self.mock_google_places_photo_media.photo_uri
+
+
+class TestGoogleMapsGeocodeCache(BaseTestCase):
+    async def test_geocode_cached(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        maps = GoogleMapsUtility()
+        address = self.anystr("address")
+
+        results1 = await maps.geocode(address=address)
+        results2 = await maps.geocode(address=f"  {address.upper()} ")
+
+        assert self.get_mock("google maps geocode").call_count == 1
+        assert results1 == results2 == self.mock_maps_geocoding_response
+
+    async def test_geocode_corrupt_cache_entry(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        maps = GoogleMapsUtility()
+        address = self.anystr("address")
+
+        # Not valid JSON
+        await cache.client_or_exception().set(google_places_cache.geocode_cache_key(address), "[{")
+
+        results = await maps.geocode(address=address)
+
+        assert self.get_mock("google maps geocode").call_count == 1
+        assert results == self.mock_maps_geocoding_response
+
+    async def test_geocode_coalesces_concurrent_requests(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "GOOGLE_MAPS_GEOCODE_CACHE_TTL_SECONDS": "0"})
+
+        maps = GoogleMapsUtility()
+        address = self.anystr("address")
+
+        results = await asyncio.gather(*[maps.geocode(address=address) for _ in range(3)])
+
+        assert self.get_mock("google maps geocode").call_count == 1
+        assert all(r == self.mock_maps_geocoding_response for r in results)
+
+    async def test_geocode_many(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+
+        maps = GoogleMapsUtility()
+        addresses = [self.anystr("address 1"), self.anystr("address 2"), self.getstr("address 1")]
+
+        results = await maps.geocode_many(addresses)
+
+        assert self.get_mock("google maps geocode").call_count == 2
+        assert set(results.keys()) == {self.getstr("address 1"), self.getstr("address 2")}
+        assert all(r == self.mock_maps_geocoding_response for r in results.values())
+
+    async def test_venue_place_id_cached(self) -> None:
+        venue_key = self.anystr("venue key")
+
+        assert await google_places_cache.get_cached_venue_place_id(venue_key) is None
+
+        await google_places_cache.set_cached_venue_place_id(venue_key, self.anystr("place id"))
+        assert await google_places_cache.get_cached_venue_place_id(venue_key) == self.getstr("place id")
+
+    async def test_venue_place_id_cache_disabled(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_GEOCODE_CACHE_TTL_SECONDS": "0"})
+        venue_key = self.anystr("venue key")
+
+        await google_places_cache.set_cached_venue_place_id(venue_key, self.anystr("place id"))
+        assert await google_places_cache.get_cached_venue_place_id(venue_key) is None
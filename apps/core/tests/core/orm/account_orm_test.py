@@ -229,11 +229,14 @@ class TestAccountOrm(BaseTestCase):
             )
 
         async with self.db_session.begin() as session:
-            fetched_account = await AccountOrm.get_one(session, account.id)
+            fetched_account = await AccountOrm.get_one(session, account.id, profile="bookings_peek")
 
             assert len(fetched_account.bookings) == 1
             assert fetched_account.bookings[0].id == booking.id
 
+            # The account is already in the session, but the profile's relationships are loaded anyway.
+            fetched_account = await AccountOrm.get_one(session, account.id, profile="outing_preferences")
+
             assert fetched_account.outing_preferences is not None
             assert fetched_account.outing_preferences.id == outing_preferences.id
 
@@ -1,5 +1,7 @@
 from datetime import UTC
 
+from sqlalchemy.orm import selectinload
+
 from eave.core.lib.address import Address
 from eave.core.orm.booking import BookingActivityTemplateOrm, BookingOrm, BookingReservationTemplateOrm
 from eave.core.orm.stripe_payment_intent_reference import StripePaymentIntentReferenceOrm
@@ -86,7 +88,7 @@ class TestBookingOrms(BaseTestCase):
             booking_new.reservations.append(booking_reservation)
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, booking_new.id)
+            booking_fetched = await BookingOrm.get_one(session, booking_new.id, profile="admin")
 
             assert len(booking_fetched.accounts) == 1
             assert booking_fetched.accounts[0].id == account.id
@@ -205,7 +207,7 @@ class TestBookingOrms(BaseTestCase):
             booking.reservations.append(booking_reservation_template)
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, uid=booking.id)
+            booking_fetched = await BookingOrm.get_one(session, uid=booking.id, profile="details")
 
         assert booking_fetched.timezone == booking_activity_template1.timezone
         assert booking_fetched.start_time_utc == booking_activity_template2.start_time_utc
@@ -252,7 +254,7 @@ class TestBookingOrms(BaseTestCase):
             booking.reservations.append(booking_reservation_template)
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, uid=booking.id)
+            booking_fetched = await BookingOrm.get_one(session, uid=booking.id, profile="details")
 
         assert booking_fetched.timezone == booking_reservation_template.timezone
         assert booking_fetched.start_time_utc == booking_reservation_template.start_time_utc
@@ -270,7 +272,7 @@ class TestBookingOrms(BaseTestCase):
             booking.reservations[0].headcount = 2
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, uid=booking.id)
+            booking_fetched = await BookingOrm.get_one(session, uid=booking.id, profile="details")
 
         assert booking_fetched.headcount == 2
 
@@ -286,7 +288,7 @@ class TestBookingOrms(BaseTestCase):
             booking.reservations[0].headcount = 1
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, uid=booking.id)
+            booking_fetched = await BookingOrm.get_one(session, uid=booking.id, profile="details")
 
         assert booking_fetched.headcount == 2
 
@@ -310,7 +312,11 @@ class TestBookingOrms(BaseTestCase):
 
         async with self.db_session.begin() as session:
             for i in range(5):
-                bookings_fetched = (await session.scalars(BookingOrm.select(account_id=accounts[i].id))).all()
+                bookings_fetched = (
+                    await session.scalars(
+                        BookingOrm.select(account_id=accounts[i].id).options(*BookingOrm.load_options("admin"))
+                    )
+                ).all()
                 assert len(bookings_fetched) == 1
                 assert len(bookings_fetched[0].accounts) == 1
                 assert bookings_fetched[0].accounts[0].id == accounts[i].id
@@ -341,7 +347,11 @@ class TestBookingOrms(BaseTestCase):
         async with self.db_session.begin() as session:
             for i in range(5):
                 bookings_fetched = (
-                    await session.scalars(BookingOrm.select(account_id=accounts[i].id, uid=bookings[i].id))
+                    await session.scalars(
+                        BookingOrm.select(account_id=accounts[i].id, uid=bookings[i].id).options(
+                            *BookingOrm.load_options("admin")
+                        )
+                    )
                 ).all()
                 assert len(bookings_fetched) == 1
                 assert len(bookings_fetched[0].accounts) == 1
@@ -384,7 +394,11 @@ class TestBookingOrms(BaseTestCase):
             )
 
         async with self.db_session.begin() as session:
-            bookings_fetched = (await session.scalars(BookingOrm.select(account_id=account.id, uid=booking.id))).all()
+            bookings_fetched = (
+                await session.scalars(
+                    BookingOrm.select(account_id=account.id, uid=booking.id).options(*BookingOrm.load_options("admin"))
+                )
+            ).all()
             assert len(bookings_fetched) == 1
             assert bookings_fetched[0].id == booking.id
             assert len(bookings_fetched[0].accounts) == 1
@@ -407,7 +421,11 @@ class TestBookingOrms(BaseTestCase):
 
         async with self.db_session.begin() as session:
             bookings_fetched = (
-                await session.scalars(BookingOrm.select(account_id=accounts[0].id, uid=booking.id))
+                await session.scalars(
+                    BookingOrm.select(account_id=accounts[0].id, uid=booking.id).options(
+                        *BookingOrm.load_options("admin")
+                    )
+                )
             ).all()
             assert len(bookings_fetched) == 1
             assert bookings_fetched[0].id == booking.id
@@ -415,7 +433,11 @@ class TestBookingOrms(BaseTestCase):
             assert bookings_fetched[0].accounts[0].id == accounts[0].id
 
             bookings_fetched_by_other_account_id = (
-                await session.scalars(BookingOrm.select(account_id=accounts[1].id, uid=booking.id))
+                await session.scalars(
+                    BookingOrm.select(account_id=accounts[1].id, uid=booking.id).options(
+                        *BookingOrm.load_options("admin")
+                    )
+                )
             ).all()
             assert len(bookings_fetched_by_other_account_id) == 1
             assert bookings_fetched_by_other_account_id[0].id == booking.id
@@ -436,7 +458,11 @@ class TestBookingOrms(BaseTestCase):
 
         async with self.db_session.begin() as session:
             other_bookings_fetched = (
-                await session.scalars(BookingOrm.select(account_id=accounts[1].id, uid=other_booking.id))
+                await session.scalars(
+                    BookingOrm.select(account_id=accounts[1].id, uid=other_booking.id).options(
+                        *BookingOrm.load_options("admin")
+                    )
+                )
             ).all()
             assert len(other_bookings_fetched) == 1
             assert other_bookings_fetched[0].id == other_booking.id
@@ -484,7 +510,9 @@ class TestBookingOrms(BaseTestCase):
 
         async with self.db_session.begin() as session:
             booking_activity_template_fetched = await session.get_one(
-                BookingActivityTemplateOrm, booking_activity_template_new.id
+                BookingActivityTemplateOrm,
+                booking_activity_template_new.id,
+                options=[selectinload(BookingActivityTemplateOrm.booking)],
             )
 
             assert booking_activity_template_fetched.id == booking_activity_template_new.id
@@ -581,7 +609,9 @@ class TestBookingOrms(BaseTestCase):
 
         async with self.db_session.begin() as session:
             booking_reservation_template_fetched = await session.get_one(
-                BookingReservationTemplateOrm, booking_reservation_template_new.id
+                BookingReservationTemplateOrm,
+                booking_reservation_template_new.id,
+                options=[selectinload(BookingReservationTemplateOrm.booking)],
             )
 
             assert booking_reservation_template_fetched.id == booking_reservation_template_new.id
@@ -1,20 +1,41 @@
+import json
 import random
 from collections.abc import Sequence
-from datetime import datetime, timedelta
-from uuid import UUID
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
 
+from sqlalchemy import ClauseElement, Executable, Select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
 
 from eave.core.orm.activity_category import ActivityCategoryOrm
-from eave.core.orm.eventbrite_event import EventbriteEventOrm
+from eave.core.orm.eventbrite_event import EventbriteEventOrm, TicketClassSnapshot
 from eave.core.shared.enums import OutingBudget
 from eave.core.shared.geo import Distance, GeoArea, GeoPoint
 
 from ..base import BaseTestCase
 
 
+class _ExplainJson(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_ExplainJson, "postgresql")
+def _compile_explain_json(element: _ExplainJson, compiler: SQLCompiler, **kwargs: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def _plan_nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    return [plan, *[node for subplan in plan.get("Plans", []) for node in _plan_nodes(subplan)]]
+
+
 class TestEventbriteEventOrm(BaseTestCase):
-    def make_eventbrite_event_orm(self, session: AsyncSession) -> EventbriteEventOrm:
+    def make_eventbrite_event_orm(self, session: AsyncSession | None) -> EventbriteEventOrm:
         return EventbriteEventOrm(
             session,
             eventbrite_event_id=self.anystr("eventbrite_event_id"),
@@ -32,6 +53,27 @@ class TestEventbriteEventOrm(BaseTestCase):
             lon=self.anylongitude("lon"),
         )
 
+    def make_anonymous_eventbrite_event_orm(self, session: AsyncSession | None) -> EventbriteEventOrm:
+        """
+        Like `make_eventbrite_event_orm`, but without naming the test values, so it can be called more than once per test.
+        """
+        return EventbriteEventOrm(
+            session,
+            eventbrite_event_id=self.anystr(),
+            eventbrite_organizer_id=self.anystr(),
+            title=self.anystr(),
+            google_place_id=self.anystr(),
+            vivial_activity_category_id=self.anyuuid(),
+            vivial_activity_format_id=self.anyuuid(),
+            start_time=self.anydatetime(past=True),
+            end_time=self.anydatetime(future=True),
+            timezone=self.anytimezone(),
+            min_cost_cents=self.anyint(min=0, max=999),
+            max_cost_cents=self.anyint(min=1000, max=9999),
+            lat=self.anylatitude(),
+            lon=self.anylongitude(),
+        )
+
     async def test_eventbrite_event_new_event_record(self) -> None:
         async with self.db_session.begin() as session:
             obj = EventbriteEventOrm(
@@ -514,3 +556,207 @@ class TestEventbriteEventOrm(BaseTestCase):
                 await session.scalars(EventbriteEventOrm.select(vivial_activity_category_ids=[activity_category_id_2]))
             ).all()
             assert len(result) == 0
+
+    async def test_eventbrite_event_upsert_many(self) -> None:
+        async with self.db_session.begin() as session:
+            existing = self.make_eventbrite_event_orm(session)
+            existing.directions_uri = self.anyurl("directions_uri")
+
+        updated = self.make_anonymous_eventbrite_event_orm(None)
+        updated.eventbrite_event_id = existing.eventbrite_event_id
+        updated.title = self.anystr("new title")
+
+        inserted = self.make_anonymous_eventbrite_event_orm(None)
+        inserted.eventbrite_event_id = self.anystr("new eventbrite_event_id")
+
+        async with self.db_session.begin() as session:
+            result = await EventbriteEventOrm.upsert_many(session, [updated, inserted])
+
+        assert result.inserted == 1
+        assert result.updated == 1
+
+        async with self.db_session.begin() as session:
+            existing_after = (
+                await session.scalars(EventbriteEventOrm.select(eventbrite_event_id=existing.eventbrite_event_id))
+            ).one()
+            assert existing_after.id == existing.id
+            assert existing_after.title == self.getstr("new title")
+            # No directions URI was given, so the existing one is kept.
+            assert existing_after.directions_uri == self.geturl("directions_uri")
+
+            inserted_after = (
+                await session.scalars(
+                    EventbriteEventOrm.select(eventbrite_event_id=self.getstr("new eventbrite_event_id"))
+                )
+            ).one()
+            assert inserted_after.title == inserted.title
+
+    async def test_eventbrite_event_upsert_many_empty(self) -> None:
+        async with self.db_session.begin() as session:
+            result = await EventbriteEventOrm.upsert_many(session, [])
+
+        assert result.inserted == 0
+        assert result.updated == 0
+
+    async def test_eventbrite_event_fresh_ticket_classes_snapshot(self) -> None:
+        obj = self.make_eventbrite_event_orm(None)
+        assert obj.fresh_ticket_classes_snapshot(max_age_seconds=60) is None
+
+        snapshot = [
+            TicketClassSnapshot(
+                id=self.anydigits(),
+                display_name=self.anystr(),
+                description=None,
+                cost_cents=self.anyint(),
+                fee_cents=None,
+                tax_cents=None,
+                on_sale_status=None,
+            )
+        ]
+        obj.update(
+            title=obj.title,
+            google_place_id=obj.google_place_id,
+            start_time=obj.start_time_utc,
+            end_time=obj.end_time_utc,
+            timezone=obj.timezone,
+            min_cost_cents=self.anyint(),
+            max_cost_cents=self.anyint(),
+            lat=self.anylatitude(),
+            lon=self.anylongitude(),
+            vivial_activity_category_id=obj.vivial_activity_category_id,
+            vivial_activity_format_id=obj.vivial_activity_format_id,
+            ticket_classes_snapshot=snapshot,
+        )
+        assert obj.fresh_ticket_classes_snapshot(max_age_seconds=60) == snapshot
+
+        obj.ticket_classes_snapshot_at = datetime.now(UTC) - timedelta(seconds=120)
+        assert obj.fresh_ticket_classes_snapshot(max_age_seconds=60) is None
+
+    async def test_eventbrite_event_refresh_stale_ticket_classes_snapshots(self) -> None:
+        async with self.db_session.begin() as session:
+            stale_event = self.make_anonymous_eventbrite_event_orm(session)
+            fresh_event = self.make_anonymous_eventbrite_event_orm(session)
+            fresh_event.ticket_classes_snapshot = []
+            fresh_event.ticket_classes_snapshot_at = datetime.now(UTC)
+
+        async with self.db_session.begin() as session:
+            stale_event_ids = await EventbriteEventOrm.stale_ticket_classes_snapshot_event_ids(
+                session,
+                eventbrite_event_ids=[stale_event.eventbrite_event_id, fresh_event.eventbrite_event_id],
+                max_age_seconds=60,
+            )
+
+        assert stale_event_ids == [stale_event.eventbrite_event_id]
+
+        snapshot = [
+            TicketClassSnapshot(
+                id=self.anydigits(),
+                display_name=self.anystr(),
+                description=None,
+                cost_cents=self.anyint(),
+                fee_cents=None,
+                tax_cents=None,
+                on_sale_status=None,
+            )
+        ]
+
+        async with self.db_session.begin() as session:
+            await EventbriteEventOrm.update_ticket_classes_snapshots(
+                session, {stale_event.eventbrite_event_id: snapshot}
+            )
+
+        async with self.db_session.begin() as session:
+            stale_event_after = await EventbriteEventOrm.get_one(session, stale_event.id)
+            assert stale_event_after.fresh_ticket_classes_snapshot(max_age_seconds=60) == snapshot
+            assert stale_event_after.title == stale_event.title
+
+            stale_event_ids = await EventbriteEventOrm.stale_ticket_classes_snapshot_event_ids(
+                session,
+                eventbrite_event_ids=[stale_event.eventbrite_event_id, fresh_event.eventbrite_event_id],
+                max_age_seconds=60,
+            )
+
+        assert stale_event_ids == []
+
+    async def test_eventbrite_event_query_overlapping_areas(self) -> None:
+        async with self.db_session.begin() as session:
+            event = self.make_eventbrite_event_orm(session)
+
+        center = GeoPoint(lat=self.getlatitude("lat"), lon=self.getlongitude("lon"))
+        # The event is in both of these areas, but should only be returned once.
+        within_areas = [
+            GeoArea(center=center, rad=Distance(miles=0.1)),
+            GeoArea(center=center, rad=Distance(miles=1)),
+        ]
+
+        async with self.db_session.begin() as session:
+            results = (await session.scalars(EventbriteEventOrm.select(within_areas=within_areas))).all()
+            assert [r.id for r in results] == [event.id]
+
+            results = (await session.scalars(EventbriteEventOrm.select(within_areas=[]))).all()
+            assert len(results) == 0
+
+    async def test_eventbrite_event_sample(self) -> None:
+        async with self.db_session.begin() as session:
+            for _ in range(5):
+                self.make_anonymous_eventbrite_event_orm(session)
+
+        async with self.db_session.begin() as session:
+            sample = await EventbriteEventOrm.sample(session, EventbriteEventOrm.select(), k=3)
+            assert len(sample) == 3
+            assert len({e.id for e in sample}) == 3
+
+            sample = await EventbriteEventOrm.sample(session, EventbriteEventOrm.select(), k=10)
+            assert len(sample) == 5
+
+    async def test_eventbrite_event_planner_query_uses_indexes(self) -> None:
+        """
+        Fails if the planner's sampled query stops using the start time/category index or the coordinates index,
+        eg if it regresses to a sequential scan, or to a scan of the whole primary key index.
+        """
+        now = datetime.now(UTC).replace(second=0, microsecond=0)
+        category_ids = [self.anyuuid() for _ in range(20)]
+
+        for _ in range(5):
+            events = []
+            for _ in range(1000):
+                event = self.make_anonymous_eventbrite_event_orm(None)
+                event.start_time_utc = now + timedelta(minutes=random.randint(0, 90 * 24 * 60))
+                event.vivial_activity_category_id = random.choice(category_ids)
+                event.coordinates = GeoPoint(
+                    lat=random.uniform(33.5, 34.5), lon=random.uniform(-118.8, -117.8)
+                ).geoalchemy_shape()
+                events.append(event)
+
+            async with self.db_session.begin() as session:
+                await EventbriteEventOrm.upsert_many(session, events)
+
+        async with self.db_session.begin() as session:
+            await session.execute(text("ANALYZE eventbrite_events"))
+
+        query = EventbriteEventOrm.select(
+            start_time=now + timedelta(days=30),
+            budget=OutingBudget.MODERATE,
+            within_areas=[
+                GeoArea(center=GeoPoint(lat=34.05, lon=-118.25), rad=Distance(miles=3)),
+                GeoArea(center=GeoPoint(lat=34.0, lon=-118.2), rad=Distance(miles=3)),
+            ],
+            vivial_activity_category_ids=category_ids[0:3],
+        )
+
+        # The first of the queries that `sample()` runs, for 20 candidates.
+        sample_query = EventbriteEventOrm.sample_query(query, pivot=uuid4(), window=1.0, limit=641)
+
+        async with self.db_session.begin() as session:
+            (plan_json,) = (await session.execute(_ExplainJson(sample_query))).one()
+
+        plan = (json.loads(plan_json) if isinstance(plan_json, str) else plan_json)[0]["Plan"]
+        nodes = [node for node in _plan_nodes(plan) if node.get("Relation Name") == "eventbrite_events"]
+
+        assert all(node["Node Type"] != "Seq Scan" for node in nodes), json.dumps(plan, indent=2)
+        # Any of the indexes on the filtered columns will do, but not only the primary key index.
+        assert {node.get("Index Name") for node in nodes} & {
+            "ix_eventbrite_events_start_time_utc_category",
+            "ix_eventbrite_events_start_time_utc",
+            "idx_eventbrite_events_coordinates",
+        }, json.dumps(plan, indent=2)
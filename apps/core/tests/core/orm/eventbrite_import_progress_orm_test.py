@@ -0,0 +1,54 @@
+from eave.core.orm.eventbrite_import_progress import EventbriteImportProgressOrm
+
+from ..base import BaseTestCase
+
+
+class TestEventbriteImportProgressOrm(BaseTestCase):
+    async def test_progress_for_job(self) -> None:
+        async with self.db_session.begin() as session:
+            progress = EventbriteImportProgressOrm(
+                session, job_key=self.anystr("job_key"), eventbrite_organizer_id=self.anydigits("organizer_id")
+            )
+            progress.pages_imported = self.anyint("pages_imported")
+
+            # Another job's progress for the same organizer
+            EventbriteImportProgressOrm(
+                session, job_key=self.anystr("other_job_key"), eventbrite_organizer_id=self.getdigits("organizer_id")
+            )
+
+        async with self.db_session.begin() as session:
+            progress_by_organizer_id = await EventbriteImportProgressOrm.get_all_for_job(
+                session, job_key=self.getstr("job_key")
+            )
+
+        assert list(progress_by_organizer_id.keys()) == [self.getdigits("organizer_id")]
+        assert progress_by_organizer_id[self.getdigits("organizer_id")].pages_imported == self.getint("pages_imported")
+        assert progress_by_organizer_id[self.getdigits("organizer_id")].completed is False
+
+    async def test_delete_all_for_job(self) -> None:
+        async with self.db_session.begin() as session:
+            EventbriteImportProgressOrm(
+                session, job_key=self.anystr("job_key"), eventbrite_organizer_id=self.anydigits("organizer_id")
+            )
+            EventbriteImportProgressOrm(
+                session, job_key=self.anystr("other_job_key"), eventbrite_organizer_id=self.getdigits("organizer_id")
+            )
+
+        async with self.db_session.begin() as session:
+            await EventbriteImportProgressOrm.delete_all_for_job(session, job_key=self.getstr("job_key"))
+
+        async with self.db_session.begin() as session:
+            assert (
+                await EventbriteImportProgressOrm.get_one_or_none(
+                    session, job_key=self.getstr("job_key"), eventbrite_organizer_id=self.getdigits("organizer_id")
+                )
+                is None
+            )
+            assert (
+                await EventbriteImportProgressOrm.get_one_or_none(
+                    session,
+                    job_key=self.getstr("other_job_key"),
+                    eventbrite_organizer_id=self.getdigits("organizer_id"),
+                )
+                is not None
+            )
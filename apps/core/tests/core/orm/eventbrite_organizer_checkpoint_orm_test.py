@@ -0,0 +1,41 @@
+from eave.core.orm.eventbrite_organizer_checkpoint import EventbriteOrganizerCheckpointOrm
+
+from ..base import BaseTestCase
+
+
+class TestEventbriteOrganizerCheckpointOrm(BaseTestCase):
+    async def test_new_checkpoint(self) -> None:
+        async with self.db_session.begin() as session:
+            EventbriteOrganizerCheckpointOrm(
+                session,
+                eventbrite_organizer_id=self.anydigits("organizer_id"),
+                event_payload_hashes={self.anydigits("event_id"): self.anystr("payload_hash")},
+            )
+
+        async with self.db_session.begin() as session:
+            checkpoint = await EventbriteOrganizerCheckpointOrm.get_one_or_none(
+                session, eventbrite_organizer_id=self.getdigits("organizer_id")
+            )
+
+            assert checkpoint is not None
+            assert checkpoint.event_payload_hashes == {self.getdigits("event_id"): self.getstr("payload_hash")}
+            assert checkpoint.last_imported_at is not None
+
+    async def test_missing_checkpoint(self) -> None:
+        async with self.db_session.begin() as session:
+            checkpoint = await EventbriteOrganizerCheckpointOrm.get_one_or_none(
+                session, eventbrite_organizer_id=self.anydigits()
+            )
+
+        assert checkpoint is None
+
+    async def test_content_hash(self) -> None:
+        hashes = {self.anydigits("event_id"): self.anystr("payload_hash")}
+
+        checkpoint = EventbriteOrganizerCheckpointOrm(
+            None, eventbrite_organizer_id=self.anydigits(), event_payload_hashes=hashes
+        )
+        assert checkpoint.content_hash == EventbriteOrganizerCheckpointOrm.hash_event_payload_hashes(dict(hashes))
+
+        checkpoint.update(event_payload_hashes={self.getdigits("event_id"): self.anystr()})
+        assert checkpoint.content_hash != EventbriteOrganizerCheckpointOrm.hash_event_payload_hashes(hashes)
@@ -1,12 +1,19 @@
 import random
+import unittest.mock
 from datetime import datetime
+from uuid import UUID
 
 from sqlalchemy.dialects.postgresql import Range
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from eave.core.lib.address import Address
 from eave.core.orm.activity_category import ActivityCategoryOrm
-from eave.core.orm.evergreen_activity import EvergreenActivityOrm, EvergreenActivityTicketTypeOrm, WeeklyScheduleOrm
+from eave.core.orm.evergreen_activity import (
+    EvergreenActivityAvailabilityOrm,
+    EvergreenActivityOrm,
+    EvergreenActivityTicketTypeOrm,
+    WeeklyScheduleOrm,
+)
 from eave.core.orm.image import ImageOrm
 from eave.core.orm.search_region import SearchRegionOrm
 from eave.core.shared.enums import OutingBudget
@@ -771,6 +778,118 @@ class TestEvergreenActivityOrm(BaseTestCase):
 
         assert len(results) == 2
 
+    async def test_weekly_schedule_search_week_of_override(self) -> None:
+        async with self.db_session.begin() as session:
+            activity = self.make_evergreen_activity(session)
+            WeeklyScheduleOrm(
+                session,
+                evergreen_activity=activity,
+                week_of=None,
+                minute_spans_local=[
+                    Range(17 * 60, 22 * 60)  # monday 17:00-22:00
+                ],
+            )
+            WeeklyScheduleOrm(
+                session,
+                evergreen_activity=activity,
+                week_of=datetime(2024, 12, 23),
+                minute_spans_local=[
+                    Range(10 * 60, 12 * 60)  # monday 10:00-12:00, for the week of 2024-12-23 only
+                ],
+            )
+
+        async with self.db_session.begin() as session:
+            # monday 21:00, in the overridden week
+            testdate = datetime(2024, 12, 23, 21, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 0
+
+            # monday 11:00, in the overridden week
+            testdate = datetime(2024, 12, 23, 11, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 1
+
+            # monday 21:00, the following week
+            testdate = datetime(2024, 12, 30, 21, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 1
+
+    async def test_weekly_schedule_search_closed_week(self) -> None:
+        async with self.db_session.begin() as session:
+            activity = self.make_evergreen_activity(session)
+            WeeklyScheduleOrm(
+                session,
+                evergreen_activity=activity,
+                week_of=None,
+                minute_spans_local=[
+                    Range(17 * 60, 22 * 60)  # monday 17:00-22:00
+                ],
+            )
+            # Closed for the week of 2024-12-23
+            WeeklyScheduleOrm(
+                session, evergreen_activity=activity, week_of=datetime(2024, 12, 23), minute_spans_local=[]
+            )
+
+        async with self.db_session.begin() as session:
+            testdate = datetime(2024, 12, 23, 21, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 0
+
+    async def test_availability_refreshed_when_schedule_changes(self) -> None:
+        async with self.db_session.begin() as session:
+            activity = self.make_evergreen_activity(session)
+            schedule = WeeklyScheduleOrm(
+                session,
+                evergreen_activity=activity,
+                week_of=None,
+                minute_spans_local=[
+                    Range(17 * 60, 22 * 60),  # monday 17:00-22:00
+                ],
+            )
+            WeeklyScheduleOrm(
+                session,
+                evergreen_activity=activity,
+                week_of=None,
+                minute_spans_local=[
+                    Range(24 * 60 + 17 * 60, 24 * 60 + 22 * 60),  # tuesday 17:00-22:00
+                ],
+            )
+
+        async with self.db_session.begin() as session:
+            availability = (
+                await session.scalars(
+                    EvergreenActivityAvailabilityOrm.select().where(
+                        EvergreenActivityAvailabilityOrm.evergreen_activity_id == activity.id
+                    )
+                )
+            ).all()
+
+            # The default schedules are merged into one row.
+            assert len(availability) == 1
+            assert availability[0].week_of is None
+            assert len(availability[0].minute_spans_local) == 2
+
+        async with self.db_session.begin() as session:
+            schedule = await session.get_one(WeeklyScheduleOrm, schedule.id)
+            schedule.minute_spans_local = [Range(9 * 60, 12 * 60)]  # monday 09:00-12:00
+
+        async with self.db_session.begin() as session:
+            testdate = datetime(2024, 12, 23, 21, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 0
+
+            testdate = datetime(2024, 12, 23, 10, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 1
+
+        async with self.db_session.begin() as session:
+            await session.delete(await session.get_one(WeeklyScheduleOrm, schedule.id))
+
+        async with self.db_session.begin() as session:
+            testdate = datetime(2024, 12, 23, 10, 0, tzinfo=LOS_ANGELES_TIMEZONE)
+            results = (await session.scalars(EvergreenActivityOrm.select(open_at_local=testdate))).all()
+            assert len(results) == 0
+
     async def test_evergreen_activity_seach_by_category_ids_1(self) -> None:
         category_id = random.choice(ActivityCategoryOrm.all()).id
 
@@ -1044,7 +1163,7 @@ class TestEvergreenActivityOrm(BaseTestCase):
             activity_orm.images = images
 
         async with self.db_session.begin() as session:
-            activity_orm_fetched = await EvergreenActivityOrm.get_one(session, activity_orm.id)
+            activity_orm_fetched = await EvergreenActivityOrm.get_one(session, activity_orm.id, profile="details")
             assert len(activity_orm_fetched.images) == 2
 
             assert activity_orm_fetched.images[0].src == self.geturl("image src 1")
@@ -1116,3 +1235,46 @@ class TestEvergreenActivityOrm(BaseTestCase):
         )
 
         assert ticket.total_cost_cents == 2086
+
+    async def test_sample(self) -> None:
+        async with self.db_session.begin() as session:
+            activities = [self.make_evergreen_activity(session) for _ in range(5)]
+
+        activity_ids = {a.id for a in activities}
+
+        async with self.db_session.begin() as session:
+            sample = await EvergreenActivityOrm.sample(session, EvergreenActivityOrm.select(), k=3)
+            assert len(sample) == 3
+            assert len({a.id for a in sample}) == 3
+            assert {a.id for a in sample} <= activity_ids
+
+            sample = await EvergreenActivityOrm.sample(session, EvergreenActivityOrm.select(), k=10)
+            assert {a.id for a in sample} == activity_ids
+
+    async def test_sample_uniform_over_uneven_key_gaps(self) -> None:
+        # Pairs of keys close together, with wide gaps between the pairs.
+        # Taking the row that follows a random key would choose the first row of a pair 90% of the time.
+        async with self.db_session.begin() as session:
+            activities = [self.make_evergreen_activity(session) for _ in range(40)]
+
+            for i, activity in enumerate(activities):
+                activity.id = UUID(int=(2**128 // 20) * (i // 2) + (2**128 // 200) * (i % 2))
+
+        first_of_pair_ids = {activity.id for activity in activities[0::2]}
+
+        async def _count_first_of_pair(samples: int) -> int:
+            count = 0
+
+            async with self.db_session.begin() as session:
+                for _ in range(samples):
+                    (activity,) = await EvergreenActivityOrm.sample(session, EvergreenActivityOrm.select(), k=1)
+                    count += activity.id in first_of_pair_ids
+
+            return count
+
+        # Every row fits in the slots, so they're sampled directly.
+        assert 120 <= await _count_first_of_pair(400) <= 280
+
+        # With fewer slots, the rows are sampled from windows of the key space.
+        with unittest.mock.patch.multiple("eave.core.orm.base", _SAMPLE_MIN_SLOTS=4, _SAMPLE_PROBE_SLOTS=2):
+            assert 120 <= await _count_first_of_pair(400) <= 280
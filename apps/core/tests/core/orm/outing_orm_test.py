@@ -1,3 +1,5 @@
+from sqlalchemy.orm import selectinload
+
 from eave.core.orm.outing import OutingActivityOrm, OutingOrm, OutingReservationOrm
 from eave.core.shared.enums import ActivitySource, RestaurantSource
 from eave.stdlib.time import ONE_DAY_IN_SECONDS
@@ -41,7 +43,9 @@ class TestOutingOrms(BaseTestCase):
             outing.reservations.append(reservation)
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, outing.id)
+            outing_fetched = await session.get_one(
+                OutingOrm, outing.id, options=[*OutingOrm.load_options("details"), selectinload(OutingOrm.account)]
+            )
 
             assert outing_fetched.id == outing.id
 
@@ -83,7 +87,7 @@ class TestOutingOrms(BaseTestCase):
             outing.activities.append(outing_activity2)
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, outing.id)
+            outing_fetched = await OutingOrm.get_one(session, outing.id, profile="details")
 
         assert outing_fetched.timezone == outing.activities[0].timezone
         assert outing_fetched.start_time_utc == outing.reservations[0].start_time_utc
@@ -114,7 +118,7 @@ class TestOutingOrms(BaseTestCase):
             outing.reservations.append(outing_reservation)
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, outing.id)
+            outing_fetched = await OutingOrm.get_one(session, outing.id, profile="details")
 
         assert outing_fetched.timezone == outing_reservation.timezone
         assert outing_fetched.start_time_utc == outing_reservation.start_time_utc
@@ -145,7 +149,7 @@ class TestOutingOrms(BaseTestCase):
             outing.activities.append(outing_activity)
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, outing.id)
+            outing_fetched = await OutingOrm.get_one(session, outing.id, profile="details")
 
         assert outing_fetched.timezone == outing_activity.timezone
         assert outing_fetched.start_time_utc == outing_activity.start_time_utc
@@ -161,7 +165,7 @@ class TestOutingOrms(BaseTestCase):
             outing.reservations[0].headcount = 2
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, uid=outing.id)
+            outing_fetched = await OutingOrm.get_one(session, uid=outing.id, profile="details")
 
         assert outing_fetched.headcount == 2
 
@@ -175,7 +179,7 @@ class TestOutingOrms(BaseTestCase):
             outing.reservations[0].headcount = 1
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, uid=outing.id)
+            outing_fetched = await OutingOrm.get_one(session, uid=outing.id, profile="details")
 
         assert outing_fetched.headcount == 2
 
@@ -189,7 +193,7 @@ class TestOutingOrms(BaseTestCase):
             outing.reservations[0].headcount = 1
 
         async with self.db_session.begin() as session:
-            outing_fetched = await OutingOrm.get_one(session, uid=outing.id)
+            outing_fetched = await OutingOrm.get_one(session, uid=outing.id, profile="details")
 
         assert outing_fetched.headcount == 1
 
@@ -232,7 +236,9 @@ class TestOutingOrms(BaseTestCase):
             )
 
         async with self.db_session.begin() as session:
-            outing_activity_fetched = await OutingActivityOrm.get_one(session, outing_activity_new.id)
+            outing_activity_fetched = await session.get_one(
+                OutingActivityOrm, outing_activity_new.id, options=[selectinload(OutingActivityOrm.outing)]
+            )
 
             assert outing_activity_fetched.id == outing_activity_new.id
             assert outing_activity_fetched.outing.id == outing.id
@@ -268,7 +274,9 @@ class TestOutingOrms(BaseTestCase):
             )
 
         async with self.db_session.begin() as session:
-            outing_reservation_fetched = await OutingReservationOrm.get_one(session, outing_reservation_new.id)
+            outing_reservation_fetched = await session.get_one(
+                OutingReservationOrm, outing_reservation_new.id, options=[selectinload(OutingReservationOrm.outing)]
+            )
 
             assert outing_reservation_fetched.id == outing_reservation_new.id
             assert outing_reservation_fetched.outing.id == outing.id
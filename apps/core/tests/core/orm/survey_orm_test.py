@@ -1,3 +1,5 @@
+from sqlalchemy.orm import selectinload
+
 from eave.core.orm.base import InvalidRecordError
 from eave.core.orm.survey import SurveyOrm
 
@@ -11,7 +13,7 @@ class TestSurveyOrm(BaseTestCase):
             survey = self.make_survey(session, account)
 
         async with self.db_session.begin() as session:
-            survey_fetched = await SurveyOrm.get_one(session, survey.id)
+            survey_fetched = await session.get_one(SurveyOrm, survey.id, options=[selectinload(SurveyOrm.account)])
 
             assert survey_fetched.id == survey.id
             assert survey_fetched.account is not None
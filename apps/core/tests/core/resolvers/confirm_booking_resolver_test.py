@@ -51,7 +51,7 @@ class TestConfirmBookingResolver(BaseTestCase):
         assert data["booking"]["reserverDetails"]["id"] == str(reserver_details.id)
 
         async with self.db_session.begin() as session:
-            booking_fetched = await BookingOrm.get_one(session, booking.id)
+            booking_fetched = await BookingOrm.get_one(session, booking.id, profile="details")
             assert booking_fetched.state == BookingState.CONFIRMED
             assert booking_fetched.reserver_details is not None
             assert booking_fetched.reserver_details.id == reserver_details.id
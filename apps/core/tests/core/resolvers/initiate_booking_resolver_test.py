@@ -49,7 +49,7 @@ class TestInitiateBookingResolver(BaseTestCase):
 
         async with self.db_session.begin() as session:
             assert await self.count(session, BookingOrm) == 1
-            booking = await BookingOrm.get_one(session, UUID(data["booking"]["id"]))
+            booking = await BookingOrm.get_one(session, UUID(data["booking"]["id"]), profile="details")
 
         assert len(booking.reservations) == 1
         assert booking.reservations[0].source_id == outing.reservations[0].source_id
@@ -32,7 +32,7 @@ class TestOutingResolver(BaseTestCase):
         data = result.data["outing"]
 
         async with self.db_session.begin() as session:
-            fetched_outing = await OutingOrm.get_one(session, UUID(data["id"]))
+            fetched_outing = await OutingOrm.get_one(session, UUID(data["id"]), profile="details")
 
         assert data["activityPlan"]["activity"]["sourceId"] == fetched_outing.activities[0].source_id
         assert data["reservation"]["restaurant"]["sourceId"] == fetched_outing.reservations[0].source_id
@@ -66,7 +66,7 @@ class TestOutingResolver(BaseTestCase):
         data = result.data["outing"]
 
         async with self.db_session.begin() as session:
-            fetched_outing = await OutingOrm.get_one(session, UUID(data["id"]))
+            fetched_outing = await OutingOrm.get_one(session, UUID(data["id"]), profile="details")
 
         assert data["activityPlan"]["activity"]["sourceId"] == fetched_outing.activities[0].source_id
         assert data["reservation"]["restaurant"]["sourceId"] == fetched_outing.reservations[0].source_id
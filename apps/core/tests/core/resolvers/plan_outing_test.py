@@ -1,12 +1,23 @@
+import math
 import random
+import unittest.mock
+from datetime import datetime, timedelta
+from typing import Any
 
-from google.maps.places import PriceLevel
+from google.maps.places import Place, PriceLevel, SearchNearbyResponse
 from google.maps.routing import ComputeRoutesResponse, Route
 from google.protobuf.duration_pb2 import Duration
+from google.type.latlng_pb2 import LatLng
 
+from eave.core.config import CORE_API_APP_CONFIG
+from eave.core.graphql.resolvers.mutations.helpers.planner import OutingPlanner
 from eave.core.orm.activity_category import ActivityCategoryOrm
+from eave.core.orm.eventbrite_event import EventbriteEventOrm, TicketClassSnapshot
 from eave.core.orm.restaurant_category import RestaurantCategoryOrm
 from eave.core.orm.search_region import SearchRegionOrm
+from eave.core.shared.enums import ActivitySource, RestaurantSource
+from eave.core.shared.geo import Distance, GeoPoint
+from eave.stdlib.eventbrite.models.event import EventStatus
 
 from ..base import BaseTestCase
 
@@ -167,3 +178,344 @@ class TestPlanOutingEndpoints(BaseTestCase):
 
         data = result.data["planOuting"]
         assert data["outing"]["travel"] is None
+
+    async def _make_matching_eventbrite_event(
+        self,
+        *,
+        eventbrite_event_id: str,
+        start_time: datetime,
+        search_region: SearchRegionOrm,
+        ticket_classes_snapshot: list[TicketClassSnapshot] | None = None,
+    ) -> None:
+        activity_start_time = start_time
+        if not CORE_API_APP_CONFIG.google_maps_apis_disabled:
+            activity_start_time += timedelta(minutes=120)
+
+        async with self.db_session.begin() as db_session:
+            EventbriteEventOrm(
+                db_session,
+                eventbrite_event_id=eventbrite_event_id,
+                eventbrite_organizer_id=self.anystr(),
+                title=self.anystr(),
+                google_place_id=None,
+                start_time=activity_start_time,
+                end_time=None,
+                timezone=self.anytimezone(),
+                min_cost_cents=0,
+                max_cost_cents=0,
+                lat=search_region.area.center.lat,
+                lon=search_region.area.center.lon,
+                vivial_activity_category_id=ActivityCategoryOrm.all()[0].id,
+                vivial_activity_format_id=self.anyuuid(),
+                ticket_classes_snapshot=ticket_classes_snapshot,
+            )
+
+    def _plan_outing_input(self, *, start_time: datetime, search_region: SearchRegionOrm) -> dict[str, Any]:
+        return {
+            "input": {
+                "startTime": start_time.isoformat(),
+                "searchAreaIds": [search_region.id.hex],
+                "budget": "INEXPENSIVE",
+                "headcount": 2,
+                "groupPreferences": [
+                    {
+                        "restaurantCategoryIds": [str(RestaurantCategoryOrm.all()[0].id)],
+                        "activityCategoryIds": [str(ActivityCategoryOrm.all()[0].id)],
+                    }
+                ],
+            },
+        }
+
+    async def test_plan_outing_prefers_eventbrite_activity(self) -> None:
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        await self._make_matching_eventbrite_event(
+            eventbrite_event_id=self.getdigits("eventbrite.Event.id"),
+            start_time=start_time,
+            search_region=search_region,
+        )
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        data = result.data["planOuting"]
+        assert data["outing"]["activityPlan"]["activity"]["source"] == ActivitySource.EVENTBRITE.value
+        assert data["outing"]["activityPlan"]["activity"]["sourceId"] == self.getdigits("eventbrite.Event.id")
+
+    async def test_plan_outing_prices_eventbrite_activity_from_ticket_classes_snapshot(self) -> None:
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        await self._make_matching_eventbrite_event(
+            eventbrite_event_id=self.getdigits("eventbrite.Event.id"),
+            start_time=start_time,
+            search_region=search_region,
+            ticket_classes_snapshot=[
+                TicketClassSnapshot(
+                    id=self.anydigits(),
+                    display_name=self.anystr(),
+                    description=None,
+                    cost_cents=300,
+                    fee_cents=50,
+                    tax_cents=25,
+                    on_sale_status="AVAILABLE",
+                ),
+                TicketClassSnapshot(
+                    id=self.anydigits(),
+                    display_name=self.anystr(),
+                    description=None,
+                    cost_cents=500,
+                    fee_cents=0,
+                    tax_cents=0,
+                    on_sale_status="SOLD_OUT",
+                ),
+            ],
+        )
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        data = result.data["planOuting"]
+        assert data["outing"]["activityPlan"]["activity"]["source"] == ActivitySource.EVENTBRITE.value
+        assert data["outing"]["activityPlan"]["costBreakdown"]["baseCostCents"] == 300 * 2
+        assert data["outing"]["activityPlan"]["costBreakdown"]["totalCostCents"] == 375 * 2
+        assert self.get_mock("EventbriteClient.list_ticket_classes_for_sale_for_event").call_count == 0
+
+    async def test_plan_outing_eventbrite_candidates_capped(self) -> None:
+        self.patch_env({"PLANNER_EVENTBRITE_MAX_CANDIDATES": "2", "PLANNER_EVENTBRITE_VALIDATION_FAN_OUT": "2"})
+        CORE_API_APP_CONFIG.reset_cached_properties()
+
+        # Every candidate fails validation
+        self.mock_eventbrite_event["status"] = EventStatus.DRAFT
+
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        for _ in range(3):
+            await self._make_matching_eventbrite_event(
+                eventbrite_event_id=self.anydigits(),
+                start_time=start_time,
+                search_region=search_region,
+            )
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        assert self.get_mock("eventbrite get_event_by_id").call_count == 2
+
+    def _make_mock_google_place_open_near_venue(self) -> None:
+        # A restaurant that's open all week, right next to the Eventbrite venue.
+        self.mock_google_place.price_level = PriceLevel.PRICE_LEVEL_INEXPENSIVE
+        self.mock_google_place.location = LatLng(
+            latitude=self.getlatitude("eventbrite.Venue.latitude"),
+            longitude=self.getlongitude("eventbrite.Venue.longitude"),
+        )
+        self.mock_google_place.regular_opening_hours = Place.OpeningHours(
+            periods=[
+                Place.OpeningHours.Period(
+                    open_=Place.OpeningHours.Period.Point(day=day, hour=0, minute=0),
+                    close=Place.OpeningHours.Period.Point(day=(day + 1) % 7, hour=23, minute=59),
+                )
+                for day in range(7)
+            ],
+        )
+
+    async def test_plan_outing_uses_speculative_restaurant_search_near_activity(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "PLANNER_SPECULATIVE_RESTAURANT_SEARCH_DISABLED": None})
+        CORE_API_APP_CONFIG.reset_cached_properties()
+
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        await self._make_matching_eventbrite_event(
+            eventbrite_event_id=self.getdigits("eventbrite.Event.id"),
+            start_time=start_time,
+            search_region=search_region,
+        )
+
+        self._make_mock_google_place_open_near_venue()
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        data = result.data["planOuting"]
+        assert data["outing"]["reservation"]["restaurant"]["source"] == RestaurantSource.GOOGLE_PLACES.value
+        assert data["outing"]["reservation"]["restaurant"]["sourceId"] == self.mock_google_place.id
+
+        # The speculative search found a restaurant near the venue, so no follow-up searches around the venue were made.
+        venue_coordinates = GeoPoint(
+            lat=self.getlatitude("eventbrite.Venue.latitude"), lon=self.getlongitude("eventbrite.Venue.longitude")
+        )
+        for call in self.get_mock("google places searchNearby").call_args_list:
+            center = call.kwargs["request"].location_restriction.circle.center
+            assert venue_coordinates.haversine_distance(GeoPoint(lat=center.latitude, lon=center.longitude)) > 1
+
+    async def test_plan_outing_speculative_restaurant_search_error(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "PLANNER_SPECULATIVE_RESTAURANT_SEARCH_DISABLED": None})
+        CORE_API_APP_CONFIG.reset_cached_properties()
+
+        self.patch(
+            name="OutingPlanner.search_restaurants_in_search_regions",
+            patch=unittest.mock.patch.object(OutingPlanner, "search_restaurants_in_search_regions"),
+            side_effect=Exception("fake error"),
+        )
+
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        await self._make_matching_eventbrite_event(
+            eventbrite_event_id=self.getdigits("eventbrite.Event.id"),
+            start_time=start_time,
+            search_region=search_region,
+        )
+
+        self._make_mock_google_place_open_near_venue()
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        # The failed speculative search doesn't abort the plan; the restaurant is found around the venue instead.
+        assert self.get_mock("OutingPlanner.search_restaurants_in_search_regions").call_count == 1
+        data = result.data["planOuting"]
+        assert data["outing"]["reservation"]["restaurant"]["source"] == RestaurantSource.GOOGLE_PLACES.value
+        assert data["outing"]["reservation"]["restaurant"]["sourceId"] == self.mock_google_place.id
+
+    async def test_plan_outing_searches_wider_restaurant_rings_near_activity_lazily(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None, "PLANNER_SPECULATIVE_RESTAURANT_SEARCH_DISABLED": "1"})
+        CORE_API_APP_CONFIG.reset_cached_properties()
+
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+
+        await self._make_matching_eventbrite_event(
+            eventbrite_event_id=self.getdigits("eventbrite.Event.id"),
+            start_time=start_time,
+            search_region=search_region,
+        )
+
+        venue_coordinates = GeoPoint(
+            lat=self.getlatitude("eventbrite.Venue.latitude"), lon=self.getlongitude("eventbrite.Venue.longitude")
+        )
+
+        def _latlng_miles_from_venue(miles: float) -> LatLng:
+            # Move towards the equator, so that the point stays on the map. A degree of latitude is about 69 miles.
+            return LatLng(
+                latitude=venue_coordinates.lat - math.copysign(miles / 69, venue_coordinates.lat),
+                longitude=venue_coordinates.lon,
+            )
+
+        # Plenty of restaurants within 5 miles of the venue, but none of them will be open.
+        nearby_closed_places = [
+            Place(
+                id=self.anystr(),
+                price_level=PriceLevel.PRICE_LEVEL_INEXPENSIVE,
+                location=_latlng_miles_from_venue(1),
+            )
+            for _ in range(20)
+        ]
+
+        # The most popular restaurant is 12 miles from the venue, and open all week.
+        self._make_mock_google_place_open_near_venue()
+        self.mock_google_place.location = _latlng_miles_from_venue(12)
+
+        async def _mock_google_places_search_nearby(*args: Any, **kwargs: Any) -> SearchNearbyResponse:
+            # Like the Places API, at most 20 places within the circle are returned, most popular first.
+            circle = kwargs["request"].location_restriction.circle
+            center = GeoPoint(lat=circle.center.latitude, lon=circle.center.longitude)
+            places = [
+                place
+                for place in [self.mock_google_place, *nearby_closed_places]
+                if Distance(
+                    miles=center.haversine_distance(GeoPoint(lat=place.location.latitude, lon=place.location.longitude))
+                ).meters
+                <= circle.radius
+            ]
+            return SearchNearbyResponse(places=places[0:20])
+
+        self.get_mock("google places searchNearby").side_effect = _mock_google_places_search_nearby
+
+        response = await self.make_graphql_request(
+            "planOuting",
+            self._plan_outing_input(start_time=start_time, search_region=search_region),
+        )
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        data = result.data["planOuting"]
+        assert data["outing"]["reservation"]["restaurant"]["sourceId"] == self.mock_google_place.id
+
+        # The rings around the venue are searched separately, widest last, and only until a restaurant is found.
+        radii = [
+            call.kwargs["request"].location_restriction.circle.radius
+            for call in self.get_mock("google places searchNearby").call_args_list
+            if venue_coordinates.haversine_distance(
+                GeoPoint(
+                    lat=call.kwargs["request"].location_restriction.circle.center.latitude,
+                    lon=call.kwargs["request"].location_restriction.circle.center.longitude,
+                )
+            )
+            < 1
+        ]
+        assert len(radii) == 3
+        assert radii == sorted(radii)
+        assert radii[-1] < Distance(miles=20).meters
+
+    async def test_plan_outing_merges_restaurant_category_groups_into_one_search(self) -> None:
+        self.patch_env({"GOOGLE_MAPS_APIS_DISABLED": None})
+        CORE_API_APP_CONFIG.reset_cached_properties()
+
+        start_time = self.anydatetime("start_time", offset=2 * day_seconds)
+        search_region = random.choice(SearchRegionOrm.all())
+        restaurant_categories = [cat for cat in RestaurantCategoryOrm.all() if len(cat.google_category_ids) > 0][0:3]
+
+        plan_outing_input = self._plan_outing_input(start_time=start_time, search_region=search_region)
+        plan_outing_input["input"]["groupPreferences"][0]["restaurantCategoryIds"] = [
+            str(cat.id) for cat in restaurant_categories
+        ]
+
+        response = await self.make_graphql_request("planOuting", plan_outing_input)
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        all_google_category_ids = {cid for cat in restaurant_categories for cid in cat.google_category_ids}
+
+        # All of the category groups are searched for in a single request per area.
+        assert any(
+            set(call.kwargs["request"].included_primary_types) == all_google_category_ids
+            for call in self.get_mock("google places searchNearby").call_args_list
+        )
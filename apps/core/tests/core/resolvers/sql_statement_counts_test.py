@@ -0,0 +1,69 @@
+from eave.core.orm.account import AccountOrm
+from eave.core.orm.outing_preferences import OutingPreferencesOrm
+
+from ..base import BaseTestCase
+
+
+class TestSqlStatementCounts(BaseTestCase):
+    """
+    Relationships are only loaded when a query asks for them (see `Base.load_profiles`),
+    so these check that the account-rooted queries don't load more of the graph than they use.
+    """
+
+    async def _make_account_with_bookings(self) -> AccountOrm:
+        async with self.db_session.begin() as session:
+            account = self.make_account(session)
+            OutingPreferencesOrm(
+                session,
+                account=account,
+                activity_category_ids=None,
+                restaurant_category_ids=None,
+            )
+            reserver_details = self.make_reserver_details(session, account)
+
+            for _ in range(3):
+                survey = self.make_survey(session, account)
+                outing = self.make_outing(session, account, survey)
+                self.make_booking(session, account, outing, reserver_details=reserver_details)
+
+        return account
+
+    async def test_get_viewer_account(self) -> None:
+        account = await self._make_account_with_bookings()
+
+        with self.count_sql_statements() as statements:
+            response = await self.make_graphql_request("getViewerAccount", {}, account_id=account.id)
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        # accounts
+        assert len(statements) <= 1, statements
+
+    async def test_get_outing_preferences(self) -> None:
+        account = await self._make_account_with_bookings()
+
+        with self.count_sql_statements() as statements:
+            response = await self.make_graphql_request("getOutingPreferences", {}, account_id=account.id)
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        # accounts, outing_preferences
+        assert len(statements) <= 2, statements
+
+    async def test_list_booked_outings(self) -> None:
+        account = await self._make_account_with_bookings()
+
+        with self.count_sql_statements() as statements:
+            response = await self.make_graphql_request("listBookedOutings", {}, account_id=account.id)
+
+        result = self.parse_graphql_response(response)
+        assert result.data
+        assert not result.errors
+
+        # accounts, bookings, booking_activity_templates, booking_reservation_templates.
+        # The number of statements doesn't depend on the number of bookings.
+        assert len(statements) <= 4, statements
@@ -1,5 +1,9 @@
+import asyncio
+import contextlib
 import dataclasses
-from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+import re
+import weakref
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Mapping
 from dataclasses import dataclass
 from enum import StrEnum
 from functools import wraps
@@ -11,6 +15,8 @@ import aiohttp
 from eave.stdlib.eventbrite.models.expansions import Expansion
 from eave.stdlib.eventbrite.models.pagination import Pagination
 from eave.stdlib.logging import LOGGER
+from eave.stdlib.rate_limit import TokenBucket, backoff_delay, parse_retry_after
+from eave.stdlib.singleflight import Singleflight
 from eave.stdlib.typing import NOT_SET
 
 from .models.category import Category, Subcategory
@@ -28,6 +34,29 @@ class OrderBy(StrEnum):
     CREATED_DESC = "created_desc"
 
 
+@dataclass(kw_only=True)
+class RequestPolicy:
+    """
+    Controls how an EventbriteClient paces and retries its requests.
+    Rate limits and concurrency limits are shared by all clients in the process with the same API key and policy.
+    """
+
+    max_requests_per_second: float | None = None
+    """Sustained request rate, enforced with a token bucket. None means no limit."""
+
+    burst: int = 10
+    """The number of requests that can be made at once before the rate limit kicks in."""
+
+    max_concurrent_requests_per_endpoint: int | None = None
+    """None means no limit. Paths are grouped into endpoints by replacing IDs, eg `/api/v3/events/{id}`."""
+
+    max_retries: int = 2
+    """Only idempotent requests are retried, after connection errors, timeouts, 429 and 5xx responses."""
+
+    max_retry_wait_seconds: float = 30
+    """If the server asks us to wait longer than this before retrying (with Retry-After), the error is raised instead."""
+
+
 @dataclass(kw_only=True)
 class GetEventQuery:
     expand: list[Expansion] = NOT_SET
@@ -156,9 +185,14 @@ class ListCustomQuestionsQuery:
 def paginated[T, **P](
     data_key: str, data_type: type[T]
 ) -> Callable[[Callable[P, Awaitable[aiohttp.ClientResponse]]], Callable[P, AsyncIterator[T]]]:
+    """
+    Turns a function that fetches one page into one that iterates over all of the pages.
+    The decorated function can take a `prefetch` keyword argument: the number of pages to fetch ahead of the consumer.
+    By default (0), the next page is only fetched when the consumer asks for it.
+    """
+
     def decorator(f: Callable[P, Awaitable[aiohttp.ClientResponse]]) -> Callable[P, AsyncIterator[T]]:
-        @wraps(f)
-        async def _inner(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[T]:
+        async def _pages(*args: P.args, **kwargs: P.kwargs) -> AsyncGenerator[T, None]:
             ctoken: str | None = None
 
             # These are here to avoid an infinite loop locking up the whole process.
@@ -187,27 +221,163 @@ def paginated[T, **P](
                 if not ctoken:
                     break
 
+        @wraps(f)
+        def _inner(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[T]:
+            prefetch: int = kwargs.pop("prefetch", 0)
+            pages = _pages(*args, **kwargs)
+
+            if prefetch > 0:
+                return _prefetched(pages, depth=prefetch)
+            else:
+                return pages
+
         return _inner
 
     return decorator
 
 
+async def _prefetched[T](pages: AsyncGenerator[T, None], *, depth: int) -> AsyncGenerator[T, None]:
+    """
+    Fetches up to `depth` pages ahead of the consumer, in a background task.
+    The fetching waits while `depth` fetched pages haven't been taken by the consumer, so memory stays bounded.
+    """
+    # A page is wrapped in a tuple, so that it can be told apart from an error or the end (None).
+    queue: asyncio.Queue[tuple[T] | Exception | None] = asyncio.Queue()
+    permits = asyncio.Semaphore(depth)
+
+    async def _fetch() -> None:
+        try:
+            while True:
+                await permits.acquire()
+
+                try:
+                    page = await anext(pages)
+                except StopAsyncIteration:
+                    queue.put_nowait(None)
+                    return
+
+                queue.put_nowait((page,))
+        except Exception as e:
+            queue.put_nowait(e)
+
+    fetcher = asyncio.create_task(_fetch())
+
+    try:
+        while True:
+            item = await queue.get()
+
+            if item is None:
+                return
+
+            if isinstance(item, Exception):
+                raise item
+
+            permits.release()
+            yield item[0]
+    finally:
+        # The consumer may stop early (or fail), in which case there's no need to keep fetching.
+        fetcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await fetcher
+
+        await pages.aclose()
+
+
+_get_event_singleflight = Singleflight[Event]("eventbrite get_event_by_id")
+
+_RETRYABLE_METHODS = frozenset([HTTPMethod.GET, HTTPMethod.HEAD, HTTPMethod.OPTIONS])
+_RETRYABLE_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Replaces the IDs in a path, so that eg all "get event" requests count towards the same endpoint concurrency limit.
+_PATH_ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+# Keyed by (api key, rate, burst). Token buckets aren't bound to an event loop, so they can be kept for the whole process.
+_rate_limiters: dict[tuple[str, float, int], TokenBucket] = {}
+
+# Semaphores are bound to the event loop they're first used in, so they're kept per loop.
+_endpoint_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, int], asyncio.Semaphore]] = (
+    weakref.WeakKeyDictionary()
+)
+
+# A long-lived session shared by all EventbriteClient instances in the process, so that connections (and their TLS
+# handshakes and DNS lookups) are reused between requests. Sessions are bound to an event loop, so a new one is created
+# if the loop changes.
+_process_session: aiohttp.ClientSession | None = None
+_process_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def shared_session() -> aiohttp.ClientSession:
+    global _process_session, _process_session_loop
+
+    loop = asyncio.get_running_loop()
+
+    if _process_session is None or _process_session.closed or _process_session_loop is not loop:
+        _process_session = aiohttp.ClientSession(
+            raise_for_status=True,
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,  # Every request goes to the same host.
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            ),
+        )
+        _process_session_loop = loop
+
+    return _process_session
+
+
+async def close_shared_session() -> None:
+    """
+    Call this when the process is shutting down (eg in the app lifespan, or at the end of a script).
+    """
+    global _process_session, _process_session_loop
+
+    if _process_session is not None and not _process_session.closed:
+        await _process_session.close()
+
+    _process_session = None
+    _process_session_loop = None
+
+
 class EventbriteClient:
     base_url = "https://www.eventbrite.com"
 
     _api_key: str
+    _result_window_seconds: float
+    _request_policy: RequestPolicy
 
-    def __init__(self, *, api_key: str) -> None:
+    def __init__(
+        self, *, api_key: str, result_window_seconds: float = 0, request_policy: RequestPolicy | None = None
+    ) -> None:
+        """
+        `result_window_seconds` is how long the result of a coalesced request (see `get_event_by_id`) is reused after it completes.
+        `request_policy` controls rate limiting and retries. By default, requests aren't rate limited, and are retried a few times.
+        """
         self._api_key = api_key
+        self._result_window_seconds = result_window_seconds
+        self._request_policy = request_policy or RequestPolicy()
 
     async def get_event_by_id(self, *, event_id: str, query: GetEventQuery | None = None) -> Event:
-        """https://www.eventbrite.com/platform/api#/reference/event/retrieve/retrieve-an-event"""
+        """
+        https://www.eventbrite.com/platform/api#/reference/event/retrieve/retrieve-an-event
 
-        response = await self.make_request(
-            method=HTTPMethod.GET, path=f"/api/v3/events/{event_id}", query=query.compile() if query else None
+        Identical concurrent requests share one upstream request.
+        """
+
+        compiled_query = query.compile() if query else None
+
+        async def _get_event() -> Event:
+            response = await self.make_request(
+                method=HTTPMethod.GET, path=f"/api/v3/events/{event_id}", query=compiled_query
+            )
+            j = await response.json()
+            return j
+
+        return await _get_event_singleflight.do(
+            (self._api_key, event_id, tuple(sorted((compiled_query or {}).items()))),
+            _get_event,
+            result_window_seconds=self._result_window_seconds,
         )
-        j = await response.json()
-        return j
 
     async def get_event_description(self, *, event_id: str) -> EventDescription:
         """https://www.eventbrite.com/platform/api#/reference/event-description/retrieve-full-html-description"""
@@ -225,9 +395,17 @@ class EventbriteClient:
 
     @paginated("events", list[Event])
     async def list_events_for_organizer(
-        self, *, organizer_id: str, query: ListEventsQuery | None = None, continuation: str | None = None
+        self,
+        *,
+        organizer_id: str,
+        query: ListEventsQuery | None = None,
+        continuation: str | None = None,
+        prefetch: int = 0,
     ) -> aiohttp.ClientResponse:
-        """not documented"""
+        """
+        not documented
+        `prefetch` is handled by the `paginated` decorator.
+        """
 
         response = await self.make_request(
             method=HTTPMethod.GET,
@@ -261,9 +439,17 @@ class EventbriteClient:
 
     @paginated("ticket_classes", list[TicketClass])
     async def list_ticket_classes_for_sale_for_event(
-        self, *, event_id: str, query: ListTicketClassesForSaleQuery | None = None, continuation: str | None = None
+        self,
+        *,
+        event_id: str,
+        query: ListTicketClassesForSaleQuery | None = None,
+        continuation: str | None = None,
+        prefetch: int = 0,
     ) -> aiohttp.ClientResponse:
-        """https://www.eventbrite.com/platform/api#/reference/ticket-class/list/list-ticket-classes-available-for-sale-by-event"""
+        """
+        https://www.eventbrite.com/platform/api#/reference/ticket-class/list/list-ticket-classes-available-for-sale-by-event
+        `prefetch` is handled by the `paginated` decorator.
+        """
 
         response = await self.make_request(
             method=HTTPMethod.GET,
@@ -348,15 +534,93 @@ class EventbriteClient:
             },
         )
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
-            response = await session.request(
-                method=method,
-                url=f"{self.base_url}{path}",
-                headers={"Authorization": f"Bearer {self._api_key}"},
-                params=query,
-                json=body,
-            )
+        path_template = _PATH_ID_PATTERN.sub("/{id}", path)
+        endpoint = f"{method} {path_template}"
+        rate_limiter = self._rate_limiter()
+        attempt = 0
+
+        while True:
+            try:
+                async with self._endpoint_semaphore(endpoint):
+                    if rate_limiter:
+                        await rate_limiter.acquire()
+
+                    response = await shared_session().request(
+                        method=method,
+                        url=f"{self.base_url}{path}",
+                        headers={"Authorization": f"Bearer {self._api_key}"},
+                        params=query,
+                        json=body,
+                    )
+
+                    await response.read()  # Read the response body, which releases the connection back to the pool
+
+                return response
+
+            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, TimeoutError) as e:
+                delay = self._retry_delay(e, method=method, attempt=attempt, rate_limiter=rate_limiter)
+                if delay is None:
+                    raise
+
+                LOGGER.warning(
+                    "Eventbrite API request failed; retrying",
+                    {
+                        "endpoint": endpoint,
+                        "attempt": attempt + 1,
+                        "delay_seconds": delay,
+                        "error": str(e),
+                    },
+                )
+
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def _retry_delay(
+        self, e: Exception, *, method: HTTPMethod, attempt: int, rate_limiter: TokenBucket | None
+    ) -> float | None:
+        """
+        Returns how long to wait before retrying the failed request, or None if it shouldn't be retried.
+        """
+        if attempt >= self._request_policy.max_retries or method not in _RETRYABLE_METHODS:
+            return None
 
-            await response.read()  # Read the response body while the session is still open
+        if isinstance(e, aiohttp.ClientResponseError):
+            if e.status not in _RETRYABLE_STATUSES:
+                return None
 
-        return response
+            retry_after = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+            if retry_after is not None:
+                if retry_after > self._request_policy.max_retry_wait_seconds:
+                    return None
+
+                if rate_limiter:
+                    # Every request with this API key has to wait, not just this one.
+                    rate_limiter.pause(retry_after)
+
+                return retry_after
+
+        return min(backoff_delay(attempt), self._request_policy.max_retry_wait_seconds)
+
+    def _rate_limiter(self) -> TokenBucket | None:
+        rate = self._request_policy.max_requests_per_second
+        if not rate:
+            return None
+
+        key = (self._api_key, rate, self._request_policy.burst)
+        if (rate_limiter := _rate_limiters.get(key)) is None:
+            rate_limiter = TokenBucket(rate=rate, capacity=self._request_policy.burst)
+            _rate_limiters[key] = rate_limiter
+
+        return rate_limiter
+
+    def _endpoint_semaphore(self, endpoint: str) -> contextlib.AbstractAsyncContextManager[Any]:
+        limit = self._request_policy.max_concurrent_requests_per_endpoint
+        if not limit:
+            return contextlib.nullcontext()
+
+        semaphores = _endpoint_semaphores.setdefault(asyncio.get_running_loop(), {})
+        if (semaphore := semaphores.get((endpoint, limit))) is None:
+            semaphore = asyncio.Semaphore(limit)
+            semaphores[(endpoint, limit)] = semaphore
+
+        return semaphore
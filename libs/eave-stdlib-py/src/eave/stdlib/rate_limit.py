@@ -0,0 +1,85 @@
+import asyncio
+import random
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter, which can be shared between coroutines.
+    Tokens are added at `rate` per second, up to `capacity`. Each call to `acquire()` takes one token,
+    waiting until one is available.
+
+    Tokens are reserved when `acquire()` is called, so waiting callers are served in order.
+    The bucket doesn't hold any asyncio primitives, so it isn't bound to an event loop.
+    """
+
+    rate: float
+    capacity: float
+
+    _tokens: float
+    _updated_at: float
+    _paused_until: float
+
+    def __init__(self, *, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0
+
+    async def acquire(self) -> None:
+        if (delay := self._reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Makes every caller wait at least `seconds` from now, eg when the upstream server asks us to back off.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _reserve(self) -> float:
+        """
+        Takes one token and returns how long the caller has to wait before using it.
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        # The balance can go negative, which means that the token is reserved from the future.
+        self._tokens -= 1
+        delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        return max(delay, self._paused_until - now)
+
+
+def backoff_delay(attempt: int, *, base_seconds: float = 0.5, max_seconds: float = 30) -> float:
+    """
+    Exponential backoff with full jitter: a random delay between 0 and `base_seconds * 2^attempt`, capped at `max_seconds`.
+    `attempt` is 0 for the first retry.
+    """
+    return random.uniform(0, min(max_seconds, base_seconds * (2**attempt)))  # noqa: S311
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a Retry-After header, which is either a number of seconds or an HTTP date.
+    Returns the number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+
+    return max(0, (retry_at - datetime.now(UTC)).total_seconds())
@@ -0,0 +1,99 @@
+import asyncio
+import time
+import weakref
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+# Every live Singleflight, by name, so that their stats can be logged together. See `all_stats()`.
+_singleflights: weakref.WeakValueDictionary[str, "Singleflight[Any]"] = weakref.WeakValueDictionary()
+
+
+def all_stats() -> dict[str, dict[str, int]]:
+    """
+    The stats of every live Singleflight, by name.
+    """
+    return {name: dict(singleflight.stats) for name, singleflight in _singleflights.items()}
+
+
+class Singleflight[T]:
+    """
+    Coalesces identical concurrent calls, so that only one of them is executed and the others share its result.
+    Calls are identical if they have the same key, which should be built from the normalized request.
+
+    Optionally, a result can be reused for a short time after the call completes (`result_window_seconds`),
+    to absorb bursts of identical calls that don't quite overlap. Errors are never reused.
+
+    The result is shared between callers, so callers must not mutate it.
+    """
+
+    name: str
+    stats: Counter[str]
+    """
+    Per-process counts (see `all_stats()`) of:
+    - calls: total calls to `do()`
+    - executed: calls that were executed
+    - deduplicated: calls that shared an in-flight call's result
+    - window_hits: calls that reused a recently completed call's result
+    """
+
+    _in_flight: dict[Hashable, asyncio.Task[T]]
+    _results: dict[Hashable, tuple[float, T]]
+    _max_results: int
+
+    def __init__(self, name: str, *, max_results: int = 1000) -> None:
+        self.name = name
+        self.stats = Counter()
+        self._in_flight = {}
+        self._results = {}
+        self._max_results = max_results
+        _singleflights[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], *, result_window_seconds: float = 0) -> T:
+        self.stats["calls"] += 1
+
+        if result_window_seconds > 0 and (result := self._recent_result(key)) is not None:
+            self.stats["window_hits"] += 1
+            return result[1]
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.stats["deduplicated"] += 1
+        else:
+            self.stats["executed"] += 1
+            task = asyncio.create_task(self._execute(key, fn, result_window_seconds=result_window_seconds))
+            self._in_flight[key] = task
+
+        # Shielded, so that one cancelled caller doesn't cancel the call for the others.
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Drops the recent result for the given key, so that the next call is executed.
+        A call that's already in flight isn't affected.
+        """
+        self._results.pop(key, None)
+
+    async def _execute(self, key: Hashable, fn: Callable[[], Awaitable[T]], *, result_window_seconds: float) -> T:
+        try:
+            result = await fn()
+        finally:
+            self._in_flight.pop(key, None)
+
+        if result_window_seconds > 0:
+            if len(self._results) >= self._max_results:
+                # Evict the oldest result. Dicts are insertion-ordered.
+                self._results.pop(next(iter(self._results)))
+
+            self._results[key] = (time.monotonic() + result_window_seconds, result)
+
+        return result
+
+    def _recent_result(self, key: Hashable) -> tuple[float, T] | None:
+        if (result := self._results.get(key)) is None:
+            return None
+
+        if result[0] < time.monotonic():
+            self._results.pop(key, None)
+            return None
+
+        return result
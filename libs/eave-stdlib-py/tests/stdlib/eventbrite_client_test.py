@@ -0,0 +1,204 @@
+import asyncio
+import unittest.mock
+from http import HTTPMethod
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict
+
+from eave.stdlib.eventbrite.client import EventbriteClient, RequestPolicy, close_shared_session, shared_session
+
+from .base import StdlibBaseTestCase
+
+
+class TestEventbriteClientSharedSession(StdlibBaseTestCase):
+    async def asyncTearDown(self) -> None:
+        await close_shared_session()
+        await super().asyncTearDown()
+
+    async def test_session_reused(self):
+        assert shared_session() is shared_session()
+
+    async def test_session_recreated_after_close(self):
+        session = shared_session()
+        await close_shared_session()
+
+        assert session.closed
+        assert shared_session() is not session
+        assert not shared_session().closed
+
+
+class TestEventbriteClientRetries(StdlibBaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        self.mock_response = unittest.mock.Mock(spec=aiohttp.ClientResponse)
+        self.mock_session = unittest.mock.Mock()
+        self.mock_session.request = unittest.mock.AsyncMock(return_value=self.mock_response)
+
+        self.patch(
+            name="shared_session",
+            patch=unittest.mock.patch("eave.stdlib.eventbrite.client.shared_session"),
+            return_value=self.mock_session,
+        )
+        self.patch(
+            name="backoff_delay",
+            patch=unittest.mock.patch("eave.stdlib.eventbrite.client.backoff_delay"),
+            return_value=0,
+        )
+
+    def _response_error(self, status: int, headers: dict[str, str] | None = None) -> aiohttp.ClientResponseError:
+        return aiohttp.ClientResponseError(
+            request_info=unittest.mock.Mock(), history=(), status=status, headers=CIMultiDict(headers or {})
+        )
+
+    async def test_transient_errors_retried(self):
+        self.mock_session.request.side_effect = [
+            self._response_error(503),
+            aiohttp.ServerDisconnectedError(),
+            self.mock_response,
+        ]
+
+        client = EventbriteClient(api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2))
+        response = await client.make_request(method=HTTPMethod.GET, path="/api/v3/events/1")
+
+        assert response is self.mock_response
+        assert self.mock_session.request.call_count == 3
+        assert self.get_mock("backoff_delay").call_count == 2
+
+    async def test_retries_exhausted(self):
+        self.mock_session.request.side_effect = self._response_error(503)
+
+        client = EventbriteClient(api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2))
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await client.make_request(method=HTTPMethod.GET, path="/api/v3/events/1")
+
+        assert self.mock_session.request.call_count == 3
+
+    async def test_client_errors_not_retried(self):
+        self.mock_session.request.side_effect = self._response_error(404)
+
+        client = EventbriteClient(api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2))
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await client.make_request(method=HTTPMethod.GET, path="/api/v3/events/1")
+
+        assert self.mock_session.request.call_count == 1
+
+    async def test_non_idempotent_requests_not_retried(self):
+        self.mock_session.request.side_effect = self._response_error(503)
+
+        client = EventbriteClient(api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2))
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await client.make_request(method=HTTPMethod.POST, path="/api/v3/events/1")
+
+        assert self.mock_session.request.call_count == 1
+
+    async def test_retry_after_respected(self):
+        self.mock_session.request.side_effect = [
+            self._response_error(429, {"Retry-After": "0"}),
+            self.mock_response,
+        ]
+
+        client = EventbriteClient(api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2))
+        await client.make_request(method=HTTPMethod.GET, path="/api/v3/events/1")
+
+        assert self.mock_session.request.call_count == 2
+        assert self.get_mock("backoff_delay").call_count == 0
+
+    async def test_long_retry_after_not_retried(self):
+        self.mock_session.request.side_effect = self._response_error(429, {"Retry-After": "3600"})
+
+        client = EventbriteClient(
+            api_key=self.anystr(), request_policy=RequestPolicy(max_retries=2, max_retry_wait_seconds=60)
+        )
+        with self.assertRaises(aiohttp.ClientResponseError):
+            await client.make_request(method=HTTPMethod.GET, path="/api/v3/events/1")
+
+        assert self.mock_session.request.call_count == 1
+
+    async def test_endpoint_concurrency_limited(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def _request(**kwargs: Any) -> aiohttp.ClientResponse:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return self.mock_response
+
+        self.mock_session.request.side_effect = _request
+
+        client = EventbriteClient(
+            api_key=self.anystr(), request_policy=RequestPolicy(max_concurrent_requests_per_endpoint=2)
+        )
+        await asyncio.gather(
+            *[client.make_request(method=HTTPMethod.GET, path=f"/api/v3/events/{i}") for i in range(6)]
+        )
+
+        assert max_in_flight == 2
+
+
+class TestEventbriteClientPagination(StdlibBaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        self.pages = [[self.anystr()] for _ in range(3)]
+
+        def _response(page: int) -> unittest.mock.Mock:
+            response = unittest.mock.Mock(spec=aiohttp.ClientResponse)
+            response.json = unittest.mock.AsyncMock(
+                return_value={
+                    "events": self.pages[page],
+                    "pagination": {"has_more_items": page < len(self.pages) - 1, "continuation": str(page + 1)},
+                }
+            )
+            return response
+
+        async def _make_request(**kwargs: Any) -> unittest.mock.Mock:
+            return _response(int(kwargs.get("continuation") or 0))
+
+        self.patch(
+            name="make_request",
+            patch=unittest.mock.patch("eave.stdlib.eventbrite.client.EventbriteClient.make_request"),
+            side_effect=_make_request,
+        )
+
+        self.client = EventbriteClient(api_key=self.anystr())
+
+    async def test_pages_fetched_on_demand(self):
+        paginator = self.client.list_events_for_organizer(organizer_id=self.anydigits())
+
+        assert await anext(paginator) == self.pages[0]
+        await asyncio.sleep(0.01)
+        assert self.get_mock("make_request").call_count == 1
+
+        assert [page async for page in paginator] == self.pages[1:]
+
+    async def test_prefetch(self):
+        paginator = self.client.list_events_for_organizer(organizer_id=self.anydigits(), prefetch=1)
+
+        assert await anext(paginator) == self.pages[0]
+        await asyncio.sleep(0.01)
+        # The next page was fetched while the first one was being processed, but not the one after it.
+        assert self.get_mock("make_request").call_count == 2
+
+        assert [page async for page in paginator] == self.pages[1:]
+        assert self.get_mock("make_request").call_count == 3
+
+    async def test_prefetch_error_raised_to_consumer(self):
+        self.get_mock("make_request").side_effect = aiohttp.ClientConnectionError()
+        paginator = self.client.list_events_for_organizer(organizer_id=self.anydigits(), prefetch=2)
+
+        with self.assertRaises(aiohttp.ClientConnectionError):
+            await anext(paginator)
+
+    async def test_prefetch_stopped_when_consumer_stops(self):
+        paginator = self.client.list_events_for_organizer(organizer_id=self.anydigits(), prefetch=1)
+
+        async for _ in paginator:
+            break
+
+        await asyncio.sleep(0.01)
+        assert self.get_mock("make_request").call_count <= 2
@@ -0,0 +1,64 @@
+import time
+import unittest.mock
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+from eave.stdlib.rate_limit import TokenBucket, backoff_delay, parse_retry_after
+
+from .base import StdlibBaseTestCase
+
+
+class TestTokenBucket(StdlibBaseTestCase):
+    async def test_burst_not_delayed(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert time.monotonic() - start < 0.5
+
+    async def test_rate_limited_after_burst(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        # The first token is available immediately, then one every 50ms.
+        assert time.monotonic() - start >= 0.09
+
+    async def test_pause(self):
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.pause(0.1)
+
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.09
+
+
+class TestBackoffDelay(StdlibBaseTestCase):
+    async def test_exponential_with_cap(self):
+        with unittest.mock.patch("random.uniform", side_effect=lambda a, b: b):
+            assert backoff_delay(0, base_seconds=1) == 1
+            assert backoff_delay(3, base_seconds=1) == 8
+            assert backoff_delay(10, base_seconds=1, max_seconds=30) == 30
+
+
+class TestParseRetryAfter(StdlibBaseTestCase):
+    async def test_seconds(self):
+        assert parse_retry_after("120") == 120
+
+    async def test_http_date(self):
+        retry_at = datetime.now(UTC) + timedelta(seconds=60)
+        seconds = parse_retry_after(format_datetime(retry_at, usegmt=True))
+        assert seconds is not None
+        assert 55 < seconds <= 60
+
+    async def test_date_in_past(self):
+        assert parse_retry_after(format_datetime(datetime.now(UTC) - timedelta(days=1), usegmt=True)) == 0
+
+    async def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("") is None
+        assert parse_retry_after("soon") is None
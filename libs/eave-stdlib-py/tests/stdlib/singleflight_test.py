@@ -0,0 +1,102 @@
+import asyncio
+import unittest.mock
+
+from eave.stdlib.singleflight import Singleflight, all_stats
+
+from .base import StdlibBaseTestCase
+
+
+class TestSingleflight(StdlibBaseTestCase):
+    async def test_concurrent_calls_coalesced(self):
+        singleflight = Singleflight[str]("test")
+        release = asyncio.Event()
+        calls = 0
+
+        async def fn() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return self.getstr("result")
+
+        self.anystr("result")
+        tasks = [asyncio.create_task(singleflight.do("key", fn)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks)
+        assert results == [self.getstr("result")] * 3
+        assert calls == 1
+        assert singleflight.stats["calls"] == 3
+        assert singleflight.stats["executed"] == 1
+        assert singleflight.stats["deduplicated"] == 2
+
+    async def test_all_stats(self):
+        singleflight = Singleflight[str](self.anystr("name"))
+        fn = unittest.mock.AsyncMock(return_value=self.anystr())
+
+        await singleflight.do("key", fn)
+        assert all_stats()[self.getstr("name")] == {"calls": 1, "executed": 1}
+
+    async def test_different_keys_not_coalesced(self):
+        singleflight = Singleflight[str]("test")
+        fn = unittest.mock.AsyncMock(return_value=self.anystr())
+
+        await asyncio.gather(singleflight.do("key1", fn), singleflight.do("key2", fn))
+        assert fn.call_count == 2
+        assert singleflight.stats["deduplicated"] == 0
+
+    async def test_sequential_calls_executed_without_window(self):
+        singleflight = Singleflight[str]("test")
+        fn = unittest.mock.AsyncMock(return_value=self.anystr())
+
+        await singleflight.do("key", fn)
+        await singleflight.do("key", fn)
+        assert fn.call_count == 2
+
+    async def test_result_window(self):
+        singleflight = Singleflight[str]("test")
+        fn = unittest.mock.AsyncMock(return_value=self.anystr("result"))
+
+        assert await singleflight.do("key", fn, result_window_seconds=60) == self.getstr("result")
+        assert await singleflight.do("key", fn, result_window_seconds=60) == self.getstr("result")
+        assert fn.call_count == 1
+        assert singleflight.stats["window_hits"] == 1
+
+        singleflight.forget("key")
+        await singleflight.do("key", fn, result_window_seconds=60)
+        assert fn.call_count == 2
+
+    async def test_errors_shared_but_not_reused(self):
+        singleflight = Singleflight[str]("test")
+        fn = unittest.mock.AsyncMock(side_effect=ValueError())
+
+        results = await asyncio.gather(
+            singleflight.do("key", fn, result_window_seconds=60),
+            singleflight.do("key", fn, result_window_seconds=60),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        assert fn.call_count == 1
+
+        with self.assertRaises(ValueError):
+            await singleflight.do("key", fn, result_window_seconds=60)
+
+        assert fn.call_count == 2
+
+    async def test_cancelled_caller_doesnt_cancel_others(self):
+        singleflight = Singleflight[str]("test")
+        release = asyncio.Event()
+
+        async def fn() -> str:
+            await release.wait()
+            return self.getstr("result")
+
+        self.anystr("result")
+        cancelled = asyncio.create_task(singleflight.do("key", fn))
+        waiting = asyncio.create_task(singleflight.do("key", fn))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        release.set()
+
+        assert await waiting == self.getstr("result")